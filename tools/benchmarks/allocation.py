@@ -0,0 +1,76 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''Memory allocated per instance of the HOT syntax classes.
+
+Every slotted class is compared with a copy of it not declaring __slots__,
+which keeps its attributes in a __dict__ like the classes did before.
+
+    python tools/benchmarks/allocation.py [--count N]
+'''
+
+import argparse
+import gc
+import tracemalloc
+
+from toscaparser.nodetemplate import NodeTemplate
+from translator.hot.syntax.hot_output import HotOutput
+from translator.hot.syntax.hot_parameter import HotParameter
+from translator.hot.syntax.hot_resource import HotResource
+
+
+def with_dict(cls):
+    namespace = dict((name, value) for name, value in cls.__dict__.items()
+                     if name != '__slots__' and name not in cls.__slots__)
+    return type(cls.__name__ + 'WithDict', cls.__bases__, namespace)
+
+
+def measure(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del instances
+    return float(size) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+
+    node = NodeTemplate('server', {'server': {'type': 'tosca.nodes.Compute'}})
+    cases = (
+        (HotResource,
+         lambda cls: cls(node, name='server_create_deploy',
+                         type='OS::Heat::SoftwareDeployment',
+                         properties={'config': {'get_resource': 'config'}})),
+        (HotParameter,
+         lambda cls: cls('image', 'string', description='Image')),
+        (HotOutput,
+         lambda cls: cls('ip', {'get_attr': ['server', 'first_address']})),
+    )
+    print('%-14s %12s %12s %10s' %
+          ('class', 'dict (B)', 'slots (B)', 'saved'))
+    for cls, factory in cases:
+        unslotted = with_dict(cls)
+        dict_size = measure(lambda: factory(unslotted), args.count)
+        slots_size = measure(lambda: factory(cls), args.count)
+        print('%-14s %12.1f %12.1f %9.1f%%' %
+              (cls.__name__, dict_size, slots_size,
+               100 * (dict_size - slots_size) / dict_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''Memory used by batches of translations kept alive by the caller.
+
+Every mode runs in its own process, translates the template the given
+number of times while keeping all the translators, like a worker caching
+its results would, and reports the peak RSS of the process and the RSS
+retained per translated template.
+
+    python tools/benchmarks/memory.py [--count N] [template] [params]
+'''
+
+import argparse
+import gc
+import os
+import resource
+import subprocess
+import sys
+
+DEFAULT_TEMPLATE = os.path.join('samples', 'tests', 'data',
+                                'tosca_single_instance_wordpress.yaml')
+DEFAULT_PARAMS = 'db_name=wordpress;db_user=wp_user;db_pwd=wp_pass;' \
+                 'db_root_pwd=passw0rd;db_port=3366;cpus=8'
+
+
+def get_rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+
+
+def get_peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run(template, params, count, compact):
+    from toscaparser.tosca_template import ToscaTemplate
+    from translator.hot.tosca_translator import TOSCATranslator
+
+    parsed_params = dict(p.split('=', 1) for p in params.split(';') if p)
+    # warm up the imports and module caches
+    TOSCATranslator(ToscaTemplate(template, parsed_params),
+                    parsed_params).translate_to_yaml_files_dict('out.yaml')
+    gc.collect()
+    baseline = get_rss_kb()
+
+    translators = []
+    for _ in range(count):
+        tosca = ToscaTemplate(template, parsed_params)
+        translator = TOSCATranslator(tosca, parsed_params, compact=compact)
+        translator.translate_to_yaml_files_dict('out.yaml')
+        translators.append(translator)
+        del tosca, translator
+    gc.collect()
+    retained = get_rss_kb() - baseline
+    print('%-8s peak RSS %8d KiB  retained %8.1f KiB/template' %
+          ('compact' if compact else 'default', get_peak_rss_kb(),
+           float(retained) / count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('template', nargs='?', default=DEFAULT_TEMPLATE)
+    parser.add_argument('params', nargs='?', default=DEFAULT_PARAMS)
+    parser.add_argument('--count', type=int, default=50)
+    parser.add_argument('--mode', choices=('default', 'compact'))
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.template, args.params, args.count, args.mode == 'compact')
+        return
+    for mode in ('default', 'compact'):
+        subprocess.check_call([sys.executable, __file__, args.template,
+                               args.params, '--count', str(args.count),
+                               '--mode', mode])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''Lookup of the interface operations of nodes of deep custom types.
+
+A template with a chain of custom node types, each one overriding an
+operation of its parent, and many nodes of the most derived types is
+generated. The operations of every node are looked up by walking the type
+hierarchy each time, like HotResource.get_all_operations did, and through
+the per type operation tables.
+
+    python tools/benchmarks/operations.py [--depth D] [--nodes N]
+'''
+
+import argparse
+import time
+
+from toscaparser.elements.interfaces import InterfacesDef
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot.syntax.hot_resource import HotResource
+
+
+def generate_template(depth, nodes):
+    node_types = {}
+    parent = 'tosca.nodes.SoftwareComponent'
+    for level in range(depth):
+        name = 'example.nodes.Level%d' % level
+        operation = ('create', 'configure', 'start')[level % 3]
+        node_types[name] = {
+            'derived_from': parent,
+            'interfaces': {'Standard': {
+                operation: {'implementation': 'level%d.sh' % level}}}}
+        parent = name
+    node_templates = {'server': {'type': 'tosca.nodes.Compute'}}
+    for index in range(nodes):
+        node_templates['app%d' % index] = {
+            'type': parent, 'requirements': [{'host': 'server'}]}
+    return {'tosca_definitions_version': 'tosca_simple_yaml_1_0',
+            'node_types': node_types,
+            'topology_template': {'node_templates': node_templates}}
+
+
+def get_operations_walking(node):
+    # the lookup done before the operation tables were cached
+    operations = {}
+    for operation in node.interfaces:
+        operations[operation.name] = operation
+    node_type = node.type_definition
+    while node_type is not None:
+        type_operations = {}
+        for name, elems in HotResource._get_interface_elems_from_type(
+                node_type, 'Standard'):
+            type_operations[name] = InterfacesDef(node_type, 'Standard',
+                                                  node, name, elems)
+        type_operations.update(operations)
+        operations = type_operations
+        node_type = node_type.parent_type
+    return operations
+
+
+def run(nodes, lookup):
+    start = time.perf_counter()
+    for node in nodes:
+        lookup(node)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--depth', type=int, default=10)
+    parser.add_argument('--nodes', type=int, default=200)
+    args = parser.parse_args()
+
+    tosca = ToscaTemplate(yaml_dict_tpl=generate_template(args.depth,
+                                                          args.nodes))
+    nodes = [node for node in tosca.nodetemplates if node.name != 'server']
+    walking = run(nodes, get_operations_walking)
+    cached = run(nodes, HotResource.get_all_operations)
+    print('%d nodes, %d levels of custom types' % (len(nodes), args.depth))
+    print('walking the types   %8.1f ms' % (walking * 1000))
+    print('operation tables    %8.1f ms' % (cached * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''Translation time with and without the memoized type resolution.
+
+A template is parsed many times and every parse translated once, with
+the type resolver of the translations and with a resolver walking the
+parent types on every lookup, like the translation did before the
+resolutions were memoized. Only the translations are timed.
+
+    python tools/benchmarks/type_resolution.py [--count N] [template]
+'''
+
+import argparse
+import logging
+import os
+import time
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.hot import type_resolver
+
+DEFAULT_TEMPLATE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'samples',
+    'tests', 'data', 'etsi_nfv',
+    'tosca_nfv_vnf_vdu_cp_vl_blockstorage_with_scaling.yaml')
+
+
+class WalkingResolver(type_resolver.TypeResolver):
+    '''Resolver walking the parent types on every lookup.'''
+
+    def _store(self, cache, key, value):
+        pass
+
+
+def run(template, count, resolver):
+    saved = type_resolver.RESOLVER
+    resolver.set_type_map(saved.type_map)
+    type_resolver.RESOLVER = resolver
+    elapsed = 0
+    try:
+        for _ in range(count):
+            tosca = ToscaTemplate(template)
+            start = time.perf_counter()
+            TOSCATranslator(tosca, {}).translate_to_yaml_files_dict(
+                'output.yaml')
+            elapsed += time.perf_counter() - start
+        return elapsed / count
+    finally:
+        type_resolver.RESOLVER = saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('template', nargs='?', default=DEFAULT_TEMPLATE)
+    parser.add_argument('--count', type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    # warm up the lazily built state shared by the translations
+    run(args.template, 5, type_resolver.TypeResolver())
+    walking = run(args.template, args.count, WalkingResolver())
+    memoized = run(args.template, args.count, type_resolver.TypeResolver())
+    print('%d translations of %s' % (args.count,
+                                     os.path.basename(args.template)))
+    print('walking the types   %8.3f ms' % (walking * 1000))
+    print('memoized            %8.3f ms' % (memoized * 1000))
+
+
+if __name__ == '__main__':
+    main()
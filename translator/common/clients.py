@@ -0,0 +1,121 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from collections import OrderedDict
+import importlib
+import importlib.util
+import logging
+import threading
+import weakref
+
+from requests import adapters
+from toscaparser.utils.gettextutils import _
+
+# NOTE: the clients are optional and slow to import, they are only imported
+# when the first client is created, the registry fails when asked for a
+# client that is not installed
+heat_client_avail = importlib.util.find_spec('heatclient') is not None
+nova_client_avail = importlib.util.find_spec('novaclient') is not None
+openstack_avail = importlib.util.find_spec('openstack') is not None
+
+log = logging.getLogger('heat-translator')
+
+
+class ClientRegistry(object):
+    '''OpenStack clients shared by the translations of a process.
+
+    Clients are created once for every Keystone session, and for Heat for
+    every endpoint, then reused by the following translations and
+    deployments, along with the keep-alive connections of the session. The
+    HTTP connection pools of a session keep at most pool_maxsize
+    connections to every endpoint, for pool_connections endpoints. Only
+    the max_clients most recently used clients are kept, the clients keep
+    their sessions alive.
+    '''
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_clients=32):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_clients = max_clients
+        # (session, client name, ...) -> client
+        self._clients = OrderedDict()
+        # sessions whose connection pools are already sized
+        self._pooled = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def clear(self):
+        with self._lock:
+            self._clients = OrderedDict()
+            self._pooled = weakref.WeakSet()
+
+    def get_nova(self, session):
+        return self._get_client(
+            session, ('nova',),
+            lambda: importlib.import_module('novaclient.client').Client(
+                '2', session=session),
+            nova_client_avail)
+
+    def get_openstack(self, session):
+        return self._get_client(
+            session, ('openstack',),
+            lambda: importlib.import_module('openstack.connection').Connection(
+                session=session),
+            openstack_avail)
+
+    def get_heat(self, session, auth=None, endpoint=None):
+        return self._get_client(
+            session, ('heat', auth, endpoint),
+            lambda: importlib.import_module('heatclient.client').Client(
+                '1', session=session, auth=auth, endpoint=endpoint),
+            heat_client_avail)
+
+    def _get_client(self, session, key, create, available):
+        if not available:
+            raise RuntimeError(_('Could not find the %s client.') % key[0])
+        key = (session,) + key
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+            self._set_pool_limits(session)
+            log.debug(_('Creating the %s client.') % key[1])
+            client = self._clients[key] = create()
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+            return client
+
+    def _set_pool_limits(self, session):
+        if session in self._pooled:
+            return
+        self._pooled.add(session)
+        # the requests session behind a Keystone session
+        http_session = getattr(session, 'session', None)
+        if not hasattr(http_session, 'adapters'):
+            return
+        for prefix in ('https://', 'http://'):
+            adapter = http_session.adapters.get(prefix)
+            if isinstance(adapter, adapters.HTTPAdapter):
+                # only the pools are replaced, the adapter keeps its retries
+                # and the socket and TLS options its subclass gives them,
+                # the connections of the previous pools are closed
+                adapter.close()
+                adapter.proxy_manager.clear()
+                adapter.init_poolmanager(self.pool_connections,
+                                         self.pool_maxsize)
+
+
+# Registry shared by all the translations of the process
+REGISTRY = ClientRegistry()
@@ -0,0 +1,151 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import codecs
+from concurrent import futures
+import logging
+import time
+
+from toscaparser.utils.gettextutils import _
+from translator.common.exception import StackCreateTimeoutError
+from translator.common import utils
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+STATUSES = (CREATE_COMPLETE, CREATE_FAILED) = \
+           ('CREATE_COMPLETE', 'CREATE_FAILED')
+
+
+def get_template_files(template):
+    '''Return the contents of the files of a template by get_file path.'''
+    get_files = []
+    utils.get_dict_value(template, "get_file", get_files)
+    files = {}
+    for file in get_files:
+        with codecs.open(file, encoding='utf-8', errors='strict') as f:
+            files[file] = f.read()
+    return files
+
+
+def load_template(content):
+    '''Return the dictionary of a translated YAML template to deploy.
+
+    The version, loaded as a date, is given back as a string for the JSON
+    requests of heatclient.
+    '''
+    template = yaml.safe_load(content)
+    template['heat_template_version'] = str(template['heat_template_version'])
+    return template
+
+
+class StackDeployment(object):
+    '''A stack to create on Heat and the result of its creation.'''
+
+    def __init__(self, stack_name, template, parameters=None, files=None):
+        self.stack_name = stack_name
+        self.template = template
+        self.parameters = parameters or {}
+        self.files = files if files is not None else \
+            get_template_files(template)
+        self.stack_id = None
+        self.status = None
+        self.status_reason = None
+        # seconds from the creation request to the final status
+        self.elapsed = None
+        self.polls = 0
+        self.error = None
+
+    @property
+    def succeeded(self):
+        return self.status == CREATE_COMPLETE and self.error is None
+
+
+class DeployEngine(object):
+    '''Create stacks on Heat concurrently and wait for their creation.
+
+    At most max_concurrency stacks are in progress at the same time. The
+    status of every stack is polled, the interval between two polls grows
+    by the backoff factor from poll_interval up to max_poll_interval, until
+    the stack is complete, failed or timeout seconds have passed.
+    '''
+
+    def __init__(self, heat_client, max_concurrency=4, poll_interval=2.0,
+                 max_poll_interval=30.0, backoff=2.0, timeout=3600,
+                 sleep=time.sleep, clock=time.monotonic):
+        self.heat_client = heat_client
+        self.max_concurrency = max_concurrency
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.sleep = sleep
+        self.clock = clock
+
+    def deploy(self, deployments):
+        '''Create the stacks and return the deployments once all are done.
+
+        The errors are kept in the deployments, they do not stop the
+        creation of the other stacks.
+        '''
+        deployments = list(deployments)
+        with futures.ThreadPoolExecutor(self.max_concurrency) as executor:
+            list(executor.map(self.deploy_stack, deployments))
+        return deployments
+
+    def deploy_stack(self, deployment):
+        start = self.clock()
+        try:
+            response = self.heat_client.stacks.create(
+                stack_name=deployment.stack_name,
+                template=deployment.template,
+                parameters=deployment.parameters,
+                files=deployment.files)
+            deployment.stack_id = response['stack']['id']
+            log.debug(_('Creating the stack %(name)s, its id is %(id)s.')
+                      % {'name': deployment.stack_name,
+                         'id': deployment.stack_id})
+            self._wait(deployment, start)
+        except Exception as e:
+            deployment.error = e
+            log.error(_('Creation of the stack %(name)s failed: %(error)s')
+                      % {'name': deployment.stack_name, 'error': e})
+        deployment.elapsed = self.clock() - start
+        return deployment
+
+    def _wait(self, deployment, start):
+        interval = self.poll_interval
+        while True:
+            stack = self.heat_client.stacks.get(deployment.stack_id)
+            deployment.polls += 1
+            deployment.status = stack.stack_status
+            deployment.status_reason = getattr(stack, 'stack_status_reason',
+                                               None)
+            if deployment.status in STATUSES:
+                return
+            if self.clock() - start + interval > self.timeout:
+                raise StackCreateTimeoutError(name=deployment.stack_name,
+                                              timeout=self.timeout)
+            self.sleep(interval)
+            interval = min(interval * self.backoff, self.max_poll_interval)
+
+
+def format_report(deployments):
+    '''Return a line of text for every deployment.'''
+    lines = []
+    for deployment in deployments:
+        status = deployment.status or '-'
+        reason = deployment.error or deployment.status_reason or ''
+        lines.append('%s %s %.1fs %s' % (deployment.stack_name, status,
+                                         deployment.elapsed or 0,
+                                         reason))
+    return '\n'.join(line.rstrip() for line in lines)
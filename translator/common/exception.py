@@ -51,3 +51,21 @@ class UnsupportedTypeError(TOSCAException):
 class ToscaClassAttributeError(TOSCAException):
     msg_fmt = _('Class attribute referenced not found. '
                 '%(message)s. Check to see that it is defined.')
+
+
+class UnsupportedOptimizationError(TOSCAException):
+    msg_fmt = _('Optimization "%(name)s" is not supported.')
+
+
+class StackCreateTimeoutError(TOSCAException):
+    msg_fmt = _('Stack "%(name)s" was not created within %(timeout)s '
+                'seconds.')
+
+
+class HttpCacheMissError(TOSCAException):
+    msg_fmt = _('"%(url)s" is not in the HTTP cache and can not be fetched '
+                'offline.')
+
+
+class InvalidSnapshotError(TOSCAException):
+    msg_fmt = _('The translation snapshot can not be loaded: %(reason)s')
@@ -11,13 +11,11 @@
 # under the License.
 
 import logging
+import threading
 
-try:
-    import novaclient.client
-    client_available = True
-except ImportError:
-    client_available = False
-    pass
+from translator.common import clients
+
+client_available = clients.nova_client_avail
 
 log = logging.getLogger('heat-translator')
 
@@ -36,6 +34,8 @@ SESSION = None
 
 FLAVORS = {}
 
+_LOCK = threading.Lock()
+
 
 def get_flavors():
     global FLAVORS
@@ -43,22 +43,29 @@ def get_flavors():
     if FLAVORS:
         return FLAVORS
 
-    if SESSION is not None and client_available:
-        try:
-            client = novaclient.client.Client("2", session=SESSION)
-        except Exception as e:
-            # Handles any exception coming from openstack
-            log.warn(_('Choosing predefined flavors since received '
-                       'Openstack Exception: %s') % str(e))
-        else:
-            for flv in client.flavors.list(detailed=True):
-                FLAVORS[str(flv.name)] = {
-                    "mem_size": flv.ram,
-                    "disk_size": flv.disk,
-                    "num_cpus": flv.vcpus
-                }
-
-    if not FLAVORS:
-        FLAVORS = PREDEF_FLAVORS
-
-    return FLAVORS
+    # translations running in parallel load the flavors only once
+    with _LOCK:
+        if FLAVORS:
+            return FLAVORS
+
+        # fill a new dictionary, the lookups outside of the lock only see
+        # complete ones
+        flavors = {}
+        if SESSION is not None and client_available:
+            try:
+                client = clients.REGISTRY.get_nova(SESSION)
+            except Exception as e:
+                # Handles any exception coming from openstack
+                log.warn(_('Choosing predefined flavors since received '
+                           'Openstack Exception: %s') % str(e))
+            else:
+                for flv in client.flavors.list(detailed=True):
+                    flavors[str(flv.name)] = {
+                        "mem_size": flv.ram,
+                        "disk_size": flv.disk,
+                        "num_cpus": flv.vcpus
+                    }
+
+        FLAVORS = flavors or PREDEF_FLAVORS
+
+        return FLAVORS
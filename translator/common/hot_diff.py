@@ -0,0 +1,160 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''Structural differences between HOT templates.'''
+
+from collections import Counter
+from collections import namedtuple
+import os
+import threading
+
+import toscaparser.utils.yamlparser
+import yaml
+
+# lists whose order does not matter
+ORDERLESS_LIST_KEYS = ['allowed_values', 'depends_on']
+
+EXPECTED_LABEL = "<Expected>"
+PROVIDED_LABEL = "<Provided>"
+
+# path: tuple of the keys and list indexes leading to the difference
+# expected, provided: the differing values, None when missing
+Difference = namedtuple('Difference', ['path', 'expected', 'provided'])
+
+
+def diff(expected, provided, orderless_keys=ORDERLESS_LIST_KEYS):
+    '''Return the list of Differences between two templates.
+
+    The templates are walked once, in the order of the expected one. The
+    items of the lists found under orderless_keys are matched by their
+    hashed content, the items of the other lists by their index.
+    '''
+    differences = []
+    _diff(expected, provided, [], None, frozenset(orderless_keys),
+          differences)
+    return differences
+
+
+def _diff(expected, provided, path, key, orderless_keys, differences):
+    if isinstance(expected, dict) and isinstance(provided, dict):
+        for name, value in expected.items():
+            path.append(name)
+            if name in provided:
+                _diff(value, provided[name], path, name, orderless_keys,
+                      differences)
+            else:
+                differences.append(Difference(tuple(path), value, None))
+            path.pop()
+        for name, value in provided.items():
+            if name not in expected:
+                differences.append(
+                    Difference(tuple(path) + (name,), None, value))
+    elif isinstance(expected, list) and isinstance(provided, list):
+        if key in orderless_keys:
+            _diff_orderless(expected, provided, path, orderless_keys,
+                            differences)
+            return
+        for index, (value1, value2) in enumerate(zip(expected, provided)):
+            path.append(index)
+            _diff(value1, value2, path, None, orderless_keys, differences)
+            path.pop()
+        for index in range(len(provided), len(expected)):
+            differences.append(
+                Difference(tuple(path) + (index,), expected[index], None))
+        for index in range(len(expected), len(provided)):
+            differences.append(
+                Difference(tuple(path) + (index,), None, provided[index]))
+    elif expected != provided:
+        differences.append(Difference(tuple(path), expected, provided))
+
+
+def _diff_orderless(expected, provided, path, orderless_keys, differences):
+    provided_hashes = [_hash(value, None, orderless_keys)
+                       for value in provided]
+    counts = Counter(provided_hashes)
+    for index, value in enumerate(expected):
+        value_hash = _hash(value, None, orderless_keys)
+        if counts[value_hash]:
+            counts[value_hash] -= 1
+        else:
+            differences.append(Difference(tuple(path) + (index,), value,
+                                          None))
+    for index, value_hash in enumerate(provided_hashes):
+        if counts[value_hash]:
+            counts[value_hash] -= 1
+            differences.append(Difference(tuple(path) + (index,), None,
+                                          provided[index]))
+
+
+def _hash(value, key, orderless_keys):
+    # hashable form of a value, equal for equal values
+    if isinstance(value, dict):
+        return frozenset((name, _hash(item, name, orderless_keys))
+                         for name, item in value.items())
+    if isinstance(value, list):
+        hashes = [_hash(item, None, orderless_keys) for item in value]
+        if key in orderless_keys:
+            return frozenset(Counter(hashes).items())
+        return tuple(hashes)
+    return value
+
+
+def format_path(path):
+    '''Return the JSON pointer of a Difference path.'''
+    return ''.join('/' + str(name).replace('~', '~0').replace('/', '~1')
+                   for name in path)
+
+
+def to_dict(differences):
+    '''Return the differences as a dictionary keyed by JSON pointers.'''
+    result = {}
+    for difference in differences:
+        values = result.setdefault(format_path(difference.path),
+                                   {EXPECTED_LABEL: None,
+                                    PROVIDED_LABEL: None})
+        # the unmatched items of orderless lists can share an index
+        if difference.expected is not None:
+            values[EXPECTED_LABEL] = difference.expected
+        if difference.provided is not None:
+            values[PROVIDED_LABEL] = difference.provided
+    return result
+
+
+# path -> (modification time, size, template)
+_goldens = {}
+_goldens_lock = threading.Lock()
+
+
+def load_golden(path):
+    '''Return the parsed expected template at path.
+
+    The templates are parsed once per process, and again when their file
+    changes. The same object is returned to every caller, which must not
+    change it.
+    '''
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with _goldens_lock:
+        cached = _goldens.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path) as f:
+        template = yaml.load(f,
+                             Loader=toscaparser.utils.yamlparser.yaml_loader)
+    with _goldens_lock:
+        _goldens[path] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
+
+
+def clear_goldens():
+    with _goldens_lock:
+        _goldens.clear()
@@ -0,0 +1,291 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import urllib.error
+from urllib.parse import urlparse
+import urllib.request
+
+from toscaparser.common.exception import ExceptionCollector
+from toscaparser.common.exception import URLException
+import toscaparser.imports
+import toscaparser.tosca_template
+from toscaparser.utils.gettextutils import _
+from toscaparser.utils.urlutils import UrlUtils
+import toscaparser.utils.yamlparser
+from translator.common.exception import HttpCacheMissError
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+META_SUFFIX = '.meta'
+BODY_SUFFIX = '.body'
+
+
+class HttpCache(object):
+    '''Local copies of the documents fetched over HTTP.
+
+    Remote templates, imports and artifacts are kept in cache_dir with their
+    ETag and Last-Modified headers. They are fetched again with conditional
+    requests, a 304 Not Modified response serves the local copy without
+    transferring the document. The least recently used documents are removed
+    when the cache grows over max_bytes. In offline mode, the documents are
+    only served from the cache and a missing one raises HttpCacheMissError;
+    a cached document is also served when its server can not be reached.
+    '''
+
+    def __init__(self, cache_dir, max_bytes=100 * 1024 * 1024, offline=False,
+                 timeout=30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.timeout = timeout
+        # documents served from the cache and downloaded
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, url):
+        '''Return the content of the document at url, as bytes.'''
+        return self._fetch(url)[1]
+
+    def get_file(self, url):
+        '''Return the path of the local copy of the document at url.
+
+        The copy keeps the extension of the URL, the parser recognizes CSAR
+        archives by their extension.
+        '''
+        return self._fetch(url)[0]
+
+    def url_accessible(self, url):
+        '''Like UrlUtils.url_accessible, caching the document.'''
+        try:
+            self.fetch(url)
+        except urllib.error.HTTPError:
+            return False
+        return True
+
+    def load_yaml(self, path, a_file=True):
+        '''Load a document like toscaparser.utils.yamlparser.load_yaml.'''
+        if a_file:
+            return toscaparser.utils.yamlparser.load_yaml(path, a_file)
+        try:
+            contents = self.fetch(path)
+        except HttpCacheMissError as e:
+            ExceptionCollector.appendException(URLException(what=str(e)))
+            return
+        except urllib.error.HTTPError as e:
+            msg = (_('The server "%(path)s" couldn\'t fulfill the request. '
+                     'Error code: "%(code)s".')
+                   % {'path': path, 'code': e.code})
+            ExceptionCollector.appendException(URLException(what=msg))
+            return
+        except urllib.error.URLError as e:
+            msg = (_('Failed to reach server "%(path)s". Reason is: '
+                     '%(reason)s.')
+                   % {'path': path, 'reason': e.reason})
+            ExceptionCollector.appendException(URLException(what=msg))
+            return
+        return yaml.load(contents,
+                         Loader=toscaparser.utils.yamlparser.yaml_loader)
+
+    def _fetch(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        meta = self._get_meta(key)
+        body_file = None
+        if meta is not None:
+            body_file = os.path.join(self.cache_dir, meta['body'])
+            if not os.path.isfile(body_file):
+                meta = body_file = None
+
+        if self.offline:
+            if body_file is None:
+                raise HttpCacheMissError(url=url)
+            return self._hit(url, body_file)
+
+        request = urllib.request.Request(url)
+        if meta is not None:
+            if meta.get('etag'):
+                request.add_header('If-None-Match', meta['etag'])
+            if meta.get('last_modified'):
+                request.add_header('If-Modified-Since', meta['last_modified'])
+        try:
+            with urllib.request.urlopen(request,
+                                        timeout=self.timeout) as response:
+                contents = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and body_file is not None:
+                log.debug(_('%s was not modified.') % url)
+                return self._hit(url, body_file)
+            raise
+        except (urllib.error.URLError, OSError) as e:
+            if body_file is None:
+                raise
+            log.warning(_('Using the cached copy of %(url)s: %(error)s.')
+                        % {'url': url, 'error': e})
+            return self._hit(url, body_file)
+
+        self.misses += 1
+        meta = {'url': url,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'body': key + BODY_SUFFIX + self._get_extension(url)}
+        body_file = self._put(key, meta, contents)
+        return body_file, contents
+
+    def _hit(self, url, body_file):
+        try:
+            with open(body_file, 'rb') as f:
+                contents = f.read()
+            # the modification time orders the documents to remove
+            os.utime(body_file)
+        except OSError:
+            # removed by a concurrent translation
+            if self.offline:
+                raise HttpCacheMissError(url=url)
+            raise
+        self.hits += 1
+        return body_file, contents
+
+    def _get_extension(self, url):
+        extension = os.path.splitext(urlparse(url).path)[1]
+        if re.match(r'^\.\w{1,8}$', extension):
+            return extension
+        return ''
+
+    def _get_meta(self, key):
+        try:
+            with open(os.path.join(self.cache_dir, key + META_SUFFIX)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _put(self, key, meta, contents):
+        body_file = os.path.join(self.cache_dir, meta['body'])
+        if len(contents) > self.max_bytes:
+            log.debug(_('%s is too large to be cached.') % meta['url'])
+            return None
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # the body is written first, the metadata only references
+            # complete files
+            self._write(body_file, contents)
+            self._write(os.path.join(self.cache_dir, key + META_SUFFIX),
+                        json.dumps(meta).encode('utf-8'))
+            self._evict()
+        except OSError as e:
+            log.warning(_('Could not write to the HTTP cache %(dir)s: '
+                          '%(error)s.') % {'dir': self.cache_dir,
+                                           'error': e})
+            return None
+        return body_file
+
+    def _write(self, path, data):
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if BODY_SUFFIX not in name:
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+            size = sum(entry[1] for entry in entries)
+            for mtime, entry_size, name in sorted(entries):
+                if size <= self.max_bytes:
+                    break
+                key = name.split('.')[0]
+                for path in (name, key + META_SUFFIX):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, path))
+                    except OSError:
+                        pass
+                size -= entry_size
+
+
+# Cache used by the parser once installed
+CACHE = None
+_url_accessible = UrlUtils.__dict__['url_accessible']
+
+
+def install(cache_dir, max_bytes=100 * 1024 * 1024, offline=False):
+    '''Make the parser fetch the remote documents through an HttpCache.
+
+    The main templates, the imports, loaded directly or by an installed
+    ImportCache, and the checks of the artifact URLs use the cache.
+    Installing again replaces the cache.
+    '''
+    global CACHE
+    uninstall()
+    CACHE = HttpCache(cache_dir, max_bytes, offline)
+    toscaparser.tosca_template.YAML_LOADER = CACHE.load_yaml
+    if toscaparser.imports.YAML_LOADER == \
+            toscaparser.utils.yamlparser.load_yaml:
+        toscaparser.imports.YAML_LOADER = CACHE.load_yaml
+    UrlUtils.url_accessible = staticmethod(CACHE.url_accessible)
+    return CACHE
+
+
+def uninstall():
+    '''Make the parser fetch the remote documents itself again.'''
+    global CACHE
+    if CACHE is not None and \
+            toscaparser.imports.YAML_LOADER == CACHE.load_yaml:
+        toscaparser.imports.YAML_LOADER = \
+            toscaparser.utils.yamlparser.load_yaml
+    CACHE = None
+    toscaparser.tosca_template.YAML_LOADER = \
+        toscaparser.utils.yamlparser.load_yaml
+    UrlUtils.url_accessible = _url_accessible
+
+
+def get_yaml_loader():
+    '''Return the loader of the documents, using the installed cache.'''
+    if CACHE is not None:
+        return CACHE.load_yaml
+    return toscaparser.utils.yamlparser.load_yaml
+
+
+def read_url(url):
+    '''Return the content of the document at url, through the cache.'''
+    if CACHE is not None:
+        return CACHE.fetch(url)
+    with urllib.request.urlopen(url) as f:
+        return f.read()
+
+
+def get_template_path(path, a_file):
+    '''Return the path and a_file arguments of a ToscaTemplate.
+
+    A remote CSAR is downloaded by the parser itself, the local copy of the
+    installed cache is given instead, unless it is too large to be cached.
+    '''
+    if CACHE is not None and not a_file and \
+            urlparse(path).path.lower().endswith(('.zip', '.csar')):
+        local_path = CACHE.get_file(path)
+        if local_path:
+            return local_path, True
+    return path, a_file
@@ -12,13 +12,11 @@
 # under the License.
 
 import logging
+import threading
 
-try:
-    import openstack
-    client_available = True
-except ImportError:
-    client_available = False
-    pass
+from translator.common import clients
+
+client_available = clients.openstack_avail
 
 log = logging.getLogger('heat-translator')
 
@@ -71,6 +69,8 @@ SESSION = None
 
 IMAGES = {}
 
+_LOCK = threading.Lock()
+
 
 def get_images():
     global IMAGES
@@ -78,25 +78,33 @@ def get_images():
     if IMAGES:
         return IMAGES
 
-    if SESSION is not None and client_available:
-        try:
-            client = openstack.connection.Connection(session=SESSION)
-        except Exception as e:
-            # Handles any exception coming from openstack
-            log.warn(_('Choosing predefined images since received '
-                       'Openstack Exception: %s') % str(e))
-        else:
-            for image in client.image.images():
-                image_id = image.id.encode('ascii', 'ignore')
-                metadata = ["architecture", "type", "distribution", "version",
-                            "os_distro", "os_type", "os_version"]
-                if any(key in image.keys() for key in metadata):
-                    IMAGES[image_id] = {}
-                    for key in metadata:
-                        if key in image.keys():
-                            IMAGES[image_id][key] = image[key]
-
-    if not IMAGES:
-        IMAGES = PREDEF_IMAGES
-
-    return IMAGES
+    # translations running in parallel load the images only once
+    with _LOCK:
+        if IMAGES:
+            return IMAGES
+
+        # fill a new dictionary, the lookups outside of the lock only see
+        # complete ones
+        images = {}
+        if SESSION is not None and client_available:
+            try:
+                client = clients.REGISTRY.get_openstack(SESSION)
+            except Exception as e:
+                # Handles any exception coming from openstack
+                log.warn(_('Choosing predefined images since received '
+                           'Openstack Exception: %s') % str(e))
+            else:
+                for image in client.image.images():
+                    image_id = image.id.encode('ascii', 'ignore')
+                    metadata = ["architecture", "type", "distribution",
+                                "version", "os_distro", "os_type",
+                                "os_version"]
+                    if any(key in image.keys() for key in metadata):
+                        images[image_id] = {}
+                        for key in metadata:
+                            if key in image.keys():
+                                images[image_id][key] = image[key]
+
+        IMAGES = images or PREDEF_IMAGES
+
+        return IMAGES
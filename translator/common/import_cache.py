@@ -0,0 +1,165 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from collections import OrderedDict
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import tempfile
+import threading
+
+import toscaparser.imports
+from toscaparser.utils.gettextutils import _
+import toscaparser.utils.yamlparser
+from translator.common import http_cache
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+# marshal files are only read back by the Python version writing them
+CACHE_VERSION = 'v%d-py%d.%d' % ((marshal.version,) + sys.version_info[:2])
+
+
+class ImportCache(object):
+    '''Parsed TOSCA import documents cached by location and content.
+
+    Large type libraries, such as the ETSI NFV SOL001 definitions, are
+    imported by every template and parsed again by every ToscaTemplate.
+    The cache still reads the documents, but only parses them once for a
+    given location and content, then loads them with marshal from memory,
+    for the max_entries most recent ones, and from cache_dir when given,
+    across runs. Every load returns new objects, the parser can change
+    them freely.
+    '''
+
+    def __init__(self, cache_dir=None, max_entries=128):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # key -> marshalled document
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._documents = OrderedDict()
+
+    def load_yaml(self, path, a_file=True):
+        '''Load a document like toscaparser.utils.yamlparser.load_yaml.'''
+        try:
+            contents = self._read(path, a_file)
+        except Exception:
+            # the parser reports the documents it can not read
+            return http_cache.get_yaml_loader()(path, a_file)
+
+        key = self._get_key(path, contents)
+        data = self._get(key)
+        if data is not None:
+            try:
+                document = marshal.loads(data)
+            except (EOFError, TypeError, ValueError):
+                log.warning(_('Ignoring the corrupted import cache entry '
+                              'of %s.') % path)
+            else:
+                self.hits += 1
+                return document
+
+        self.misses += 1
+        if a_file:
+            contents = contents.decode('utf-8')
+        document = yaml.load(contents,
+                             Loader=toscaparser.utils.yamlparser.yaml_loader)
+        try:
+            data = marshal.dumps(document)
+        except ValueError:
+            log.debug(_('The import %s can not be cached.') % path)
+            return document
+        self._put(key, data)
+        return document
+
+    def _read(self, path, a_file):
+        if a_file:
+            with open(path, 'rb') as f:
+                return f.read()
+        return http_cache.read_url(path)
+
+    def _get_key(self, path, contents):
+        digest = hashlib.sha256(path.encode('utf-8') + b'\0' + contents)
+        return '%s-%s' % (CACHE_VERSION, digest.hexdigest())
+
+    def _get(self, key):
+        with self._lock:
+            data = self._documents.get(key)
+            if data is not None:
+                self._documents.move_to_end(key)
+                return data
+        if self.cache_dir:
+            try:
+                with open(self._get_cache_file(key), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self._put_memory(key, data)
+        return data
+
+    def _put(self, key, data):
+        self._put_memory(key, data)
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # write to a temporary file first, concurrent translations only
+            # read complete files
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._get_cache_file(key))
+        except OSError as e:
+            log.warning(_('Could not write to the import cache %(dir)s: '
+                          '%(error)s.') % {'dir': self.cache_dir,
+                                           'error': e})
+
+    def _put_memory(self, key, data):
+        with self._lock:
+            self._documents[key] = data
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_entries:
+                self._documents.popitem(last=False)
+
+    def _get_cache_file(self, key):
+        return os.path.join(self.cache_dir, key + '.marshal')
+
+
+# Cache used by the parser once installed
+CACHE = None
+
+
+def install(cache_dir=None, max_entries=128):
+    '''Make the parser load the imports through an ImportCache.
+
+    The main templates are still loaded by the parser. Installing again
+    replaces the cache.
+    '''
+    global CACHE
+    CACHE = ImportCache(cache_dir, max_entries)
+    toscaparser.imports.YAML_LOADER = CACHE.load_yaml
+    return CACHE
+
+
+def uninstall():
+    '''Make the parser load the imports itself again.'''
+    global CACHE
+    CACHE = None
+    toscaparser.imports.YAML_LOADER = http_cache.get_yaml_loader()
@@ -0,0 +1,111 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''
+Structured trace events of the translation.
+
+The events are logged by the heat-translator logger at DEBUG level, with
+the event in the trace_event attribute of the record. When that level is
+disabled, an event costs a single level check: nothing is created,
+translated or formatted. A TraceRecorder enables and collects the events,
+to find where the translation of a slow template spends its time.
+'''
+
+import logging
+import time
+
+log = logging.getLogger('heat-translator')
+
+
+class TraceEvent(object):
+    '''A step of the translation of a node, input or output.'''
+
+    __slots__ = ('phase', 'node', 'type', 'fields', 'time')
+
+    def __init__(self, phase, node=None, type=None, fields=None):
+        self.phase = phase
+        self.node = node
+        self.type = type
+        self.fields = fields or {}
+        self.time = time.perf_counter()
+
+    def __str__(self):
+        parts = [self.phase]
+        if self.node is not None:
+            parts.append(str(self.node))
+        if self.type is not None:
+            parts.append('(%s)' % self.type)
+        parts.extend('%s=%s' % item for item in sorted(self.fields.items()))
+        return ' '.join(parts)
+
+
+def event(phase, node=None, type=None, **fields):
+    '''Log a TraceEvent when the DEBUG level is enabled.'''
+    if log.isEnabledFor(logging.DEBUG):
+        trace_event = TraceEvent(phase, node, type, fields)
+        log.debug('%s', trace_event, extra={'trace_event': trace_event})
+
+
+class TraceRecorder(logging.Handler):
+    '''Collect the trace events, and write them to stream when given.
+
+    The recorder enables the DEBUG level of the heat-translator logger
+    between start and stop, or within a with statement.
+    '''
+
+    def __init__(self, stream=None):
+        super(TraceRecorder, self).__init__(logging.DEBUG)
+        self.stream = stream
+        self.events = []
+        self.start_time = None
+        self._level = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._level = log.level
+        log.addHandler(self)
+        log.setLevel(logging.DEBUG)
+        return self
+
+    def stop(self):
+        log.removeHandler(self)
+        log.setLevel(self._level)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def emit(self, record):
+        trace_event = getattr(record, 'trace_event', None)
+        if trace_event is None:
+            return
+        self.events.append(trace_event)
+        if self.stream is not None:
+            self.stream.write(self.format_event(trace_event) + '\n')
+
+    def format_event(self, trace_event):
+        return '%10.3fms %s' % ((trace_event.time - self.start_time) * 1000,
+                                trace_event)
+
+    def get_node_times(self):
+        '''Return the seconds spent on every node, slowest first.
+
+        The time until the next event is given to the node of an event.
+        '''
+        times = {}
+        for trace_event, next_event in zip(self.events, self.events[1:]):
+            if trace_event.node is not None:
+                times[trace_event.node] = (times.get(trace_event.node, 0) +
+                                           next_event.time - trace_event.time)
+        return sorted(times.items(), key=lambda item: -item[1])
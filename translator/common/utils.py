@@ -10,7 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-
+from collections import OrderedDict
 import json
 import logging
 import math
@@ -25,6 +25,8 @@ import zipfile
 
 from toscaparser.utils.gettextutils import _
 import toscaparser.utils.yamlparser
+from translator.common import hot_diff
+from translator.common import trace
 
 YAML_ORDER_PARSER = toscaparser.utils.yamlparser.simple_ordered_parse
 log = logging.getLogger('heat-translator')
@@ -54,8 +56,6 @@ class MemoryUnit(object):
             unit = MemoryUnit.validate_unit(unit)
         else:
             unit = MemoryUnit.UNIT_SIZE_DEFAULT
-            log.info(_('A memory unit is not provided for size; using the '
-                       'default unit %(default)s.') % {'default': 'B'})
         regex = re.compile(r'(\d*)\s*(\w*)')
         result = regex.match(str(size)).groups()
         if result[1]:
@@ -64,11 +64,10 @@ class MemoryUnit(object):
                             MemoryUnit.UNIT_SIZE_DICT[unit_size] *
                             math.pow(MemoryUnit.UNIT_SIZE_DICT
                                      [unit], -1))
-            log.info(_('Given size %(size)s is converted to %(num)s '
-                       '%(unit)s.') % {'size': size,
-                     'num': converted, 'unit': unit})
         else:
             converted = (str_to_num(result[0]))
+        trace.event('unit_conversion', size=size, converted=converted,
+                    unit=unit)
         return converted
 
     @staticmethod
@@ -90,7 +89,7 @@ class CompareUtils(object):
 
     MISMATCH_VALUE1_LABEL = "<Expected>"
     MISMATCH_VALUE2_LABEL = "<Provided>"
-    ORDERLESS_LIST_KEYS = ['allowed_values', 'depends_on']
+    ORDERLESS_LIST_KEYS = hot_diff.ORDERLESS_LIST_KEYS
 
     @staticmethod
     def compare_dicts(dict1, dict2):
@@ -224,7 +223,8 @@ class TranslationUtils(object):
         params: dictionary of parameter name value pairs
 
         Returns as a dictionary the difference between the HOT translation
-        of the given tosca_file and the given hot_file.
+        of the given tosca_file and the given hot_file, keyed by the JSON
+        pointers of the differing values.
         '''
 
         from toscaparser.tosca_template import ToscaTemplate
@@ -254,10 +254,16 @@ class TranslationUtils(object):
 
         expected_output_dict = {}
         for expected_hot_template in expected_hot_templates:
-            expected_output_dict[os.path.basename(expected_hot_template)] = \
-                YamlUtils.get_dict(expected_hot_template)
+            try:
+                expected_output_dict[os.path.basename(
+                    expected_hot_template)] = \
+                    hot_diff.load_golden(expected_hot_template)
+            except IOError:
+                expected_output_dict[os.path.basename(
+                    expected_hot_template)] = None
 
-        return CompareUtils.diff_dicts(expected_output_dict, output_dict)
+        return hot_diff.to_dict(hot_diff.diff(expected_output_dict,
+                                              output_dict))
 
 
 class UrlUtils(object):
@@ -357,6 +363,20 @@ def decompress(zip_file, dir=None):
     return dir
 
 
+def canonical_form(value):
+    '''Return a JSON serializable and deterministic form of a value.'''
+    if isinstance(value, dict):
+        return OrderedDict((str(k), canonical_form(v))
+                           for k, v in sorted(value.items(),
+                                              key=lambda i: str(i[0])))
+    if isinstance(value, (list, tuple)):
+        return [canonical_form(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # intrinsic functions resolved by the parser
+    return type(value).__name__
+
+
 def get_dict_value(dict_item, key, get_files):
     if key in dict_item:
         return get_files.append(dict_item[key])
@@ -0,0 +1,44 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import logging
+import os
+
+log = logging.getLogger('heat-translator')
+
+
+class ArtifactResolver(object):
+    '''Resolve the artifact paths of a translation against the CSAR root.
+
+    Implementation scripts and files referenced by get_file are relative to
+    the root of the CSAR they come from. They are joined to the real path
+    of that root instead of changing the working directory, so translations
+    can run concurrently, and every path is resolved only once. Without a
+    CSAR root, the paths are left as they are.
+    '''
+
+    def __init__(self, csar_dir=None):
+        self.csar_dir = csar_dir
+        # the working directory is the real path of the CSAR root after
+        # changing to it, keep the same paths
+        self._root = os.path.realpath(csar_dir) if csar_dir else None
+        self._paths = {}
+
+    def resolve(self, path):
+        if self._root is None:
+            return path
+        resolved = self._paths.get(path)
+        if resolved is None:
+            resolved = os.path.normpath(os.path.join(self._root, path))
+            self._paths[path] = resolved
+        return resolved
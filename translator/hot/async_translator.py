@@ -0,0 +1,140 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+import functools
+import logging
+
+from toscaparser.tosca_template import ToscaTemplate
+from toscaparser.utils.gettextutils import _
+from translator.common import deploy_engine
+from translator.common import flavors
+from translator.common import images
+from translator.hot.tosca_translator import TOSCATranslator
+
+log = logging.getLogger('heat-translator')
+
+
+async def _run(executor, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs))
+
+
+async def load_template(path, parsed_params=None, a_file=True,
+                        executor=None):
+    '''Parse a TOSCA template, fetching its URL and imports, in an executor.
+
+    The default executor of the running loop is used when none is given.
+    '''
+    return await _run(executor, ToscaTemplate, path, parsed_params, a_file)
+
+
+async def load_catalogs(executor=None):
+    '''Load the flavors and images catalogs used to translate computes.
+
+    The catalogs are loaded once for the process, from Nova and Glance when
+    a session is set, loading them first keeps the translations from
+    blocking on them.
+    '''
+    return await asyncio.gather(_run(executor, flavors.get_flavors),
+                                _run(executor, images.get_images))
+
+
+async def deploy(engine, deployments, executor=None):
+    '''Create stacks with a DeployEngine and wait for them in an executor.
+
+    The deployments are returned with their final status once all the
+    stacks are created or failed, see DeployEngine.deploy.
+    '''
+    return await _run(executor, engine.deploy, deployments)
+
+
+def translate_file(path, parsed_params=None, base_filename='output.yaml',
+                   a_file=True, **kwargs):
+    '''Parse and translate a template to the files dictionary output.
+
+    The arguments and result are plain values, so it can run in a process
+    pool executor.
+    '''
+    parsed_params = parsed_params or {}
+    tosca = ToscaTemplate(path, parsed_params, a_file)
+    translator = TOSCATranslator(tosca, parsed_params, **kwargs)
+    return translator.translate_to_yaml_files_dict(base_filename)
+
+
+async def translate_template(path, parsed_params=None,
+                             base_filename='output.yaml', a_file=True,
+                             executor=None, **kwargs):
+    '''Parse and translate a template in an executor.
+
+    The keyword arguments are passed to TOSCATranslator. The whole work
+    runs in a single call of the executor, which can be a process pool to
+    run CPU bound translations on several cores.
+    '''
+    return await _run(executor, translate_file, path, parsed_params,
+                      base_filename, a_file, **kwargs)
+
+
+class AsyncTOSCATranslator(object):
+    '''Translate a parsed template without blocking the event loop.
+
+    It wraps a TOSCATranslator created with the same arguments and runs its
+    translations in an executor, the default one of the running loop when
+    none is given. The results kept by the translator, such as metrics,
+    are available in translator once a translation is done.
+    '''
+
+    def __init__(self, tosca, parsed_params, executor=None, **kwargs):
+        self.translator = TOSCATranslator(tosca, parsed_params, **kwargs)
+        self.executor = executor
+
+    async def translate(self):
+        log.debug(_('Translating the template in an executor.'))
+        return await _run(self.executor, self.translator.translate)
+
+    async def translate_to_yaml_files_dict(self, base_filename):
+        log.debug(_('Translating the template in an executor.'))
+        return await _run(self.executor,
+                          self.translator.translate_to_yaml_files_dict,
+                          base_filename)
+
+    async def translate_to_json(self):
+        log.debug(_('Translating the template in an executor.'))
+        return await _run(self.executor, self.translator.translate_to_json)
+
+    async def translate_to_json_files_dict(self, base_filename):
+        log.debug(_('Translating the template in an executor.'))
+        return await _run(self.executor,
+                          self.translator.translate_to_json_files_dict,
+                          base_filename)
+
+    async def translate_to_dict(self):
+        log.debug(_('Translating the template in an executor.'))
+        return await _run(self.executor, self.translator.translate_to_dict)
+
+    async def deploy(self, heat_client, stack_name, parameters=None,
+                     **kwargs):
+        '''Translate the template, create its stack and wait for it.
+
+        The stack of the YAML output is created on Heat, like the command
+        line does, by a DeployEngine created with the keyword arguments.
+        The StackDeployment is returned with its final status.
+        '''
+        template = deploy_engine.load_template(await self.translate())
+        deployment = await _run(self.executor, deploy_engine.StackDeployment,
+                                stack_name, template, parameters)
+        engine = deploy_engine.DeployEngine(heat_client, **kwargs)
+        log.debug(_('Deploying the stack %s in an executor.') % stack_name)
+        await deploy(engine, [deployment], self.executor)
+        return deployment
@@ -0,0 +1,424 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from collections import OrderedDict
+import json
+import logging
+
+from toscaparser.utils.gettextutils import _
+from translator.common.exception import UnsupportedOptimizationError
+from translator.hot import stack_metrics
+from translator.hot.stack_metrics import get_references
+from translator.hot.syntax.hot_parameter import HotParameter
+from translator.hot.syntax.hot_resource import HotResource
+from translator.hot.syntax.hot_template import HotTemplate
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+OPTIMIZATIONS = (SHARE_SOFTWARE_CONFIGS, GROUP_SOFTWARE_DEPLOYMENTS,
+                 REDUCE_DEPENDENCIES, HOIST_PROPERTY_VALUES) = \
+                ('share_software_configs', 'group_software_deployments',
+                 'reduce_dependencies', 'hoist_property_values')
+
+SOFTWARE_CONFIG = 'OS::Heat::SoftwareConfig'
+SOFTWARE_DEPLOYMENT = 'OS::Heat::SoftwareDeployment'
+SOFTWARE_DEPLOYMENT_GROUP = 'OS::Heat::SoftwareDeploymentGroup'
+
+HOT_FUNCTIONS = ('and', 'contains', 'digest', 'equals', 'filter', 'if',
+                 'list_concat', 'list_concat_unique', 'list_join',
+                 'make_url', 'map_merge', 'map_replace', 'not', 'or',
+                 'repeat', 'resource_facade', 'str_replace', 'str_split',
+                 'yaql')
+
+
+def replace_references(value, renames):
+    '''Return a HOT value referencing resources by their new names.'''
+    if isinstance(value, dict):
+        replaced = type(value)()
+        for key, item in value.items():
+            if key == 'get_resource' and item in renames:
+                replaced[key] = renames[item]
+            elif key == 'get_attr' and isinstance(item, list) and item and \
+                    item[0] in renames:
+                replaced[key] = [renames[item[0]]] + \
+                    replace_references(item[1:], renames)
+            else:
+                replaced[key] = replace_references(item, renames)
+        return replaced
+    if isinstance(value, list):
+        return [replace_references(item, renames) for item in value]
+    return value
+
+
+def _get_signature(value):
+    # JSON form of plain HOT values, values holding anything else are never
+    # considered identical
+    try:
+        return json.dumps(value, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_function(value):
+    return any(str(key).startswith('get_') or key in HOT_FUNCTIONS
+               for key in value)
+
+
+def _is_plain(value):
+    # strings read back as other values, or as functions, once the quotes
+    # are removed from the YAML output cannot be moved to parameters
+    try:
+        return yaml.safe_load(value) == value
+    except yaml.YAMLError:
+        return False
+
+
+class HotOptimizer(object):
+    '''Optional passes rewriting a translated HOT template.
+
+    The passes keep the meaning of the template for Heat while making it
+    smaller. They run on the final resources and outputs, once all the
+    references between them are known.
+    '''
+
+    # estimated YAML overhead of a get_param reference and of a parameter
+    REFERENCE_SIZE = 16
+    PARAMETER_SIZE = 30
+
+    def __init__(self, hot_template, optimizations=None):
+        self.hot_template = hot_template
+        self.optimizations = list(optimizations or OPTIMIZATIONS)
+        for name in self.optimizations:
+            if name not in OPTIMIZATIONS:
+                raise UnsupportedOptimizationError(name=name)
+        # bytes of YAML output saved by every pass run
+        self.report = OrderedDict()
+        self._plain = {}
+
+    def optimize(self):
+        size = self._get_size()
+        for name in OPTIMIZATIONS:
+            if name in self.optimizations:
+                log.debug(_('Running the %s optimization.') % name)
+                getattr(self, name)()
+                new_size = self._get_size()
+                self.report[name] = size - new_size
+                size = new_size
+                log.info(_('The %(name)s optimization saved %(size)d '
+                           'bytes.') % {'name': name,
+                                        'size': self.report[name]})
+        return self.report
+
+    def _get_size(self):
+        return len(self.hot_template.output_to_yaml(
+            HotTemplate.LATEST, False).encode('utf-8'))
+
+    def share_software_configs(self):
+        '''Keep a single SoftwareConfig of every distinct configuration.'''
+        kept = {}
+        replaced = {}
+        for resource in self.hot_template.resources:
+            if resource.type != SOFTWARE_CONFIG or resource.hide_resource:
+                continue
+            signature = _get_signature(
+                [resource.properties, resource.metadata,
+                 resource.update_policy, resource.deletion_policy,
+                 [depend.name for depend in resource.depends_on]])
+            if signature is None:
+                continue
+            if signature in kept:
+                replaced[resource] = kept[signature]
+            else:
+                kept[signature] = resource
+        self._replace_resources(replaced)
+        log.info(_('Shared %d identical software configs.') % len(replaced))
+
+    def group_software_deployments(self):
+        '''Collapse identical deployments on several servers into groups.
+
+        Deployments differing only by their server become a single
+        SoftwareDeploymentGroup. Deployments whose attributes are used are
+        left alone, as the attributes of a group are different.
+        '''
+        resources = self.hot_template.resources
+        referenced = set()
+        for resource in resources:
+            get_references(resource.properties, referenced)
+        for output in self.hot_template.outputs:
+            get_references(output.value, referenced)
+
+        candidates = [resource for resource in resources
+                      if self._is_groupable(resource, referenced)]
+        replaced = {}
+        grouped = True
+        # deployments can only be grouped once their dependencies are, group
+        # until nothing changes
+        while grouped:
+            grouped = False
+            buckets = OrderedDict()
+            for resource in candidates:
+                if resource in replaced:
+                    continue
+                properties = OrderedDict(
+                    (key, value) for key, value in resource.properties.items()
+                    if key != 'server')
+                depends_on = [replaced.get(depend, depend).name
+                              for depend in resource.depends_on]
+                signature = _get_signature([properties,
+                                            sorted(set(depends_on))])
+                if signature is not None:
+                    buckets.setdefault(signature, []).append(resource)
+            for members in buckets.values():
+                servers = [member.properties['server']['get_resource']
+                           for member in members]
+                if len(members) < 2 or len(set(servers)) < len(servers):
+                    continue
+                group = self._create_deployment_group(members, servers,
+                                                      replaced)
+                resources.insert(resources.index(members[0]), group)
+                for member in members:
+                    replaced[member] = group
+                grouped = True
+        self._replace_resources(replaced)
+        log.info(_('Grouped %d software deployments.') % len(replaced))
+
+    def _is_groupable(self, resource, referenced):
+        if resource.type != SOFTWARE_DEPLOYMENT or resource.hide_resource \
+                or resource.name in referenced or resource.metadata \
+                or resource.update_policy or resource.deletion_policy:
+            return False
+        server = resource.properties.get('server')
+        return isinstance(server, dict) and list(server) == ['get_resource']
+
+    def _create_deployment_group(self, members, servers, replaced):
+        first = members[0]
+        properties = OrderedDict()
+        for key, value in first.properties.items():
+            if key == 'server':
+                properties['servers'] = OrderedDict(
+                    (server, {'get_resource': server}) for server in servers)
+            else:
+                properties[key] = value
+        depends_on = []
+        for depend in first.depends_on:
+            depend = replaced.get(depend, depend)
+            if depend not in depends_on:
+                depends_on.append(depend)
+        names = set(resource.name for resource in self.hot_template.resources)
+        name = first.name + '_group'
+        while name in names:
+            name += '_'
+        return HotResource(first.nodetemplate, name,
+                           SOFTWARE_DEPLOYMENT_GROUP, properties,
+                           depends_on=depends_on, csar_dir=first.csar_dir,
+                           topology=first.topology,
+                           artifacts=first.artifacts)
+
+    def reduce_dependencies(self):
+        '''Drop the depends_on entries implied by other dependencies.
+
+        An entry is implied when the resource references the dependency in
+        its properties, or depends on another resource depending on it,
+        directly or not. Heat creates the resources in the same order
+        without them.
+        '''
+        resources = OrderedDict(
+            (resource.name, resource)
+            for resource in self.hot_template.resources
+            if not resource.hide_resource)
+        references = {}
+        dependencies = OrderedDict()
+        for name, resource in resources.items():
+            references[name] = set(
+                reference for reference
+                in get_references(resource.properties)
+                if reference in resources and reference != name)
+            dependencies[name] = references[name].union(
+                depend.name for depend in resource.depends_on
+                if resources.get(depend.name) is depend and
+                depend.name != name)
+        reachable = self._get_reachable(dependencies)
+
+        removed = 0
+        for name, resource in resources.items():
+            implied = set(references[name])
+            for depend in dependencies[name]:
+                implied.update(reachable[depend])
+            depends_on = []
+            for depend in resource.depends_on:
+                # keep the dependencies in a loop, Heat reports the loop
+                if depend in depends_on or (
+                        depend.name in implied and
+                        depend.name not in reachable[depend.name]):
+                    removed += 1
+                else:
+                    depends_on.append(depend)
+            resource.depends_on = depends_on
+        log.info(_('Removed %d implied dependencies.') % removed)
+
+        output = OrderedDict()
+        for resource in resources.values():
+            output.update(resource.get_dict_output())
+        critical_path = stack_metrics.get_critical_path(output)
+        log.info(_('The critical path has %(length)d resources: %(path)s.')
+                 % {'length': len(critical_path),
+                    'path': ', '.join(critical_path)})
+
+    def _get_reachable(self, dependencies):
+        # names of all the resources every resource depends on, directly or
+        # not, walking the dependencies depth first without recursion
+        reachable = {}
+        for start in dependencies:
+            if start in reachable:
+                continue
+            stack = [(start, iter(sorted(dependencies[start])))]
+            visiting = set([start])
+            while stack:
+                name, depends = stack[-1]
+                for depend in depends:
+                    if depend not in reachable and depend not in visiting:
+                        visiting.add(depend)
+                        stack.append(
+                            (depend, iter(sorted(dependencies[depend]))))
+                        break
+                else:
+                    stack.pop()
+                    visiting.discard(name)
+                    reachable[name] = set(dependencies[name])
+                    for depend in dependencies[name]:
+                        reachable[name].update(reachable.get(depend, ()))
+        return reachable
+
+    def hoist_property_values(self):
+        '''Move the constant values repeated in properties to parameters.
+
+        Strings and maps repeated often enough for the references to be
+        shorter than the copies become parameters defaulting to the value.
+        Function arguments and resource types are left in place.
+        '''
+        resources = [resource for resource in self.hot_template.resources
+                     if not resource.hide_resource and
+                     isinstance(resource.properties, dict)]
+        constants = OrderedDict()
+        for resource in resources:
+            self._get_constants(resource.properties, [resource.name],
+                                constants)
+
+        names = set(parameter.name
+                    for parameter in self.hot_template.parameters)
+        hoisted = {}
+        for signature, (count, value, path) in constants.items():
+            name = '_'.join(str(key) for key in path)
+            while name in names:
+                name += '_'
+            size = len(signature)
+            saved = count * (size - len(name) - self.REFERENCE_SIZE) - \
+                size - len(name) - self.PARAMETER_SIZE
+            if count < 2 or saved <= 0:
+                continue
+            names.add(name)
+            hoisted[signature] = name
+            param_type = 'json' if isinstance(value, dict) else 'string'
+            self.hot_template.parameters.append(
+                HotParameter(name, param_type, default=value))
+
+        if hoisted:
+            for resource in resources:
+                resource.properties = self._hoist(resource.properties,
+                                                  hoisted)
+        log.info(_('Hoisted %d property values to parameters.') %
+                 len(hoisted))
+
+    def _get_hoistable_signature(self, value):
+        if not value or not self._is_constant(value):
+            return None
+        if isinstance(value, (dict, str)):
+            return _get_signature(value)
+        return None
+
+    def _is_constant(self, value):
+        if isinstance(value, dict):
+            return 'type' not in value and not _is_function(value) and \
+                all(self._is_constant(item) for item in value.values())
+        if isinstance(value, list):
+            return all(self._is_constant(item) for item in value)
+        if isinstance(value, str):
+            plain = self._plain.get(value)
+            if plain is None:
+                plain = self._plain[value] = _is_plain(value)
+            return plain
+        return value is None or isinstance(value, (bool, int, float))
+
+    def _get_items(self, value):
+        if isinstance(value, dict):
+            if _is_function(value):
+                return []
+            return [(key, item) for key, item in value.items()
+                    if key != 'type']
+        if isinstance(value, list):
+            return list(enumerate(value))
+        return []
+
+    def _get_constants(self, value, path, constants):
+        # count the largest constant values found in a value
+        for key, item in self._get_items(value):
+            signature = self._get_hoistable_signature(item)
+            if signature is None:
+                self._get_constants(item, path + [key], constants)
+                continue
+            entry = constants.get(signature)
+            if entry is None:
+                constants[signature] = [1, item, path + [key]]
+            else:
+                entry[0] += 1
+
+    def _hoist(self, value, hoisted):
+        items = self._get_items(value)
+        if not items:
+            return value
+        if isinstance(value, dict):
+            result = type(value)(value)
+        else:
+            result = list(value)
+        for key, item in items:
+            signature = self._get_hoistable_signature(item)
+            if signature in hoisted:
+                # a new reference every time, shared values become YAML
+                # aliases
+                result[key] = {'get_param': hoisted[signature]}
+            elif signature is None:
+                result[key] = self._hoist(item, hoisted)
+        return result
+
+    def _replace_resources(self, replaced):
+        # drop the replaced resources and point the references to them to
+        # their replacements
+        if not replaced:
+            return
+        renames = dict((resource.name, replacement.name)
+                       for resource, replacement in replaced.items())
+        resources = [resource for resource in self.hot_template.resources
+                     if resource not in replaced]
+        for resource in resources:
+            resource.properties = replace_references(resource.properties,
+                                                     renames)
+            depends_on = []
+            for depend in resource.depends_on:
+                depend = replaced.get(depend, depend)
+                if depend is not resource and depend not in depends_on:
+                    depends_on.append(depend)
+            resource.depends_on = depends_on
+        for output in self.hot_template.outputs:
+            output.value = replace_references(output.value, renames)
+        self.hot_template.resources[:] = resources
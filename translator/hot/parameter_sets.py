@@ -0,0 +1,154 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+import logging
+import os
+
+from toscaparser.tosca_template import ToscaTemplate
+from toscaparser.utils.gettextutils import _
+from translator.common import utils
+from translator.hot.tosca_translator import JSON
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.hot.tosca_translator import YAML
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+
+def get_capability_inputs(tosca):
+    '''Return the names of the inputs used by node capabilities.
+
+    The parser replaces these inputs by their values, which the translation
+    uses to match flavors and images, where the other inputs are translated
+    to get_param references.
+    '''
+    names = set()
+    topology = tosca.tpl.get('topology_template') or {}
+    for node in (topology.get('node_templates') or {}).values():
+        get_inputs = []
+        utils.get_dict_value((node or {}).get('capabilities') or {},
+                             'get_input', get_inputs)
+        for get_input in get_inputs:
+            if isinstance(get_input, list) and get_input:
+                get_input = get_input[0]
+            if isinstance(get_input, str):
+                names.add(get_input)
+    return names
+
+
+def get_nested_parameters(yaml_files, base_filename):
+    '''Return the names of the parameters defined by nested templates.
+
+    The nested templates get the parameters of the main template, with the
+    values of the translation, when their resources use them.
+    '''
+    names = set()
+    for name, content in yaml_files.items():
+        if name != base_filename:
+            template = yaml.safe_load(content) or {}
+            names.update(template.get('parameters') or {})
+    return names
+
+
+class ParameterSetTranslator(object):
+    '''Translate a template with many sets of parameter values.
+
+    The template is parsed and translated once for every structure, then
+    only its inputs are translated again for the parameter sets sharing
+    that structure. The structure of a parameter set is given by the values
+    of the inputs changing the translated resources: the inputs of the host
+    and os capabilities, used to match flavors and images, the inputs
+    copied to nested templates, and whether a key_name is given when the
+    template has no such input.
+
+    The keyword arguments are passed to TOSCATranslator.
+    '''
+
+    def __init__(self, path, a_file=True, output_format=YAML, **kwargs):
+        self.path = path
+        self.a_file = a_file
+        self.output_format = output_format
+        self.kwargs = kwargs
+        # inputs changing the translated resources, known once the first
+        # parameter set is translated
+        self.structural_inputs = None
+        self.has_key_name_input = False
+        # structure key -> translator
+        self.translators = {}
+        self.parses = 0
+
+    def translate(self, parameter_sets, base_filename):
+        '''Return the files dictionary of every parameter set, in order.'''
+        return [self.translate_parameters(parsed_params, base_filename)
+                for parsed_params in parameter_sets]
+
+    def translate_parameters(self, parsed_params, base_filename):
+        '''Return the files dictionary of a parameter set.'''
+        parsed_params = dict(parsed_params)
+        if self.structural_inputs is not None:
+            key = self._get_structure_key(parsed_params)
+            translator = self.translators.get(key)
+            if translator is not None:
+                log.debug(_('Translating the inputs of a parameter set.'))
+                return translator.translate_parameters(
+                    parsed_params, base_filename, self.output_format)
+
+        log.debug(_('Translating the structure of a parameter set.'))
+        tosca = ToscaTemplate(self.path, parsed_params, self.a_file)
+        self.parses += 1
+        translator = TOSCATranslator(tosca, parsed_params, **self.kwargs)
+        if self.output_format == JSON:
+            files = translator.translate_to_json_files_dict(base_filename)
+        else:
+            files = translator.translate_to_yaml_files_dict(base_filename)
+        if self.structural_inputs is None:
+            input_names = set(input.name for input in translator.inputs)
+            self.has_key_name_input = 'key_name' in input_names
+            self.structural_inputs = get_capability_inputs(tosca)
+            # the key_name parameter is added when the template has no
+            # such input
+            self.structural_inputs.update(
+                get_nested_parameters(files, base_filename) &
+                (input_names | set(['key_name'])))
+        self.translators[self._get_structure_key(parsed_params)] = translator
+        return files
+
+    def _get_structure_key(self, parsed_params):
+        values = dict((name, parsed_params.get(name))
+                      for name in self.structural_inputs)
+        if not self.has_key_name_input and 'key_name' not in values:
+            values['key_name'] = 'key_name' in parsed_params
+        return json.dumps(utils.canonical_form(values))
+
+
+def load_parameter_sets(path):
+    '''Load named parameter sets from a YAML or JSON file.
+
+    The file maps the name of every set to its parameter values.
+    '''
+    with open(path) as f:
+        parameter_sets = yaml.safe_load(f)
+    if not isinstance(parameter_sets, dict) or not all(
+            isinstance(values, dict) for values in parameter_sets.values()):
+        msg = (_('The parameter sets file %(path)s must map names to '
+                 'parameter values.') % {'path': path})
+        log.error(msg)
+        raise ValueError(msg)
+    for name in parameter_sets:
+        if not isinstance(name, str) or os.sep in name or name in ('.', '..'):
+            msg = (_('"%(name)s" is not a valid parameter set name.')
+                   % {'name': name})
+            log.error(msg)
+            raise ValueError(msg)
+    return parameter_sets
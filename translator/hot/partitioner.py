@@ -0,0 +1,380 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from collections import OrderedDict
+import logging
+
+from toscaparser.utils.gettextutils import _
+from translator.hot.stack_metrics import get_references
+from translator.hot.syntax.hot_output import HotOutput
+from translator.hot.syntax.hot_parameter import HotParameter
+from translator.hot.syntax.hot_template import HotTemplate
+from translator.hot.syntax.hot_template import load_inline_function
+from translator.hot.syntax.hot_template import load_inline_functions
+
+log = logging.getLogger('heat-translator')
+
+STACK_NAME = 'stack_%d'
+
+# attributes whose values are maps or lists, passed to the nested stacks
+# as json parameters, the others are passed as strings
+COLLECTION_ATTRIBUTES = ('addresses', 'all_attributes', 'attributes',
+                         'fixed_ips', 'networks', 'outputs', 'refs',
+                         'refs_map', 'show', 'subnets', 'tags')
+
+
+class PartitionedResource(object):
+    '''Resource of a nested stack, with references to other stacks.'''
+
+    __slots__ = ('resource', 'output', 'hide_resource')
+
+    def __init__(self, resource, output):
+        self.resource = resource
+        self.output = output
+        self.hide_resource = False
+
+    def extract_substack_templates(self, base_filename, hot_template_version):
+        return self.resource.extract_substack_templates(base_filename,
+                                                        hot_template_version)
+
+    def embed_substack_templates(self, hot_template_version):
+        self.resource.embed_substack_templates(hot_template_version)
+
+    def get_substack_nodes(self):
+        return self.resource.get_substack_nodes()
+
+    def get_dict_output(self):
+        return self.output
+
+
+class StackResource(object):
+    '''Template resource creating the nested stack of a partition.'''
+
+    def __init__(self, name, template):
+        self.name = name
+        self.template = template
+        self.properties = OrderedDict()
+        self.depends_on = []
+        self.hide_resource = False
+
+    @property
+    def filename(self):
+        return self.name + '.yaml'
+
+    def extract_substack_templates(self, base_filename, hot_template_version):
+        return self.template.output_to_yaml_files_dict(self.filename,
+                                                       hot_template_version)
+
+    def embed_substack_templates(self, hot_template_version):
+        pass
+
+    def get_dict_output(self):
+        resource_sections = OrderedDict()
+        resource_sections['type'] = self.filename
+        if self.properties:
+            resource_sections['properties'] = self.properties
+        if self.depends_on:
+            resource_sections['depends_on'] = self.depends_on
+        return {self.name: resource_sections}
+
+
+class StackPartitioner(object):
+    '''Split the resources of a large template into nested stacks.
+
+    Heat validates and creates a template of thousands of resources slowly,
+    where it handles nested stacks of max_resources resources in parallel.
+    The resources not depending on each other are grouped in the same
+    stacks. The groups of dependent resources larger than max_resources are
+    cut in the order Heat creates them, where the fewest dependencies cross
+    the cut, so the stacks depend on each other without loops. The
+    get_resource and get_attr references between stacks become outputs of
+    the referenced stack, given as parameters to the referencing one.
+    '''
+
+    def __init__(self, hot_template, max_resources):
+        self.hot_template = hot_template
+        self.max_resources = max_resources
+
+    def partition(self):
+        '''Replace the resources by nested stacks, return these stacks.
+
+        Nothing changes when the template has at most max_resources
+        resources or when they can not be split.
+        '''
+        visible = [resource for resource in self.hot_template.resources
+                   if not resource.hide_resource]
+        if len(visible) <= self.max_resources:
+            return []
+        outputs = [resource.get_dict_output() for resource in visible]
+        unit_of = dict((name, index) for index, output in enumerate(outputs)
+                       for name in output)
+        dependencies = [set() for output in outputs]
+        for index, output in enumerate(outputs):
+            for sections in output.values():
+                for name in self._get_dependencies(sections):
+                    if name in unit_of and unit_of[name] != index:
+                        dependencies[index].add(unit_of[name])
+
+        groups = self._get_groups(dependencies)
+        if len(groups) < 2:
+            return []
+        log.info(_('Splitting the %(count)d resources into %(stacks)d '
+                   'nested stacks.') % {'count': len(unit_of),
+                                        'stacks': len(groups)})
+
+        self._stack_of = {}
+        for stack_index, group in enumerate(groups):
+            for index in group:
+                for name in outputs[index]:
+                    self._stack_of[name] = stack_index
+        self._stacks = [StackResource(name, HotTemplate())
+                        for name in self._get_stack_names(len(groups))]
+        self._parameters = dict((parameter.name, parameter)
+                                for parameter in self.hot_template.parameters)
+        self._stack_parameters = [OrderedDict() for group in groups]
+        self._stack_outputs = [OrderedDict() for group in groups]
+
+        for stack_index, group in enumerate(groups):
+            stack = self._stacks[stack_index]
+            resources = []
+            depends_on = set()
+            for index in group:
+                output = OrderedDict()
+                for name, sections in outputs[index].items():
+                    output[name] = self._get_stack_sections(
+                        sections, stack_index, depends_on)
+                resources.append(PartitionedResource(visible[index], output))
+            stack.template.resources = resources
+            # the stacks referenced through get_attr are already waited for
+            referenced = set(self._stacks[index].name for index in depends_on)
+            stack.depends_on = sorted(
+                referenced - get_references(stack.properties))
+        self.hot_template.outputs = [
+            HotOutput(output.name, self._replace(output.value, None),
+                      output.description)
+            for output in self.hot_template.outputs]
+        for stack_index, stack in enumerate(self._stacks):
+            stack.template.description = self.hot_template.description
+            stack.template.parameters = list(
+                self._stack_parameters[stack_index].values())
+            stack.template.outputs = list(
+                self._stack_outputs[stack_index].values())
+
+        self.hot_template.resources = [
+            resource for resource in self.hot_template.resources
+            if resource.hide_resource] + self._stacks
+        return self._stacks
+
+    def _get_dependencies(self, sections):
+        sections = sections or {}
+        depends_on = sections.get('depends_on') or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        return get_references(
+            load_inline_functions(dict((key, value)
+                                       for key, value in sections.items()
+                                       if key != 'depends_on')),
+            set(depends_on))
+
+    def _get_groups(self, dependencies):
+        # units connected by dependencies are split only when they do not
+        # fit in a stack, the others are packed together
+        neighbors = [set(depends_on) for depends_on in dependencies]
+        for index, depends_on in enumerate(dependencies):
+            for depend in depends_on:
+                neighbors[depend].add(index)
+        seen = set()
+        chunks = []
+        components = []
+        for start in range(len(dependencies)):
+            if start in seen:
+                continue
+            component = []
+            seen.add(start)
+            stack = [start]
+            while stack:
+                index = stack.pop()
+                component.append(index)
+                for neighbor in neighbors[index]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        stack.append(neighbor)
+            if len(component) > self.max_resources:
+                chunks.extend(self._split(component, dependencies,
+                                          neighbors))
+            else:
+                components.append(component)
+
+        groups = [list(chunk) for chunk in chunks]
+        for component in sorted(components, key=len, reverse=True):
+            for group in groups:
+                if len(group) + len(component) <= self.max_resources:
+                    group.extend(component)
+                    break
+            else:
+                groups.append(list(component))
+        return [sorted(group) for group in groups]
+
+    def _split(self, component, dependencies, neighbors):
+        # resources in the order Heat creates them, dependencies first, so
+        # the references only go from a chunk to the previous ones
+        members = set(component)
+        waiting = dict((index, len(dependencies[index] & members))
+                       for index in component)
+        ready = sorted(index for index, count in waiting.items()
+                       if count == 0)
+        order = []
+        while ready:
+            index = ready.pop(0)
+            order.append(index)
+            for neighbor in sorted(neighbors[index] & members):
+                if index in dependencies[neighbor]:
+                    waiting[neighbor] -= 1
+                    if waiting[neighbor] == 0:
+                        ready.append(neighbor)
+        # resources in a dependency loop are never created by Heat
+        order.extend(sorted(members - set(order)))
+
+        chunks = []
+        while len(order) > self.max_resources:
+            remaining = set(order)
+            prefix = set()
+            cut = 0
+            best = None
+            for position, index in enumerate(order[:self.max_resources]):
+                for neighbor in neighbors[index] & remaining:
+                    cut += -1 if neighbor in prefix else 1
+                prefix.add(index)
+                size = position + 1
+                if size >= self.max_resources // 2 and \
+                        (best is None or cut <= best[0]):
+                    best = (cut, size)
+            chunks.append(order[:best[1]])
+            order = order[best[1]:]
+        chunks.append(order)
+        return chunks
+
+    def _get_stack_names(self, count):
+        names = set(self._stack_of)
+        names.update(resource.name for resource in self.hot_template.resources)
+        prefix = STACK_NAME
+        while any(prefix % (index + 1) in names for index in range(count)):
+            prefix = 'nested_' + prefix
+        return [prefix % (index + 1) for index in range(count)]
+
+    def _get_stack_sections(self, sections, stack_index, depends_on):
+        stack_sections = OrderedDict()
+        for key, value in sections.items():
+            if key == 'depends_on':
+                names = [value] if isinstance(value, str) else value
+                value = []
+                for name in names:
+                    if self._stack_of.get(name, stack_index) == stack_index:
+                        value.append(name)
+                    else:
+                        depends_on.add(self._stack_of[name])
+                if not value:
+                    continue
+            else:
+                value = self._replace(value, stack_index, depends_on)
+            stack_sections[key] = value
+        return stack_sections
+
+    def _replace(self, value, stack_index, depends_on=None):
+        # rewrite the references of a value of the stack at stack_index, or
+        # of the main template when it is None
+        if isinstance(value, dict):
+            replaced = type(value)()
+            for key, item in value.items():
+                if key == 'get_resource' and isinstance(item, str) and \
+                        self._is_external(item, stack_index):
+                    replaced.update(self._reference(
+                        key, item, None, [], stack_index, depends_on))
+                elif key == 'get_attr' and isinstance(item, list) and \
+                        item and isinstance(item[0], str) and \
+                        self._is_external(item[0], stack_index):
+                    path = self._replace(item[2:], stack_index, depends_on)
+                    replaced.update(self._reference(
+                        key, item[0], item[1] if len(item) > 1 else None,
+                        path, stack_index, depends_on))
+                elif key == 'get_param' and stack_index is not None:
+                    name = item[0] if isinstance(item, list) else item
+                    self._pass_parameter(name, stack_index)
+                    replaced[key] = self._replace(item, stack_index,
+                                                  depends_on)
+                else:
+                    replaced[key] = self._replace(item, stack_index,
+                                                  depends_on)
+            return replaced
+        if isinstance(value, list):
+            return [self._replace(item, stack_index, depends_on)
+                    for item in value]
+        function = load_inline_function(value)
+        if function is not None:
+            replaced = self._replace(function, stack_index, depends_on)
+            if replaced != function:
+                return replaced
+        return value
+
+    def _is_external(self, name, stack_index):
+        return name in self._stack_of and \
+            self._stack_of[name] != stack_index
+
+    def _reference(self, function, name, attribute, path, stack_index,
+                   depends_on):
+        # the referenced stack outputs the value, given as a parameter to
+        # the referencing stack
+        target = self._stack_of[name]
+        if function == 'get_resource':
+            output_name = 'resource_%s' % name
+            output_value = {'get_resource': name}
+            collection = False
+        elif attribute is None:
+            # all the attributes of the resource, as a map
+            output_name = 'attributes_%s' % name
+            output_value = {'get_attr': [name]}
+            collection = True
+        else:
+            output_name = 'attribute_%s_%s' % (name, attribute)
+            output_value = {'get_attr': [name, attribute]}
+            collection = attribute in COLLECTION_ATTRIBUTES
+        if output_name not in self._stack_outputs[target]:
+            self._stack_outputs[target][output_name] = HotOutput(
+                output_name, output_value)
+        stack_value = {'get_attr': [self._stacks[target].name, output_name]}
+        if stack_index is None:
+            stack_value['get_attr'].extend(path)
+            return stack_value
+
+        depends_on.add(target)
+        parameters = self._stack_parameters[stack_index]
+        if path or collection:
+            parameters[output_name] = HotParameter(output_name, 'json')
+        elif output_name not in parameters:
+            parameters[output_name] = HotParameter(output_name, 'string')
+        self._stacks[stack_index].properties[output_name] = stack_value
+        if path:
+            return {'get_param': [output_name] + path}
+        return {'get_param': output_name}
+
+    def _pass_parameter(self, name, stack_index):
+        parameter = self._parameters.get(name)
+        parameters = self._stack_parameters[stack_index]
+        if parameter is None or name in parameters:
+            return
+        # the value is always given by the main template
+        parameters[name] = HotParameter(
+            name, parameter.type, label=parameter.label,
+            description=parameter.description, hidden=parameter.hidden,
+            constraints=parameter.constraints)
+        self._stacks[stack_index].properties[name] = {'get_param': name}
@@ -0,0 +1,203 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import logging
+import marshal
+import zlib
+
+from toscaparser.utils.gettextutils import _
+from translator.common.exception import InvalidSnapshotError
+from translator.hot.partitioner import StackResource
+from translator.hot import stack_metrics
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+SNAPSHOT_MAGIC = b'HOTSNAP'
+SNAPSHOT_VERSION = 1
+
+RESOURCE_KEYS = (TYPE, DEPENDS_ON, NODE) = ('type', 'depends_on', 'node')
+
+DATE_TYPES = (DATE, DATETIME) = ('date', 'datetime')
+
+
+def get_source_nodes(hot_template, base_filename):
+    '''Return the TOSCA node names of the resources of a translation.
+
+    The names are given by template file name and resource name, for the
+    main template, the nested stacks of a partitioned template and the
+    nested templates of the scaling policies.
+    '''
+    nodes = {}
+    _add_source_nodes(hot_template, base_filename, nodes)
+    return nodes
+
+
+def _add_source_nodes(hot_template, filename, nodes):
+    template_nodes = nodes.setdefault(filename, {})
+    for resource in hot_template.resources:
+        if isinstance(resource, StackResource):
+            _add_source_nodes(resource.template, resource.filename, nodes)
+            continue
+        # partitioned resources wrap the translated ones
+        resource = getattr(resource, 'resource', resource)
+        node = getattr(getattr(resource, 'nodetemplate', None), 'name',
+                       getattr(resource, 'node', None))
+        if node is not None:
+            template_nodes[resource.name] = node
+        for name, names in resource.get_substack_nodes().items():
+            nodes.setdefault(name, {}).update(names)
+
+
+def get_resource_graph(templates, nodes=None):
+    '''Return the resources of the templates by file and resource name.
+
+    Every resource is given as a dictionary with its HOT type, the names of
+    the resources of its template it depends on, and the name of the TOSCA
+    node it was translated from, None when unknown.
+    '''
+    nodes = nodes or {}
+    graph = {}
+    for filename, template in templates.items():
+        resources = (template or {}).get('resources') or {}
+        template_nodes = nodes.get(filename) or {}
+        dependencies = stack_metrics.get_dependencies(resources)
+        graph[filename] = dict(
+            (name, {TYPE: (resource or {}).get(TYPE),
+                    DEPENDS_ON: dependencies[name],
+                    NODE: template_nodes.get(name)})
+            for name, resource in resources.items())
+    return graph
+
+
+class TranslationSnapshot(object):
+    '''Translated templates with a compact binary form loading quickly.
+
+    The templates are the HOT dictionaries by file name, as in the output
+    of translate_to_yaml_files_dict once loaded, and resources their
+    resource graph as given by get_resource_graph. The binary form is the
+    marshal encoding of both, compressed with zlib: loading it is much
+    faster than parsing the YAML files again.
+    '''
+
+    def __init__(self, templates, main_template, resources=None):
+        self.templates = templates
+        self.main_template = main_template
+        if resources is None:
+            resources = get_resource_graph(templates)
+        self.resources = resources
+
+    @classmethod
+    def from_yaml_files_dict(cls, yaml_files, base_filename, nodes=None):
+        '''Create the snapshot of the output of translate_to_yaml_files_dict.
+
+        The nodes are the TOSCA node names given by get_source_nodes.
+        '''
+        templates = dict((name, yaml.safe_load(content))
+                         for name, content in yaml_files.items())
+        return cls(templates, base_filename,
+                   get_resource_graph(templates, nodes))
+
+    def to_yaml_files_dict(self):
+        '''Return the YAML contents of the templates by file name.'''
+        return dict((name, yaml.safe_dump(template, default_flow_style=False,
+                                          sort_keys=False))
+                    for name, template in self.templates.items())
+
+    def dumps(self, level=6):
+        '''Return the binary form, compressed at the given zlib level.'''
+        dates = []
+        templates = _replace_dates(self.templates, [], dates)
+        try:
+            data = marshal.dumps((templates, self.main_template,
+                                  self.resources, dates))
+        except ValueError as e:
+            msg = (_('The translated templates can not be saved to a '
+                     'snapshot: %s.') % e)
+            log.error(msg)
+            raise ValueError(msg)
+        return (SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION, marshal.version]) +
+                zlib.compress(data, level))
+
+    @classmethod
+    def loads(cls, data):
+        '''Return the snapshot of a binary form given by dumps.'''
+        header = len(SNAPSHOT_MAGIC)
+        if not data.startswith(SNAPSHOT_MAGIC) or len(data) < header + 2:
+            raise InvalidSnapshotError(reason=_('not a translation snapshot'))
+        # marshal reads the data of all its previous versions
+        if data[header] != SNAPSHOT_VERSION or \
+                data[header + 1] > marshal.version:
+            raise InvalidSnapshotError(
+                reason=_('unsupported version %(version)d, marshal version '
+                         '%(marshal)d') % {'version': data[header],
+                                           'marshal': data[header + 1]})
+        try:
+            templates, main_template, resources, dates = marshal.loads(
+                zlib.decompress(data[header + 2:]))
+        except (EOFError, TypeError, ValueError, zlib.error):
+            raise InvalidSnapshotError(reason=_('corrupted data'))
+        _restore_dates(templates, dates)
+        return cls(templates, main_template, resources)
+
+    def save(self, path, level=6):
+        with open(path, 'wb') as f:
+            f.write(self.dumps(level))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+
+def _replace_dates(value, path, dates):
+    # marshal has no date types, the dates YAML loads, such as the template
+    # versions, are kept as ISO strings along with their paths
+    if isinstance(value, dict):
+        replaced = None
+        for key, item in value.items():
+            new_item = _replace_dates(item, path + [key], dates)
+            if new_item is not item:
+                if replaced is None:
+                    replaced = dict(value)
+                replaced[key] = new_item
+        return value if replaced is None else replaced
+    if isinstance(value, list):
+        replaced = None
+        for index, item in enumerate(value):
+            new_item = _replace_dates(item, path + [index], dates)
+            if new_item is not item:
+                if replaced is None:
+                    replaced = list(value)
+                replaced[index] = new_item
+        return value if replaced is None else replaced
+    if isinstance(value, datetime.datetime):
+        dates.append((path, DATETIME))
+        return value.isoformat()
+    if isinstance(value, datetime.date):
+        dates.append((path, DATE))
+        return value.isoformat()
+    return value
+
+
+def _restore_dates(templates, dates):
+    for path, date_type in dates:
+        parent = templates
+        for key in path[:-1]:
+            parent = parent[key]
+        if date_type == DATETIME:
+            parent[path[-1]] = datetime.datetime.fromisoformat(
+                parent[path[-1]])
+        else:
+            parent[path[-1]] = datetime.date.fromisoformat(parent[path[-1]])
@@ -0,0 +1,206 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from collections import OrderedDict
+import logging
+import os
+
+from toscaparser.utils.gettextutils import _
+from translator.common import utils
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+METRICS = (RESOURCES, TEMPLATES, NESTED_TEMPLATES, NESTING_DEPTH,
+           DEPENDENCY_DEPTH, DEPENDENCY_WIDTH, CRITICAL_PATH, GET_FILES,
+           GET_FILE_BYTES, UNRESOLVED_FILES) = \
+          ('resources', 'templates', 'nested_templates', 'nesting_depth',
+           'dependency_depth', 'dependency_width', 'critical_path',
+           'get_files', 'get_file_bytes', 'unresolved_files')
+
+
+def get_references(value, references=None):
+    '''Return the names of the resources referenced by a HOT value.'''
+    if references is None:
+        references = set()
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == 'get_resource' and isinstance(item, str):
+                references.add(item)
+            elif key == 'get_attr' and isinstance(item, list) and item:
+                references.add(item[0])
+            get_references(item, references)
+    elif isinstance(value, list):
+        for item in value:
+            get_references(item, references)
+    return references
+
+
+def get_dependencies(resources):
+    '''Return the names of the resources every resource depends on.
+
+    Heat creates a resource once all the resources it depends on, through
+    depends_on or get_resource and get_attr references, are created.
+    '''
+    dependencies = OrderedDict()
+    for name, resource in resources.items():
+        resource = resource or {}
+        depends_on = resource.get('depends_on') or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        references = get_references(resource.get('properties'),
+                                    set(depends_on))
+        dependencies[name] = sorted(reference for reference in references
+                                    if reference in resources and
+                                    reference != name)
+    return dependencies
+
+
+def get_dependency_levels(resources):
+    '''Return the names of the resources created at every level.
+
+    The resources of a level can be created at the same time, once the
+    resources of the previous levels are created.
+    '''
+    levels, loop = _get_levels(get_dependencies(resources))
+    if loop:
+        # resources in a dependency loop are never created by Heat, they
+        # are kept in a last level
+        levels.append(loop)
+    return levels
+
+
+def get_critical_path(resources):
+    '''Return the longest chain of resources created one after the other.
+
+    The time Heat takes to create a stack is at least the time it takes to
+    create the resources of this chain.
+    '''
+    dependencies = get_dependencies(resources)
+    levels, loop = _get_levels(dependencies)
+    if not levels:
+        return []
+    level_of = dict((name, index) for index, level in enumerate(levels)
+                    for name in level)
+    path = [sorted(levels[-1])[0]]
+    while level_of[path[-1]] > 0:
+        path.append(sorted(
+            depend for depend in dependencies[path[-1]]
+            if level_of[depend] == level_of[path[-1]] - 1)[0])
+    path.reverse()
+    return path
+
+
+def _get_levels(dependencies):
+    # count the dependencies left of every resource, a resource is created
+    # at the level following the last of its dependencies
+    waiting = dict((name, len(depends_on))
+                   for name, depends_on in dependencies.items())
+    dependents = dict((name, []) for name in dependencies)
+    for name, depends_on in dependencies.items():
+        for depend in depends_on:
+            dependents[depend].append(name)
+    levels = []
+    level = [name for name, count in waiting.items() if count == 0]
+    while level:
+        levels.append(level)
+        next_level = []
+        for name in level:
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    next_level.append(dependent)
+        level = next_level
+    loop = [name for name, count in waiting.items() if count > 0]
+    return levels, loop
+
+
+def get_stack_metrics(templates, main_template):
+    '''Return the metrics of a translated stack.
+
+    The templates are the HOT dictionaries of the stack by file name, as in
+    the output of translate_to_yaml_files_dict once loaded. The metrics
+    give an idea of the work of Heat to create the stack:
+
+    - resources: resources of all the templates,
+    - templates and nested_templates: number of templates,
+    - nesting_depth: deepest chain of nested templates, 0 without any,
+    - dependency_depth: number of resources Heat has to create one after
+      the other in the most serialized template,
+    - dependency_width: largest number of resources of a template Heat can
+      create at the same time,
+    - critical_path: names of the longest chain of resources of the main
+      template created one after the other,
+    - get_files and get_file_bytes: files sent along the templates and
+      their total size, unresolved_files counts those not found locally.
+    '''
+    metrics = OrderedDict((metric, 0) for metric in METRICS)
+    metrics[TEMPLATES] = len(templates)
+    metrics[NESTED_TEMPLATES] = len(templates) - 1
+
+    files = set()
+    for template in templates.values():
+        resources = (template or {}).get('resources') or {}
+        metrics[RESOURCES] += len(resources)
+        levels = get_dependency_levels(resources)
+        metrics[DEPENDENCY_DEPTH] = max(metrics[DEPENDENCY_DEPTH],
+                                        len(levels))
+        metrics[DEPENDENCY_WIDTH] = max(
+            [metrics[DEPENDENCY_WIDTH]] + [len(level) for level in levels])
+        if template is templates.get(main_template):
+            metrics[CRITICAL_PATH] = get_critical_path(resources)
+        get_files = []
+        utils.get_dict_value(template or {}, 'get_file', get_files)
+        files.update(path for path in get_files if isinstance(path, str))
+
+    metrics[NESTING_DEPTH] = _get_nesting_depth(templates, main_template,
+                                                set())
+    metrics[GET_FILES] = len(files)
+    for path in sorted(files):
+        if os.path.isfile(path):
+            metrics[GET_FILE_BYTES] += os.path.getsize(path)
+        else:
+            metrics[UNRESOLVED_FILES] += 1
+    return metrics
+
+
+def get_yaml_files_metrics(yaml_files, base_filename):
+    '''Return the metrics of the output of translate_to_yaml_files_dict.'''
+    templates = dict((name, yaml.safe_load(content))
+                     for name, content in yaml_files.items())
+    metrics = get_stack_metrics(templates, base_filename)
+    log.info(_('Translated stack metrics: %s.') % dict(metrics))
+    return metrics
+
+
+def _get_nested_template_names(value, templates, names):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == 'type' and isinstance(item, str) and item in templates:
+                names.add(item)
+            else:
+                _get_nested_template_names(item, templates, names)
+    elif isinstance(value, list):
+        for item in value:
+            _get_nested_template_names(item, templates, names)
+    return names
+
+
+def _get_nesting_depth(templates, name, visiting):
+    resources = (templates.get(name) or {}).get('resources')
+    nested = _get_nested_template_names(resources, templates, set())
+    visiting.add(name)
+    depths = [1 + _get_nesting_depth(templates, nested_name, visiting)
+              for nested_name in nested if nested_name not in visiting]
+    visiting.discard(name)
+    return max(depths) if depths else 0
@@ -15,6 +15,8 @@
 class HotOutput(object):
     '''Attributes for HOT output section.'''
 
+    __slots__ = ('name', 'value', 'description')
+
     def __init__(self, name, value, description=None):
         self.name = name
         self.value = value
@@ -13,7 +13,7 @@
 
 from collections import OrderedDict
 import logging
-from toscaparser.utils.gettextutils import _
+from translator.common import trace
 
 KEYS = (TYPE, DESCRIPTION, DEFAULT, CONSTRAINTS, HIDDEN, LABEL) = \
        ('type', 'description', 'default', 'constraints', 'hidden', 'label')
@@ -24,6 +24,9 @@ log = logging.getLogger('heat-translator')
 class HotParameter(object):
     '''Attributes for HOT parameter section.'''
 
+    __slots__ = ('name', 'type', 'label', 'description', 'default', 'hidden',
+                 'constraints')
+
     def __init__(self, name, type, label=None, description=None, default=None,
                  hidden=None, constraints=None):
         self.name = name
@@ -33,7 +36,7 @@ class HotParameter(object):
         self.default = default
         self.hidden = hidden
         self.constraints = constraints
-        log.info(_('Initialized the input parameters.'))
+        trace.event('parameter', name, type)
 
     def get_dict_output(self):
         param_sections = OrderedDict()
@@ -19,6 +19,11 @@ from toscaparser.elements.interfaces import InterfacesDef
 from toscaparser.functions import GetInput
 from toscaparser.nodetemplate import NodeTemplate
 from toscaparser.utils.gettextutils import _
+from translator.common import trace
+from translator.hot.artifact_resolver import ArtifactResolver
+from translator.hot.syntax.hot_template import LiteralString
+from translator.hot.topology_graph import TopologyGraph
+from translator.hot import type_resolver
 
 
 SECTIONS = (TYPE, PROPERTIES, MEDADATA, DEPENDS_ON, UPDATE_POLICY,
@@ -46,30 +51,37 @@ log = logging.getLogger('heat-translator')
 class HotResource(object):
     '''Base class for TOSCA node type translation to Heat resource type.'''
 
+    # Plain resources, like the SoftwareConfig and SoftwareDeployment ones
+    # created for every lifecycle operation, are kept without a __dict__.
+    # Subclasses not declaring __slots__ get one for their own attributes.
+    __slots__ = ('nodetemplate', 'name', 'type', 'properties', 'csar_dir',
+                 'metadata', 'depends_on', 'depends_on_nodes',
+                 'update_policy', 'deletion_policy', 'group_dependencies',
+                 'hide_resource', 'topology', 'artifacts')
+
     def __init__(self, nodetemplate, name=None, type=None, properties=None,
                  metadata=None, depends_on=None,
-                 update_policy=None, deletion_policy=None, csar_dir=None):
-        log.debug(_('Translating TOSCA node type to HOT resource type.'))
+                 update_policy=None, deletion_policy=None, csar_dir=None,
+                 topology=None, artifacts=None):
         self.nodetemplate = nodetemplate
         if name:
             self.name = name
         else:
             self.name = nodetemplate.name
         self.type = type
+        trace.event('resource', self.name,
+                    getattr(nodetemplate, 'type', None), hot_type=type)
         self.properties = properties or {}
 
         self.csar_dir = csar_dir
+        # artifact paths resolver shared by the translator
+        self.artifacts = artifacts
         # special case for HOT softwareconfig
-        cwd = os.getcwd()
         if type == 'OS::Heat::SoftwareConfig':
             config = self.properties.get('config')
             if isinstance(config, dict):
-                if self.csar_dir:
-                    os.chdir(self.csar_dir)
-                    implementation_artifact = os.path.abspath(config.get(
-                        'get_file'))
-                else:
-                    implementation_artifact = config.get('get_file')
+                implementation_artifact = self.get_artifacts().resolve(
+                    config.get('get_file'))
                 if implementation_artifact:
                     filename, file_extension = os.path.splitext(
                         implementation_artifact)
@@ -86,7 +98,6 @@ class HotResource(object):
 
             if self.properties.get('group') is None:
                 self.properties['group'] = 'script'
-        os.chdir(cwd)
         self.metadata = metadata
 
         # The difference between depends_on and depends_on_nodes is
@@ -111,6 +122,20 @@ class HotResource(object):
         # if hide_resource is set to true, then this resource will not be
         # generated in the output yaml.
         self.hide_resource = False
+        # requirement graph of the TOSCA topology shared by the translator
+        self.topology = topology
+
+    def get_topology(self):
+        # fall back to a graph compiled on demand for resources translated
+        # outside of TranslateNodeTemplates
+        if self.topology is None:
+            self.topology = TopologyGraph()
+        return self.topology
+
+    def get_artifacts(self):
+        if self.artifacts is None:
+            self.artifacts = ArtifactResolver(self.csar_dir)
+        return self.artifacts
 
     def handle_properties(self):
         # the property can hold a value or the intrinsic function get_input
@@ -164,23 +189,21 @@ class HotResource(object):
             hosting_on_server = self.name
             servers = {'get_resource': self.name}
 
-        cwd = os.getcwd()
+        artifacts = self.get_artifacts()
         for operation in operations.values():
             if operation.name in operations_deploy_sequence:
                 config_name = node_name + '_' + operation.name + '_config'
                 deploy_name = node_name + '_' + operation.name + '_deploy'
-                if self.csar_dir:
-                    os.chdir(self.csar_dir)
-                    get_file = os.path.abspath(operation.implementation)
-                else:
-                    get_file = operation.implementation
+                get_file = artifacts.resolve(operation.implementation)
                 hot_resources.append(
                     HotResource(self.nodetemplate,
                                 config_name,
                                 'OS::Heat::SoftwareConfig',
                                 {'config':
                                     {'get_file': get_file}},
-                                csar_dir=self.csar_dir))
+                                csar_dir=self.csar_dir,
+                                topology=self.topology,
+                                artifacts=self.artifacts))
                 if operation.name == reserve_current and \
                     base_type != 'tosca.nodes.Compute':
                     deploy_resource = self
@@ -196,14 +219,15 @@ class HotResource(object):
                         HotResource(self.nodetemplate,
                                     deploy_name,
                                     sw_deploy_res,
-                                    sd_config, csar_dir=self.csar_dir)
+                                    sd_config, csar_dir=self.csar_dir,
+                                    topology=self.topology,
+                                    artifacts=self.artifacts)
                     hot_resources.append(deploy_resource)
                     deploy_lookup[operation] = deploy_resource
                 lifecycle_inputs = self._get_lifecycle_inputs(operation)
                 if lifecycle_inputs:
                     deploy_resource.properties['input_values'] = \
                         lifecycle_inputs
-        os.chdir(cwd)
 
         # Add dependencies for the set of HOT resources in the sequence defined
         # in operations_deploy_sequence
@@ -270,10 +294,9 @@ class HotResource(object):
                                             + '\n'
 
         if install_roles_script:
-            # remove trailing \n
-            install_roles_script = install_roles_script[:-1]
-            # add shebang and | to use literal scalar type (for multiline)
-            install_roles_script = '|\n#!/bin/bash\n' + install_roles_script
+            # add shebang, written as a literal block scalar in YAML
+            install_roles_script = LiteralString('#!/bin/bash\n' +
+                                                 install_roles_script)
 
             config_name = initial_node_name + '_install_roles_config'
             deploy_name = initial_node_name + '_install_roles_deploy'
@@ -281,13 +304,17 @@ class HotResource(object):
                 HotResource(self.nodetemplate, config_name,
                             'OS::Heat::SoftwareConfig',
                             {'config': install_roles_script},
-                            csar_dir=self.csar_dir))
+                            csar_dir=self.csar_dir,
+                            topology=self.topology,
+                            artifacts=self.artifacts))
             sd_config = {'config': {'get_resource': config_name},
                          server_key: hosting_on_server}
             deploy_resource = \
                 HotResource(self.nodetemplate, deploy_name,
                             sw_deploy_res,
-                            sd_config, csar_dir=self.csar_dir)
+                            sd_config, csar_dir=self.csar_dir,
+                            topology=self.topology,
+                            artifacts=self.artifacts)
             hot_resources.append(deploy_resource)
 
             return deploy_resource
@@ -319,7 +346,9 @@ class HotResource(object):
                         deploy_name,
                         sw_deploy_res,
                         sd_config,
-                        depends_on=[hot_depends], csar_dir=self.csar_dir)
+                        depends_on=[hot_depends], csar_dir=self.csar_dir,
+                        topology=self.topology,
+                        artifacts=self.artifacts)
         connect_inputs = self._get_connect_inputs(config_location, operation)
         if connect_inputs:
             deploy_resource.properties['input_values'] = connect_inputs
@@ -378,6 +407,13 @@ class HotResource(object):
     def embed_substack_templates(self, hot_template_version):
         pass
 
+    # this function gives the TOSCA nodes translated to the resources of
+    # the substacks provided as external files.
+    #
+    # return a dict of filename-dict of resource name-node name
+    def get_substack_nodes(self):
+        return {}
+
     def get_dict_output(self):
         resource_sections = OrderedDict()
         resource_sections[TYPE] = self.type
@@ -429,21 +465,18 @@ class HotResource(object):
         host_exists = False
         this_node_template = self.nodetemplate \
             if node_template is None else node_template
-        for requirement in this_node_template.requirements:
-            for requirement_name, assignment in requirement.items():
-                for check_node in this_node_template.related_nodes:
-                    # check if the capability is Container
-                    if isinstance(assignment, dict):
-                        node_name = assignment.get('node')
-                    else:
-                        node_name = assignment
-                    if node_name and node_name == check_node.name:
-                        if self._is_container_type(requirement_name,
-                                                   check_node):
-                            hosting_servers.append(check_node.name)
-                            host_exists = True
-                        elif check_node.related_nodes and not host_exists:
-                            return self._get_hosting_server(check_node)
+        topology = self.get_topology()
+        related = dict(topology.related(this_node_template))
+        for edge in topology.requirements(this_node_template):
+            check_node = edge.target
+            if check_node is None or check_node not in related:
+                continue
+            # check if the capability is Container
+            if self._is_container_type(edge.name, check_node):
+                hosting_servers.append(check_node.name)
+                host_exists = True
+            elif topology.related(check_node) and not host_exists:
+                return self._get_hosting_server(check_node)
         if hosting_servers:
             return hosting_servers
         return None
@@ -514,16 +547,23 @@ class HotResource(object):
         }
         return nested_template
 
+    def _get_nested_nodes(self, scale_res, yaml_name):
+        nodes = {}
+        for res in scale_res:
+            node = getattr(res.nodetemplate, 'name', None)
+            if node is not None:
+                nodes[res.name] = node
+        return {yaml_name: nodes}
+
     def remove_depends_on(self, depends_on_set):
         # Remove all depends_on including depends_on_set.
-        for rel, node in self.nodetemplate.relationships.items():
-            for do in depends_on_set:
-                if rel.is_derived_from(do):
-                    for hot_resource in self.depends_on_nodes:
-                        if node.name == hot_resource.name and \
-                                hot_resource in self.depends_on:
-                            self.depends_on.remove(hot_resource)
-                            break
+        for edge in self.get_topology().edges(self.nodetemplate):
+            if any(edge.is_derived_from(do) for do in depends_on_set):
+                for hot_resource in self.depends_on_nodes:
+                    if edge.target_name == hot_resource.name and \
+                            hot_resource in self.depends_on:
+                        self.depends_on.remove(hot_resource)
+                        break
 
     @staticmethod
     def get_all_artifacts(nodetemplate):
@@ -554,51 +594,49 @@ class HotResource(object):
             return operations
 
         node_type = node.type_definition
+        type_operations = type_resolver.RESOLVER.get_type_data(
+            'operations:Standard', node_type,
+            HotResource._get_type_operations)
+        # bind the operations of the type to the node
+        all_operations = {}
+        for name, elems in type_operations:
+            all_operations[name] = InterfacesDef(node_type, 'Standard', node,
+                                                 name, elems)
+        all_operations.update(operations)
+        return all_operations
 
-        while True:
-            type_operations = HotResource._get_interface_operations_from_type(
-                node_type, node, 'Standard')
+    @staticmethod
+    def _get_type_operations(node_type):
+        # walk the type hierarchy from the most derived type, the operations
+        # of the parent types come first, overridden by the derived types
+        operations = OrderedDict()
+        while node_type is not None:
+            type_operations = OrderedDict(
+                HotResource._get_interface_elems_from_type(node_type,
+                                                           'Standard'))
             type_operations.update(operations)
             operations = type_operations
-
-            if node_type.parent_type is not None:
-                node_type = node_type.parent_type
-            else:
-                return operations
+            node_type = node_type.parent_type
+        return tuple(operations.items())
 
     @staticmethod
-    def _get_interface_operations_from_type(node_type, node, lifecycle_name):
-        operations = {}
+    def _get_interface_elems_from_type(node_type, lifecycle_name):
         base_type = HotResource.get_base_type_str(node_type)
         if base_type in policy_type:
-            return operations
+            return []
+        elems = []
         if node_type.interfaces and lifecycle_name in node_type.interfaces:
-            for name, elems in node_type.interfaces[lifecycle_name].items():
+            for name, value in node_type.interfaces[lifecycle_name].items():
                 # ignore empty operations (only type)
                 # ignore global interface inputs,
                 # concrete inputs are on the operations themselves
                 if name != 'type' and name != 'inputs':
-                    operations[name] = InterfacesDef(node_type,
-                                                     lifecycle_name,
-                                                     node, name, elems)
-        return operations
+                    elems.append((name, value))
+        return elems
 
     @staticmethod
     def get_base_type_str(node_type):
-        if isinstance(node_type, str):
-            return node_type
-        if node_type.parent_type is not None:
-            parent_type_str = None
-            if isinstance(node_type.parent_type, str):
-                parent_type_str = node_type.parent_type
-            else:
-                parent_type_str = node_type.parent_type.type
-
-            if parent_type_str and parent_type_str.endswith('.Root'):
-                return node_type.type
-            return HotResource.get_base_type_str(node_type.parent_type)
-
-        return node_type.type
+        return type_resolver.RESOLVER.get_base_type_str(node_type)
 
 
 class HOTSoftwareDeploymentResources(object):
@@ -607,6 +645,9 @@ class HOTSoftwareDeploymentResources(object):
     SoftwareDeployment or SoftwareDeploymentGroup Resource
     """
 
+    __slots__ = ('software_deployment', 'software_deployment_group',
+                 'server_key', 'hosting_server', 'servers')
+
     HOT_SW_DEPLOYMENT_RESOURCE = 'OS::Heat::SoftwareDeployment'
     HOT_SW_DEPLOYMENT_GROUP_RESOURCE = 'OS::Heat::SoftwareDeploymentGroup'
 
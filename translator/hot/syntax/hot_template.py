@@ -12,15 +12,115 @@
 # under the License.
 
 from collections import OrderedDict
+import copy
+import json
 import logging
 import os
 import textwrap
 from toscaparser.utils.gettextutils import _
 import yaml
 
+# NOTE: orjson is an optional faster backend of the JSON output
+try:
+    import orjson
+except ImportError:
+    orjson_avail = False
+else:
+    orjson_avail = True
+
 log = logging.getLogger('heat-translator')
 
 
+def dump_json(data):
+    '''Serialize a HOT dictionary to compact JSON.
+
+    Values JSON has no type for, such as the dates YAML loads from the
+    template versions, are serialized as strings.
+    '''
+    if orjson_avail:
+        return orjson.dumps(data, default=str,
+                            option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, default=str, ensure_ascii=False,
+                      separators=(',', ':'))
+
+
+class LiteralString(str):
+    '''String written as a literal block scalar in the YAML output.'''
+
+    __slots__ = ()
+
+
+def represent_literal_string(dumper, data):
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+
+
+def load_inline_function(value):
+    '''Return the mapping of an inline YAML string, None otherwise.
+
+    Some resources give intrinsic functions and maps as strings, such as
+    '{ get_resource: network }'. The YAML output writes them without
+    quotes, where Heat reads them as functions and maps.
+    '''
+    if isinstance(value, str) and value.startswith('{') and \
+            value.endswith('}'):
+        try:
+            function = yaml.safe_load(value)
+        except yaml.YAMLError:
+            return None
+        if isinstance(function, dict):
+            return function
+    return None
+
+
+def load_inline_functions(value):
+    '''Return a HOT value with its inline functions loaded.'''
+    if isinstance(value, dict):
+        return type(value)((key, load_inline_functions(item))
+                           for key, item in value.items())
+    if isinstance(value, list):
+        return [load_inline_functions(item) for item in value]
+    function = load_inline_function(value)
+    return value if function is None else function
+
+
+class CompactResource(object):
+    '''Plain HOT data of a translated resource.
+
+    It answers the output calls made by HotTemplate with the data captured
+    from a resource, without keeping the resource or the TOSCA objects it
+    was translated from.
+    '''
+
+    __slots__ = ('name', 'hide_resource', 'nested_templates', 'nested_nodes',
+                 'output', 'node')
+
+    def __init__(self, resource, base_filename, hot_template_version,
+                 memo=None):
+        self.name = resource.name
+        # name of the TOSCA node translated to the resource
+        self.node = getattr(getattr(resource, 'nodetemplate', None), 'name',
+                            None)
+        self.hide_resource = resource.hide_resource
+        self.nested_templates = dict(resource.extract_substack_templates(
+            base_filename, hot_template_version))
+        self.nested_nodes = resource.get_substack_nodes()
+        self.output = {}
+        if not self.hide_resource:
+            self.output = copy.deepcopy(resource.get_dict_output(), memo)
+
+    def extract_substack_templates(self, base_filename, hot_template_version):
+        return self.nested_templates
+
+    def embed_substack_templates(self, hot_template_version):
+        pass
+
+    def get_substack_nodes(self):
+        return self.nested_nodes
+
+    def get_dict_output(self):
+        return self.output
+
+
 class HotTemplate(object):
     '''Container for full Heat Orchestration template.'''
 
@@ -37,6 +137,20 @@ class HotTemplate(object):
         self.parameters = []
         self.description = ""
 
+    def compact(self, base_filename, hot_template_version=LATEST):
+        '''Replace the translated resources by their plain HOT data.
+
+        The resources keep references to the node templates they were
+        translated from, which keep the whole parsed TOSCA template alive.
+        Once the resources are final, compacting releases them while the
+        template still produces the same files dictionary output.
+        '''
+        # values shared between resources stay shared once copied
+        memo = {}
+        self.resources = [CompactResource(resource, base_filename,
+                                          hot_template_version, memo)
+                          for resource in self.resources]
+
     def represent_ordereddict(self, dumper, data):
         nodes = []
         for key, value in data.items():
@@ -70,7 +184,6 @@ class HotTemplate(object):
             for resource in self.resources:
                 resource.embed_substack_templates(hot_template_version)
 
-        dict_output = OrderedDict()
         # Version
         version_string = self.VERSION + ": " + hot_template_version + "\n\n"
 
@@ -81,6 +194,66 @@ class HotTemplate(object):
             wrapped_txt = "\n  ".join(textwrap.wrap(self.description, 80))
             desc_str = self.DESCRIPTION + ": >\n  " + wrapped_txt + "\n\n"
 
+        dict_output = self._get_sections_output()
+
+        yaml.add_representer(OrderedDict, self.represent_ordereddict)
+        yaml.add_representer(dict, self.represent_ordereddict)
+        yaml.add_representer(LiteralString, represent_literal_string)
+        yaml_string = yaml.dump(dict_output, default_flow_style=False)
+        # get rid of the '' from yaml.dump around numbers
+        # also replace double return lines with a single one
+        # seems to be a bug in the serialization of multiline literal scalars
+        yaml_string = yaml_string.replace('\'', '') .replace('\n\n', '\n')
+        return version_string + desc_str + yaml_string
+
+    def output_to_json_files_dict(self, base_filename,
+                                  hot_template_version=LATEST):
+        '''Return the JSON contents of the main and nested templates.
+
+        The nested templates keep the names the main template refers to
+        them with.
+        '''
+        json_files_dict = {}
+        base_filename, ext = os.path.splitext(base_filename)
+
+        for resource in self.resources:
+            nested_templates = resource.extract_substack_templates(
+                base_filename, hot_template_version)
+            for name, content in nested_templates.items():
+                json_files_dict[name] = dump_json(yaml.safe_load(content))
+
+        json_files_dict[base_filename + ext] = \
+            self.output_to_json(hot_template_version, False)
+
+        return json_files_dict
+
+    def output_to_json(self, hot_template_version=LATEST,
+                       embed_substack_templates=True):
+        log.debug(_('Converting translated output to json format.'))
+        return dump_json(self.get_dict_output(hot_template_version,
+                                              embed_substack_templates))
+
+    def get_dict_output(self, hot_template_version=LATEST,
+                        embed_substack_templates=True):
+        '''Return the main template as a dictionary.
+
+        The inline functions are loaded, as Heat reads them from the YAML
+        output. The other values are those of the translation, the YAML
+        output loaded back differs where its quotes are dropped.
+        '''
+        if embed_substack_templates:
+            for resource in self.resources:
+                resource.embed_substack_templates(hot_template_version)
+
+        dict_output = OrderedDict()
+        dict_output[self.VERSION] = hot_template_version
+        if self.description:
+            dict_output[self.DESCRIPTION] = self.description
+        dict_output.update(load_inline_functions(self._get_sections_output()))
+        return dict_output
+
+    def _get_sections_output(self):
+        dict_output = OrderedDict()
         # Parameters
         all_params = OrderedDict()
         for parameter in self.parameters:
@@ -99,12 +272,4 @@ class HotTemplate(object):
         for output in self.outputs:
             all_outputs.update(output.get_dict_output())
         dict_output.update({self.OUTPUTS: all_outputs})
-
-        yaml.add_representer(OrderedDict, self.represent_ordereddict)
-        yaml.add_representer(dict, self.represent_ordereddict)
-        yaml_string = yaml.dump(dict_output, default_flow_style=False)
-        # get rid of the '' from yaml.dump around numbers
-        # also replace double return lines with a single one
-        # seems to be a bug in the serialization of multiline literal scalars
-        yaml_string = yaml_string.replace('\'', '') .replace('\n\n', '\n')
-        return version_string + desc_str + yaml_string
+        return dict_output
@@ -0,0 +1,183 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from collections import OrderedDict
+import logging
+
+log = logging.getLogger('heat-translator')
+
+# Relationship kinds an edge can be classified as. The most specific types
+# are listed first, DependsOn is the catch-all for the other normative
+# relationships derived from it.
+RELATIONSHIP_KINDS = (HOSTED_ON, CONNECTS_TO, ATTACHES_TO, LINKS_TO, BINDS_TO,
+                      VIRTUAL_BINDS_TO, VIRTUAL_LINKS_TO, NFV_ATTACHES_TO,
+                      DEPENDS_ON) = \
+                     ('tosca.relationships.HostedOn',
+                      'tosca.relationships.ConnectsTo',
+                      'tosca.relationships.AttachesTo',
+                      'tosca.relationships.network.LinksTo',
+                      'tosca.relationships.network.BindsTo',
+                      'tosca.relationships.nfv.VirtualBindsTo',
+                      'tosca.relationships.nfv.VirtualLinksTo',
+                      'tosca.relationships.nfv.AttachesTo',
+                      'tosca.relationships.DependsOn')
+
+
+class RequirementEdge(object):
+    '''A requirement of a TOSCA node template pointing to another node.
+
+    Both the short form (``host: server``) and the long form
+    (``host: {node: server, relationship: ...}``) of a requirement are
+    normalized into the same edge.
+    '''
+
+    def __init__(self, source, name, assignment, target_name=None,
+                 target=None, relationship=None, kind=None):
+        self.source = source
+        self.name = name
+        self.assignment = assignment
+        self.target_name = target_name
+        self.target = target
+        self.relationship = relationship
+        self.kind = kind
+
+    def is_derived_from(self, type_str):
+        if self.kind == type_str:
+            return True
+        return self.relationship is not None and \
+            self.relationship.is_derived_from(type_str)
+
+    @property
+    def relationship_def(self):
+        '''The relationship as written in the requirement assignment.'''
+        if isinstance(self.assignment, dict):
+            return self.assignment.get('relationship')
+
+
+class TopologyGraph(object):
+    '''Requirement and relationship adjacency of a TOSCA topology.
+
+    The graph is compiled once per translation so that the translator and
+    the resource handlers can query typed edges instead of walking
+    requirements, relationships and related nodes of the parser objects
+    over and over again. Nodes which are not part of the topology, like
+    templates built on their own in unit tests, are compiled lazily on
+    their first lookup.
+    '''
+
+    def __init__(self, nodetemplates=None):
+        self._nodes = OrderedDict()
+        self._requirements = {}
+        self._edges = {}
+        self._related = {}
+        self._kinds = {}
+        for node in nodetemplates or []:
+            self._nodes[node.name] = node
+        for node in self._nodes.values():
+            self._compile(node)
+
+    @property
+    def nodes(self):
+        return list(self._nodes.values())
+
+    def node(self, name):
+        return self._nodes.get(name)
+
+    def requirements(self, node):
+        '''Return one edge per requirement of a node, in template order.'''
+        if node not in self._requirements:
+            self._compile(node)
+        return self._requirements[node]
+
+    def requirement(self, node, name):
+        '''Return the first edge of a node for the named requirement.'''
+        for edge in self.requirements(node):
+            if edge.name == name:
+                return edge
+
+    def edges(self, node, kind=None):
+        '''Return the relationship edges of a node.
+
+        Edges come in the order the parser resolved the relationships.
+        If kind is given, only the edges of that kind are returned.
+        '''
+        if node not in self._edges:
+            self._compile(node)
+        edges = self._edges[node]
+        if kind is None:
+            return edges
+        return [edge for edge in edges if edge.kind == kind]
+
+    def target(self, node, kind):
+        '''Return the first node related to the given one by kind.'''
+        for edge in self.edges(node, kind):
+            return edge.target
+
+    def related(self, node):
+        '''Return the related nodes as (node, relationship) pairs.
+
+        This mirrors NodeTemplate.related: every target appears once, in
+        the position of its first relationship.
+        '''
+        if node not in self._related:
+            pairs = OrderedDict()
+            for edge in self.edges(node):
+                if edge.target is not None:
+                    pairs[edge.target] = edge.relationship
+            self._related[node] = list(pairs.items())
+        return self._related[node]
+
+    def _compile(self, node):
+        rel_items = list((getattr(node, 'relationships', None) or {}).items())
+        relationships = OrderedDict()
+        for rel, target in rel_items:
+            relationships.setdefault(target.name, []).append((rel, target))
+
+        requirements = []
+        assignments = {}
+        for requirement in getattr(node, 'requirements', None) or []:
+            for name, assignment in requirement.items():
+                if isinstance(assignment, dict):
+                    target_name = assignment.get('node')
+                else:
+                    target_name = assignment
+                assignments.setdefault(target_name, (name, assignment))
+                rel, target = relationships.get(target_name,
+                                                [(None, None)])[0]
+                requirements.append(RequirementEdge(
+                    node, name, assignment, target_name,
+                    self._nodes.get(target_name) or target,
+                    rel, self._get_kind(rel)))
+
+        edges = []
+        for rel, target in rel_items:
+            name, assignment = assignments.get(target.name, (None, None))
+            edges.append(RequirementEdge(
+                node, name, assignment, target.name,
+                self._nodes.get(target.name) or target,
+                rel, self._get_kind(rel)))
+
+        self._requirements[node] = requirements
+        self._edges[node] = edges
+
+    def _get_kind(self, relationship):
+        if relationship is None:
+            return None
+        if relationship.type not in self._kinds:
+            kind = None
+            for rel_kind in RELATIONSHIP_KINDS:
+                if relationship.is_derived_from(rel_kind):
+                    kind = rel_kind
+                    break
+            self._kinds[relationship.type] = kind
+        return self._kinds[relationship.type]
@@ -49,6 +49,7 @@ class ToscaNfvScalingAspect(HotResource):
         self.scaling_adjustment = None
         self.vdu_name = None
         self.delta_name = None
+        self.nested_nodes = {}
 
     def handle_properties(self, resources):
         # Resources of non HotResource
@@ -223,5 +224,6 @@ class ToscaNfvScalingAspect(HotResource):
             yaml_name,
             self.hot_template_parameters,
             parameters=parameters)
+        self.nested_nodes = self._get_nested_nodes(scl_rsrcs, yaml_name)
 
         return non_scl_rsrcs, nested_template
@@ -64,15 +64,10 @@ class ToscaNfvVduCompute(HotResource):
                 )
 
         # Multi virtual_storages support
-        requirements = self.nodetemplate.requirements
-        self.virtual_storages = []
-        for req in requirements:
-            vs_val = req.get('virtual_storage')
-            if isinstance(vs_val, dict):
-                if vs_val.get('node') is not None:
-                    self.virtual_storages.append(vs_val['node'])
-            else:
-                self.virtual_storages.append(vs_val)
+        self.virtual_storages = [
+            req.target_name
+            for req in self.get_topology().requirements(self.nodetemplate)
+            if req.name == 'virtual_storage' and req.target_name is not None]
         dict_rsrcs = self.nodetemplate.templates
         bdmv2s = []
         for vs_name in self.virtual_storages:
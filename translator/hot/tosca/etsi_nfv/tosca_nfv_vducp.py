@@ -42,19 +42,18 @@ class ToscaNfvVducp(HotResource):
         # Default order
         self.order = 0
 
-        # Extract virtual_link and virtual_binding
-        self.virtual_link = None
-        self.virtual_binding = None
-        requirements = self.nodetemplate.requirements
-        for req in requirements:
-            if 'virtual_link' in req:
-                vl_val = req.get('virtual_link')
-                if isinstance(vl_val, dict):
-                    self.virtual_link = vl_val.get('node')
-                else:
-                    self.virtual_link = vl_val
-            elif 'virtual_binding' in req:
-                self.virtual_binding = req.get('virtual_binding')
+    @property
+    def virtual_link(self):
+        return self._get_requirement_target('virtual_link')
+
+    @property
+    def virtual_binding(self):
+        return self._get_requirement_target('virtual_binding')
+
+    def _get_requirement_target(self, name):
+        req = self.get_topology().requirement(self.nodetemplate, name)
+        if req:
+            return req.target_name
 
     def _generate_networks_for_compute(self, port_resources):
         '''Generate compute networks property list from the port resources.'''
@@ -99,19 +98,18 @@ class ToscaNfvVducp(HotResource):
         # Remove depends_on
         self.remove_depends_on(depends_on_set)
 
-        binds_to = None
-        for rel, node in self.nodetemplate.relationships.items():
-            # Check for BindsTo relationship. If found add network to the
-            # network property of the corresponding compute resource
-            if not binds_to and rel.is_derived_from(TOSCA_BINDS_TO):
-                binds_to = node
-                for hot_resource in self.depends_on_nodes:
-                    if binds_to.name == hot_resource.name:
-                        port_rsrcs = hot_resource.assoc_port_resources
-                        self._insert_sorted_resource(port_rsrcs, self)
-                        networks = \
-                            self._generate_networks_for_compute(port_rsrcs)
-                        hot_resource.properties['networks'] = networks
-                        break
+        # Check for BindsTo relationship. If found add network to the
+        # network property of the corresponding compute resource
+        binds_to = self.get_topology().target(self.nodetemplate,
+                                              TOSCA_BINDS_TO)
+        if binds_to:
+            for hot_resource in self.depends_on_nodes:
+                if binds_to.name == hot_resource.name:
+                    port_rsrcs = hot_resource.assoc_port_resources
+                    self._insert_sorted_resource(port_rsrcs, self)
+                    networks = \
+                        self._generate_networks_for_compute(port_rsrcs)
+                    hot_resource.properties['networks'] = networks
+                    break
 
         self.properties = own_props
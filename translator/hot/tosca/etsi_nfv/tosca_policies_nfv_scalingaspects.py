@@ -29,7 +29,7 @@ class ToscaNfvScalingAspects(HotResource):
 
     def __init__(self, policy, csar_dir=None, hot_template_parameters=None,
                  nested_template=None,
-                 extra_flg=None):
+                 extra_flg=None, nested_nodes=None):
         hot_type = "OS::Heat::ScalingPolicy"
 
         if extra_flg is None:
@@ -54,6 +54,7 @@ class ToscaNfvScalingAspects(HotResource):
         self.multi_nested_templates = {}
         self.nested_template = \
             {} if nested_template is None else nested_template
+        self.nested_nodes = {} if nested_nodes is None else nested_nodes
 
     def handle_properties(self, resources):
         for aspect_obj in self.scaling_aspect_objs:
@@ -66,6 +67,9 @@ class ToscaNfvScalingAspects(HotResource):
     def extract_substack_templates(self, base_filename, hot_template_version):
         return self.nested_template
 
+    def get_substack_nodes(self):
+        return self.nested_nodes
+
     def _create_scale_out_in_resources(self, resources):
         for asp_obj in self.scaling_aspect_objs:
             asp_name = asp_obj.aspect_name
@@ -78,7 +82,8 @@ class ToscaNfvScalingAspects(HotResource):
                 hot_template_parameters,
                 nested_template=self.
                 multi_nested_templates[asp_name],
-                extra_flg=True
+                extra_flg=True,
+                nested_nodes=asp_obj.nested_nodes
             )
             scl_in_rsrc = ToscaNfvScalingAspects(
                 self.policy,
@@ -87,7 +92,8 @@ class ToscaNfvScalingAspects(HotResource):
                 hot_template_parameters,
                 nested_template=self.
                 multi_nested_templates[asp_name],
-                extra_flg=True
+                extra_flg=True,
+                nested_nodes=asp_obj.nested_nodes
             )
             scl_out_rsrc.name = asp_name + '_scale_out'
             scl_in_rsrc.name = asp_name + '_scale_in'
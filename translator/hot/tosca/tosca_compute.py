@@ -16,6 +16,7 @@ import logging
 from toscaparser.utils.gettextutils import _
 from translator.common import flavors as nova_flavors
 from translator.common import images as glance_images
+from translator.common import trace
 import translator.common.utils
 from translator.hot.syntax.hot_resource import HotResource
 
@@ -97,7 +98,7 @@ class ToscaCompute(HotResource):
         return hot_properties
 
     def _best_flavor(self, properties):
-        log.info(_('Choosing the best flavor for given attributes.'))
+        trace.event('flavor', self.name, self.nodetemplate.type)
         # Check whether user exported all required environment variables.
         flavors = nova_flavors.get_flavors()
 
@@ -189,7 +190,8 @@ class ToscaCompute(HotResource):
             if isinstance(size, int):
                 if this_dict[flavor][attr] >= size:
                     matching_flavors.append(flavor)
-        log.debug(_('Returning list of flavors matching the attribute size.'))
+        trace.event('flavor_match', attribute=attr, size=size,
+                    matches=len(matching_flavors))
         return matching_flavors
 
     @staticmethod
@@ -224,8 +226,8 @@ class ToscaCompute(HotResource):
         # Note: We treat private and public IP  addresses equally, but
         # this will change in the future when TOSCA starts to support
         # multiple private/public IP addresses.
-        log.debug(_('Converting TOSCA attribute for a nodetemplate to a HOT \
-                  attriute.'))
+        trace.event('attribute', self.name, self.nodetemplate.type,
+                    attribute=attribute)
         if (attribute == 'private_address' or
                 attribute == 'public_address'):
             attr['get_attr'] = [self.name, 'networks', 'private', 0]
@@ -34,15 +34,14 @@ class ToscaFloatingIP(HotResource):
         for key, value in tosca_props.items():
             fip_props[key] = value
 
-        links_to = None
-        for rel, node in self.nodetemplate.relationships.items():
-            if not links_to and rel.is_derived_from(TOSCA_LINKS_TO):
-                links_to = node
-                for hot_resource in self.depends_on_nodes:
-                    if links_to.name == hot_resource.name:
-                        self.depends_on.remove(hot_resource)
-                        break
-                fip_props['port_id'] =\
-                    '{ get_resource: %s }' % (links_to.name)
+        links_to = self.get_topology().target(self.nodetemplate,
+                                              TOSCA_LINKS_TO)
+        if links_to:
+            for hot_resource in self.depends_on_nodes:
+                if links_to.name == hot_resource.name:
+                    self.depends_on.remove(hot_resource)
+                    break
+            fip_props['port_id'] =\
+                '{ get_resource: %s }' % (links_to.name)
 
         self.properties = fip_props
@@ -71,45 +71,42 @@ class ToscaNetworkPort(HotResource):
             else:
                 port_props[key] = value
 
-        links_to = None
-        binds_to = None
-        for rel, node in self.nodetemplate.relationships.items():
-            # Check for LinksTo relations. If found add a network property with
-            # the network name into the port
-            if not links_to and rel.is_derived_from(TOSCA_LINKS_TO):
-                links_to = node
+        topology = self.get_topology()
+        # Check for LinksTo relations. If found add a network property with
+        # the network name into the port
+        links_to = topology.target(self.nodetemplate, TOSCA_LINKS_TO)
+        if links_to:
+            network_resource = None
+            for hot_resource in self.depends_on_nodes:
+                if links_to.name == hot_resource.name:
+                    network_resource = hot_resource
+                    self.depends_on.remove(hot_resource)
+                    break
 
-                network_resource = None
-                for hot_resource in self.depends_on_nodes:
-                    if links_to.name == hot_resource.name:
-                        network_resource = hot_resource
-                        self.depends_on.remove(hot_resource)
-                        break
-
-                if network_resource.existing_resource_id:
-                    port_props['network'] =\
-                        str(network_resource.existing_resource_id)
-                else:
-                    port_props['network'] = '{ get_resource: %s }'\
-                        % (links_to.name)
+            if network_resource.existing_resource_id:
+                port_props['network'] =\
+                    str(network_resource.existing_resource_id)
+            else:
+                port_props['network'] = '{ get_resource: %s }'\
+                    % (links_to.name)
 
-            # Check for BindsTo relationship. If found add network to the
-            # network property of the corresponding compute resource
-            elif not binds_to and rel.is_derived_from(TOSCA_BINDS_TO):
-                binds_to = node
-                compute_resource = None
-                for hot_resource in self.depends_on_nodes:
-                    if binds_to.name == hot_resource.name:
-                        compute_resource = hot_resource
-                        self.depends_on.remove(hot_resource)
-                        break
-                if compute_resource:
-                    port_rsrcs = compute_resource.assoc_port_resources
-                    self._insert_sorted_resource(port_rsrcs, self)
-                    # TODO(sdmonov): Using generate networks every time we add
-                    # a network is not the fastest way to do the things. We
-                    # should do this only once at the end.
-                    networks = self._generate_networks_for_compute(port_rsrcs)
-                    compute_resource.properties['networks'] = networks
+        # Check for BindsTo relationship. If found add network to the
+        # network property of the corresponding compute resource
+        binds_to = topology.target(self.nodetemplate, TOSCA_BINDS_TO)
+        if binds_to:
+            compute_resource = None
+            for hot_resource in self.depends_on_nodes:
+                if binds_to.name == hot_resource.name:
+                    compute_resource = hot_resource
+                    self.depends_on.remove(hot_resource)
+                    break
+            if compute_resource:
+                port_rsrcs = compute_resource.assoc_port_resources
+                self._insert_sorted_resource(port_rsrcs, self)
+                # TODO(sdmonov): Using generate networks every time we add
+                # a network is not the fastest way to do the things. We
+                # should do this only once at the end.
+                networks = self._generate_networks_for_compute(port_rsrcs)
+                compute_resource.properties['networks'] = networks
 
         self.properties = port_props
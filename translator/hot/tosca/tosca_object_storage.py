@@ -54,5 +54,5 @@ class ToscaObjectStorage(HotResource):
                 objectstore_props["X-Container-Meta"] = container_quota
                 skip_check = True
 
-        objectstore_props["X-Container-Read"] = '".r:*"'
+        objectstore_props["X-Container-Read"] = '.r:*'
         self.properties = objectstore_props
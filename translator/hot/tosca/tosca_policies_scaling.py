@@ -34,6 +34,7 @@ class ToscaAutoscaling(HotResource):
                                                csar_dir=csar_dir)
         self.policy = policy
         self.hot_template_parameters = hot_template_parameters
+        self.nested_nodes = {}
 
     def handle_expansion(self):
         if self.policy.entity_tpl.get('triggers'):
@@ -64,7 +65,7 @@ class ToscaAutoscaling(HotResource):
         self.properties["auto_scaling_group_id"] = {
             'get_resource': self.policy.name + '_group'
         }
-        self.properties["adjustment_type"] = "change_in_capacity "
+        self.properties["adjustment_type"] = "change_in_capacity"
         self.properties["scaling_adjustment"] = self.\
             policy.entity_tpl["properties"]["increment"]
         self.properties["cooldown"] =\
@@ -98,6 +99,7 @@ class ToscaAutoscaling(HotResource):
             scale_res,
             yaml_name,
             self.hot_template_parameters)
+        self.nested_nodes = self._get_nested_nodes(scale_res, yaml_name)
         resources = [tmp_res
                      for tmp_res in resources
                      if tmp_res.name not in delete_res_names]
@@ -107,5 +109,8 @@ class ToscaAutoscaling(HotResource):
     def extract_substack_templates(self, base_filename, hot_template_version):
         return self.nested_template
 
+    def get_substack_nodes(self):
+        return self.nested_nodes
+
     def embed_substack_templates(self, hot_template_version):
         pass
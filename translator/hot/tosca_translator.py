@@ -13,39 +13,100 @@
 import logging
 
 from toscaparser.utils.gettextutils import _
+from translator.hot.optimizer import HotOptimizer
+from translator.hot.partitioner import StackPartitioner
+from translator.hot import snapshot
+from translator.hot import stack_metrics
 from translator.hot.syntax.hot_template import HotTemplate
 from translator.hot.translate_inputs import TranslateInputs
 from translator.hot.translate_node_templates import TranslateNodeTemplates
 from translator.hot.translate_outputs import TranslateOutputs
+from translator.hot import type_resolver
 
 log = logging.getLogger('heat-translator')
 
+OUTPUT_FORMATS = (YAML, JSON) = ('yaml', 'json')
+
 
 class TOSCATranslator(object):
     '''Invokes translation methods.'''
 
-    def __init__(self, tosca, parsed_params, deploy=None, csar_dir=None):
+    def __init__(self, tosca, parsed_params, deploy=None, csar_dir=None,
+                 compact=False, optimizations=None, analyze=False,
+                 workers=None, max_stack_resources=None):
         super(TOSCATranslator, self).__init__()
         self.tosca = tosca
         self.hot_template = HotTemplate()
         self.parsed_params = parsed_params
         self.deploy = deploy
         self.csar_dir = csar_dir
+        # release the TOSCA objects once the HOT resources are final
+        self.compact = compact
+        # names of the HotOptimizer passes run on the translated template
+        self.optimizations = optimizations
+        # bytes saved by every optimization pass run
+        self.optimization_report = {}
+        # store the metrics of the translated stack in metrics
+        self.analyze = analyze
+        self.metrics = None
+        # threads handling the properties of independent resources
+        self.workers = workers
+        # split the resources into nested stacks of at most this number
+        self.max_stack_resources = max_stack_resources
+        # TOSCA inputs and the HOT parameters translated from them, to
+        # translate other parameter values
+        self.inputs = None
+        self.input_parameters = None
         self.node_translator = None
+        self.hot_template_version = None
         log.info(_('Initialized parmaters for translation.'))
 
     def _translate_to_hot_yaml(self):
+        if self.tosca is None:
+            # released by the compaction of a previous translation
+            msg = _('A compact translator only translates its template '
+                    'once, further translations need a new translator. '
+                    'Other parameter values can still be translated with '
+                    'translate_parameters.')
+            log.error(msg)
+            raise ValueError(msg)
         self._resolve_input()
         self.hot_template.description = self.tosca.description
-        self.hot_template.parameters = self._translate_inputs()
+        self.inputs = list(self.tosca.inputs)
+        self.input_parameters = self._translate_inputs()
+        self.hot_template.parameters = list(self.input_parameters)
         self.node_translator = TranslateNodeTemplates(self.tosca,
                                                       self.hot_template,
-                                                      csar_dir=self.csar_dir)
+                                                      csar_dir=self.csar_dir,
+                                                      workers=self.workers)
         self.hot_template.resources = \
             self.node_translator.translate()
         self.hot_template.outputs = self._translate_outputs()
+        if self.optimizations:
+            self.optimization_report = HotOptimizer(
+                self.hot_template, self.optimizations).optimize()
+        if self.max_stack_resources:
+            StackPartitioner(self.hot_template,
+                             self.max_stack_resources).partition()
         if self.node_translator.hot_template_version is None:
             self.node_translator.hot_template_version = HotTemplate.LATEST
+        self.hot_template_version = self.node_translator.hot_template_version
+
+    def _compact_result(self, base_filename):
+        if not self.compact:
+            return
+        log.debug(_('Compacting the translated template.'))
+        self.hot_template.compact(base_filename, self.hot_template_version)
+        if self.tosca.topology_template is not None:
+            type_resolver.RESOLVER.release(
+                self.tosca.topology_template.custom_defs)
+        self.node_translator = None
+        self.tosca = None
+
+    def _analyze_result(self, yaml_files, base_filename):
+        if self.analyze:
+            self.metrics = stack_metrics.get_yaml_files_metrics(
+                yaml_files, base_filename)
 
     def translate(self):
         """Translate to HOT YAML
@@ -54,21 +115,18 @@ class TOSCATranslator(object):
         The nested template, if any referenced by main, will be created
         as a separate file.
         """
-        self._translate_to_hot_yaml()
-
         # TODO(mvelten) go back to calling hot_template.output_to_yaml instead
         # for stdout once embed_substack_templates is correctly implemented
         # return self.hot_template.output_to_yaml(
         #     self.node_translator.hot_template_version)
-        yaml_files = self.hot_template.output_to_yaml_files_dict(
-            "output.yaml",
-            self.node_translator.hot_template_version)
-        for name, content in yaml_files.items():
-            if name != "output.yaml":
-                with open(name, 'w+') as f:
-                    f.write(content)
+        return self._translate_to_main_template("output.yaml", YAML)
+
+    def translate_to_json(self):
+        """Translate to HOT JSON
 
-        return yaml_files["output.yaml"]
+        Same as translate, with the main and nested templates in JSON.
+        """
+        return self._translate_to_main_template("output.json", JSON)
 
     def translate_to_yaml_files_dict(self, base_filename):
         """Translate to HOT YAML
@@ -78,10 +136,89 @@ class TOSCATranslator(object):
         programmatically stored into different files by using key as
         template name and value as template content.
         """
+        return self._translate_to_files_dict(base_filename, YAML)
+
+    def translate_to_json_files_dict(self, base_filename):
+        """Translate to HOT JSON
+
+        Same as translate_to_yaml_files_dict, with the main and nested
+        templates in JSON.
+        """
+        return self._translate_to_files_dict(base_filename, JSON)
+
+    def translate_to_snapshot(self, base_filename):
+        """Translate to a TranslationSnapshot
+
+        The snapshot holds the main and nested templates of
+        translate_to_yaml_files_dict as HOT dictionaries, with the graph
+        of their resources and the TOSCA nodes they were translated from.
+        Its compact binary form is saved and loaded again much faster
+        than the YAML files are parsed.
+        """
+        files = self._translate_to_files_dict(base_filename, YAML)
+        return snapshot.TranslationSnapshot.from_yaml_files_dict(
+            files, base_filename,
+            snapshot.get_source_nodes(self.hot_template, base_filename))
+
+    def translate_to_dict(self):
+        """Translate to a HOT dictionary
+
+        This method produces the main template as a dictionary, without
+        any serialization. The nested templates are not included. The
+        values are those of translate_to_json, which can differ from the
+        YAML output loaded back, see HotTemplate.get_dict_output.
+        """
+        self._translate_to_hot_yaml()
+        self._compact_result("output.yaml")
+        return self.hot_template.get_dict_output(self.hot_template_version,
+                                                 False)
+
+    def translate_parameters(self, parsed_params, base_filename,
+                             output_format=YAML):
+        """Translate a translated template with other parameter values
+
+        Once the template is translated, this method produces the files
+        dictionary of the same template with other parameter values, only
+        translating the inputs again. The values must lead to the same
+        resources, which ParameterSetTranslator checks.
+        """
+        self.parsed_params = parsed_params
+        if self.tosca is not None:
+            self._resolve_input()
+        parameters = TranslateInputs(list(self.inputs), parsed_params,
+                                     self.deploy).translate()
+        # keep the parameters added by the optimizations
+        self.hot_template.parameters = parameters + [
+            parameter for parameter in self.hot_template.parameters
+            if parameter not in self.input_parameters]
+        self.input_parameters = parameters
+        return self._output_files_dict(base_filename, output_format)
+
+    def _translate_to_main_template(self, base_filename, output_format):
+        files = self._translate_to_files_dict(base_filename, output_format)
+        for name, content in files.items():
+            if name != base_filename:
+                with open(name, 'w+') as f:
+                    f.write(content)
+
+        return files[base_filename]
+
+    def _translate_to_files_dict(self, base_filename, output_format):
         self._translate_to_hot_yaml()
-        return self.hot_template.output_to_yaml_files_dict(
-            base_filename,
-            self.node_translator.hot_template_version)
+        self._compact_result(base_filename)
+        return self._output_files_dict(base_filename, output_format)
+
+    def _output_files_dict(self, base_filename, output_format):
+        if output_format == JSON:
+            files = self.hot_template.output_to_json_files_dict(
+                base_filename,
+                self.hot_template_version)
+        else:
+            files = self.hot_template.output_to_yaml_files_dict(
+                base_filename,
+                self.hot_template_version)
+        self._analyze_result(files, base_filename)
+        return files
 
     def _translate_inputs(self):
         translator = TranslateInputs(self.tosca.inputs, self.parsed_params,
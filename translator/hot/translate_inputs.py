@@ -17,6 +17,7 @@ from toscaparser.elements.scalarunit import ScalarUnit_Size
 from toscaparser.parameters import Input
 from toscaparser.utils.gettextutils import _
 from toscaparser.utils.validateutils import TOSCAVersionProperty
+from translator.common import trace
 from translator.hot.syntax.hot_parameter import HotParameter
 
 
@@ -81,8 +82,8 @@ class TranslateInputs(object):
             input = Input(name, schema_dict)
             self.inputs.append(input)
 
-        log.info(_('Translating TOSCA input type to HOT input type.'))
         for input in self.inputs:
+            trace.event('input', input.name, input.type)
             hot_default = None
             hot_input_type = TOSCA_TO_HOT_INPUT_TYPES[input.type]
 
@@ -11,6 +11,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from concurrent import futures
 import copy
 import importlib
 import logging
@@ -28,13 +29,15 @@ from toscaparser.utils.gettextutils import _
 from translator.common.exception import ToscaClassAttributeError
 from translator.common.exception import ToscaClassImportError
 from translator.common.exception import ToscaModImportError
-from translator.common.exception import UnsupportedTypeError
 from translator.common import utils
 from translator.conf.config import ConfigProvider as translatorConfig
+from translator.hot.artifact_resolver import ArtifactResolver
 from translator.hot.syntax.hot_resource import HotResource
+from translator.hot.topology_graph import TopologyGraph
 from translator.hot.tosca.tosca_block_storage_attachment import (
     ToscaBlockStorageAttachment
     )
+from translator.hot import type_resolver
 
 ###########################
 # Module utility Functions
@@ -138,6 +141,7 @@ TOSCA_TO_HOT_PROPERTIES = {'properties': 'input'}
 log = logging.getLogger('heat-translator')
 
 TOSCA_TO_HOT_TYPE = _generate_type_map()
+type_resolver.RESOLVER.set_type_map(TOSCA_TO_HOT_TYPE)
 
 BASE_TYPES = (str, int, dict, OrderedDict)
 
@@ -151,17 +155,46 @@ BASE_POLICY_TYPES = [
 HOT_SCALING_POLICY_TYPE = ["OS::Heat::AutoScalingGroup",
                            "OS::Senlin::Profile"]
 
+# resources whose properties are handled with the list of all the resources
+HOT_GLOBAL_HANDLER_TYPE = ["OS::Nova::ServerGroup",
+                           "OS::Heat::ScalingPolicy",
+                           "OS::Senlin::Policy"]
+
 TOSCA_SA = 'tosca.policies.nfv.ScalingAspects'
 
 
+def _group_by_dependencies(resources):
+    '''Group the resources sharing a dependency, keeping their order.'''
+    parents = {}
+
+    def find(item):
+        parents.setdefault(item, item)
+        while parents[item] is not item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+    for resource in resources:
+        for depend in resource.depends_on_nodes:
+            parents[find(depend)] = find(resource)
+    groups = OrderedDict()
+    for resource in resources:
+        groups.setdefault(find(resource), []).append(resource)
+    return list(groups.values())
+
+
 class TranslateNodeTemplates(object):
     '''Translate TOSCA NodeTemplates to Heat Resources.'''
 
-    def __init__(self, tosca, hot_template, csar_dir=None):
+    def __init__(self, tosca, hot_template, csar_dir=None, workers=None):
         self.tosca = tosca
         self.nodetemplates = self.tosca.nodetemplates
         self.hot_template = hot_template
         self.csar_dir = csar_dir
+        # requirement graph shared by all the resources of this translation
+        self.topology = TopologyGraph(self.nodetemplates)
+        # artifact paths of the CSAR shared by all the resources
+        self.artifacts = ArtifactResolver(csar_dir)
         # list of all HOT resources generated
         self.hot_resources = []
         # mapping between TOSCA nodetemplate and HOT resource
@@ -173,6 +206,9 @@ class TranslateNodeTemplates(object):
         self.last_deploy_map = {}
         self.hot_template_version = None
         self.processed_policy_res = []
+        # number of threads handling the properties of independent
+        # resources, they are handled one after the other by default
+        self.workers = workers
 
     def translate(self):
         return self._translate_nodetemplates()
@@ -185,7 +221,70 @@ class TranslateNodeTemplates(object):
         self.processed_resources.append(resource)
         for depend_on in resource.depends_on_nodes:
             self._recursive_handle_properties(depend_on)
+        self._handle_properties(resource)
 
+    def _recursive_properties_order(self, resource, order):
+        # same walk as _recursive_handle_properties, without handling
+        if resource in self.processed_resources:
+            return
+        self.processed_resources.append(resource)
+        for depend_on in resource.depends_on_nodes:
+            self._recursive_properties_order(depend_on, order)
+        order.append(resource)
+
+    def _parallel_handle_properties(self, resources):
+        '''Handle the properties of independent resources in parallel.
+
+        The resources are handled in the order of the serial walk, split in
+        levels: a resource is handled once the resources it depends on are.
+        The resources of a level sharing a dependency, which they may
+        update, are handled one after the other by the same thread.
+        Resources handled with the list of all the resources are handled
+        alone, after all the resources preceding them. The result is the
+        same as the serial walk.
+        '''
+        order = []
+        for resource in resources:
+            if resource.type not in HOT_SCALING_POLICY_TYPE:
+                self._recursive_properties_order(resource, order)
+
+        with futures.ThreadPoolExecutor(self.workers) as executor:
+            segment = []
+            for resource in order:
+                if resource.type in HOT_GLOBAL_HANDLER_TYPE:
+                    self._handle_properties_levels(executor, segment)
+                    segment = []
+                    self._handle_properties(resource)
+                else:
+                    segment.append(resource)
+            self._handle_properties_levels(executor, segment)
+
+    def _handle_properties_levels(self, executor, segment):
+        levels = []
+        level_of = {}
+        for resource in segment:
+            # dependencies coming later in the walk are in a loop with the
+            # resource, they are handled after it as in the serial walk
+            level = 1 + max([level_of[depend]
+                             for depend in resource.depends_on_nodes
+                             if depend in level_of] or [-1])
+            level_of[resource] = level
+            while len(levels) <= level:
+                levels.append([])
+            levels[level].append(resource)
+
+        for level in levels:
+            results = [executor.submit(self._handle_properties_group, group)
+                       for group in _group_by_dependencies(level)]
+            for result in results:
+                # raise the errors of the handlers
+                result.result()
+
+    def _handle_properties_group(self, group):
+        for resource in group:
+            self._handle_properties(resource)
+
+    def _handle_properties(self, resource):
         if resource.type == "OS::Nova::ServerGroup":
             resource.handle_properties(self.hot_resources)
         elif resource.type in ("OS::Heat::ScalingPolicy",
@@ -231,40 +330,24 @@ class TranslateNodeTemplates(object):
             base_type = self._get_supported_type(node)
             hot_node = TOSCA_TO_HOT_TYPE[base_type](node,
                                                     csar_dir=self.csar_dir)
+            hot_node.topology = self.topology
+            hot_node.artifacts = self.artifacts
             self.hot_resources.append(hot_node)
             self.hot_lookup[node] = hot_node
 
             # BlockStorage Attachment is a special case,
             # which doesn't match to Heat Resources 1 to 1.
             if base_type == "tosca.nodes.Compute":
-                requirements = node.requirements
-                if requirements:
-                    # Find the name of associated BlockStorage node
-                    for requires in requirements:
-                        volume_name = None
-                        for value in requires.values():
-                            if isinstance(value, dict):
-                                for node_name in value.values():
-                                    for n in self.nodetemplates:
-                                        if n.name == node_name and \
-                                            n.is_derived_from(
-                                                "tosca.nodes.BlockStorage"):
-                                            volume_name = node_name
-                                            break
-                            else:
-                                for n in self.nodetemplates:
-                                    if n.name == value and \
-                                        n.is_derived_from(
-                                            "tosca.nodes.BlockStorage"):
-                                        volume_name = node_name
-                                        break
-
-                        if volume_name:
-                            suffix = suffix + 1
-                            attachment_node = self._get_attachment_node(
-                                node, suffix, volume_name)
-                            if attachment_node:
-                                self.hot_resources.append(attachment_node)
+                # Find the name of associated BlockStorage node
+                for requires in self.topology.requirements(node):
+                    volume = self.topology.node(requires.target_name)
+                    if volume and \
+                            volume.is_derived_from("tosca.nodes.BlockStorage"):
+                        suffix = suffix + 1
+                        attachment_node = self._get_attachment_node(
+                            node, suffix, volume.name)
+                        if attachment_node:
+                            self.hot_resources.append(attachment_node)
                 for i in self.tosca.inputs:
                     if (i.name == 'key_name' and
                             node.get_property_value('key_name') is None):
@@ -280,8 +363,8 @@ class TranslateNodeTemplates(object):
 
             if base_policy_type in BASE_POLICY_TYPES and \
                     own_policy_type != 'tosca.policies.Scaling.Cluster':
-                TOSCA_TO_HOT_TYPE[own_policy_type] = \
-                    TOSCA_TO_HOT_TYPE[base_policy_type]
+                type_resolver.RESOLVER.register(
+                    own_policy_type, TOSCA_TO_HOT_TYPE[base_policy_type])
 
             if own_policy_type == 'tosca.policies.Scaling.Cluster':
                 self.hot_template_version = '2016-04-08'
@@ -295,6 +378,8 @@ class TranslateNodeTemplates(object):
             else:
                 policy_node = TOSCA_TO_HOT_TYPE[own_policy_type](policy)
 
+            policy_node.topology = self.topology
+            policy_node.artifacts = self.artifacts
             self.hot_resources.append(policy_node)
 
         # Handle life cycle operations: this may expand each node
@@ -316,35 +401,28 @@ class TranslateNodeTemplates(object):
         # configuration
         connectsto_resources = []
         for node in self.nodetemplates:
-            for requirement in node.requirements:
-                for endpoint, details in requirement.items():
-                    relation = None
-                    if isinstance(details, dict):
-                        target = details.get('node')
-                        relation = details.get('relationship')
-                    else:
-                        target = details
-                    if (target and relation and
-                            not isinstance(relation, str)):
-                        interfaces = relation.get('interfaces')
-                        connectsto_resources += \
-                            self._create_connect_configs(node,
-                                                         target,
-                                                         interfaces)
+            for requirement in self.topology.requirements(node):
+                relation = requirement.relationship_def
+                if (requirement.target_name and relation and
+                        not isinstance(relation, str)):
+                    interfaces = relation.get('interfaces')
+                    connectsto_resources += \
+                        self._create_connect_configs(node,
+                                                     requirement.target_name,
+                                                     interfaces)
         self.hot_resources += connectsto_resources
 
         # Copy the initial dependencies based on the relationship in
         # the TOSCA template
         for node in self.nodetemplates:
-            for node_depend in node.related_nodes:
+            for node_depend, relation in self.topology.related(node):
                 # if the source of dependency is a server and the
                 # relationship type is 'tosca.relationships.HostedOn',
                 # add dependency as properties.server
                 base_type = HotResource.get_base_type_str(
                     node_depend.type_definition)
                 if base_type == 'tosca.nodes.Compute' and \
-                   node.related[node_depend].type == \
-                   node.type_definition.HOSTEDON:
+                   relation.type == node.type_definition.HOSTEDON:
                     self.hot_lookup[node].properties['server'] = \
                         {'get_resource': self.hot_lookup[node_depend].name}
                 # for all others, add dependency as depends_on
@@ -372,9 +450,12 @@ class TranslateNodeTemplates(object):
         # Use recursion to handle the properties of the
         # dependent nodes in correct order
         self.processed_resources = []
-        for resource in self.hot_resources:
-            if resource.type not in HOT_SCALING_POLICY_TYPE:
-                self._recursive_handle_properties(resource)
+        if self.workers and self.workers > 1:
+            self._parallel_handle_properties(self.hot_resources)
+        else:
+            for resource in self.hot_resources:
+                if resource.type not in HOT_SCALING_POLICY_TYPE:
+                    self._recursive_handle_properties(resource)
 
         # handle resources that need to expand to more than one HOT resource
         expansion_resources = []
@@ -413,15 +494,7 @@ class TranslateNodeTemplates(object):
         return self.hot_resources
 
     def _get_supported_type(self, original_node):
-        # trace parent types until finding a supported type
-        node = original_node
-        node_type = original_node.type
-        while node_type not in TOSCA_TO_HOT_TYPE:
-            node = node.parent_type
-            if node is None:
-                raise UnsupportedTypeError(type=_('%s') % original_node.type)
-            node_type = node.type
-        return node_type
+        return type_resolver.RESOLVER.get_supported_type(original_node)
 
     def translate_param_value(self, param_value, resource):
         tosca_template = None
@@ -474,16 +547,10 @@ class TranslateNodeTemplates(object):
             if tosca_target:
                 artifacts = HotResource.get_all_artifacts(tosca_target)
                 if artifact_name in artifacts:
-                    cwd = os.getcwd()
                     artifact = artifacts[artifact_name]
-                    if self.csar_dir:
-                        os.chdir(self.csar_dir)
-                        get_file = os.path.abspath(artifact.get('file'))
-                    else:
-                        get_file = artifact.get('file')
+                    get_file = self.artifacts.resolve(artifact.get('file'))
                     if artifact.get('type', None) == 'tosca.artifacts.File':
                         return {'get_file': get_file}
-            os.chdir(cwd)
         get_input_args = None
         if isinstance(param_value, GetInput):
             get_input_args = param_value.args
@@ -597,14 +664,13 @@ class TranslateNodeTemplates(object):
             if cap:
                 new_target = cap
             else:
-                for req in tosca_target.requirements:
-                    if cap_or_req_name in req:
-                        new_target = self._find_tosca_node(
-                            req[cap_or_req_name])
-                        cap = new_target.get_capability(cap_or_req_name)
-                        if cap:
-                            new_target = cap
-                        break
+                req = self.topology.requirement(tosca_target, cap_or_req_name)
+                if req:
+                    new_target = self._find_tosca_node(req.target_name)
+                if new_target:
+                    cap = new_target.get_capability(cap_or_req_name)
+                    if cap:
+                        new_target = cap
 
         if new_target:
             tosca_target = new_target
@@ -618,61 +684,54 @@ class TranslateNodeTemplates(object):
         return tosca_target, prop_name, prop_arg
 
     def _get_attachment_node(self, node, suffix, volume_name):
-        attach = False
         ntpl = self.nodetemplates
-        for key_r, value_n in node.relationships.items():
-            if key_r.is_derived_from('tosca.relationships.AttachesTo'):
-                if value_n.is_derived_from('tosca.nodes.BlockStorage'):
-                    if volume_name == value_n.name:
-                        attach = True
-            if attach:
-                relationship_tpl = None
-                for req in node.requirements:
-                    for key, val in req.items():
-                        if isinstance(val, dict):
-                            if value_n.name != val.get('node'):
-                                continue
-                        else:
-                            if value_n.name != val:
-                                continue
-                        attach = val
-                        relship = val.get('relationship')
-                        for rkey, rval in val.items():
-                            if relship and isinstance(relship, dict):
-                                for rkey, rval in relship.items():
-                                    if rkey == 'type':
-                                        relationship_tpl = val
-                                        attach = rval
-                                    elif rkey == 'template':
-                                        rel_tpl_list = \
-                                            (self.tosca.topology_template.
-                                             _tpl_relationship_templates())
-                                        relationship_tpl = rel_tpl_list[rval]
-                                        attach = rval
-                                    else:
-                                        continue
-                            elif isinstance(relship, str):
-                                attach = relship
-                                relationship_tpl = val
-                                relationship_templates = \
-                                    self.tosca._tpl_relationship_templates()
-                                if 'relationship' in relationship_tpl and \
-                                   attach not in \
-                                   self.tosca._tpl_relationship_types() and \
-                                   attach in relationship_templates:
-                                    relationship_tpl['relationship'] = \
-                                        relationship_templates[attach]
-                                break
-                        if relationship_tpl:
-                            rval_new = attach + "_" + str(suffix)
-                            att = RelationshipTemplate(
-                                relationship_tpl, rval_new,
-                                self.tosca._tpl_relationship_types())
-                            hot_node = ToscaBlockStorageAttachment(att, ntpl,
-                                                                   node.name,
-                                                                   volume_name
-                                                                   )
-                            return hot_node
+        for edge in self.topology.edges(node):
+            if edge.target_name != volume_name or \
+                    not edge.is_derived_from(
+                        'tosca.relationships.AttachesTo') or \
+                    not edge.target.is_derived_from(
+                        'tosca.nodes.BlockStorage'):
+                continue
+            val = edge.assignment
+            if not isinstance(val, dict):
+                continue
+            attach = val
+            relationship_tpl = None
+            relship = val.get('relationship')
+            if relship and isinstance(relship, dict):
+                for rkey, rval in relship.items():
+                    if rkey == 'type':
+                        relationship_tpl = val
+                        attach = rval
+                    elif rkey == 'template':
+                        rel_tpl_list = \
+                            (self.tosca.topology_template.
+                             _tpl_relationship_templates())
+                        relationship_tpl = rel_tpl_list[rval]
+                        attach = rval
+            elif isinstance(relship, str):
+                attach = relship
+                relationship_tpl = val
+                relationship_templates = \
+                    self.tosca._tpl_relationship_templates()
+                if 'relationship' in relationship_tpl and \
+                   attach not in \
+                   self.tosca._tpl_relationship_types() and \
+                   attach in relationship_templates:
+                    relationship_tpl['relationship'] = \
+                        relationship_templates[attach]
+            if relationship_tpl:
+                rval_new = attach + "_" + str(suffix)
+                att = RelationshipTemplate(
+                    relationship_tpl, rval_new,
+                    self.tosca._tpl_relationship_types())
+                hot_node = ToscaBlockStorageAttachment(att, ntpl,
+                                                       node.name,
+                                                       volume_name
+                                                       )
+                hot_node.topology = self.topology
+                hot_node.artifacts = self.artifacts
+                return hot_node
 
     def find_hot_resource(self, name):
         for resource in self.hot_resources:
@@ -684,15 +743,12 @@ class TranslateNodeTemplates(object):
         if tosca_name == 'SELF':
             tosca_node = current_tosca_template
         if tosca_name == 'HOST' and current_tosca_template:
-            for req in current_tosca_template.requirements:
-                if 'host' in req:
-                    tosca_node = self._find_tosca_node(req['host'])
+            req = self.topology.requirement(current_tosca_template, 'host')
+            if req:
+                tosca_node = self._find_tosca_node(req.target_name)
 
         if tosca_node is None:
-            for node in self.nodetemplates:
-                if node.name == tosca_name:
-                    tosca_node = node
-                    break
+            tosca_node = self.topology.node(tosca_name)
         return tosca_node
 
     def _find_hot_resource_for_tosca(self, tosca_name,
@@ -735,30 +791,23 @@ class TranslateNodeTemplates(object):
                 raise Exception(msg)
         config_name = source_node.name + '_' + target_name + '_connect_config'
         implement = connect_config.get('implementation')
-        cwd = os.getcwd()
+        get_file = self.artifacts.resolve(implement)
         if config_location == 'target':
-            if self.csar_dir:
-                os.chdir(self.csar_dir)
-                get_file = os.path.abspath(implement)
-            else:
-                get_file = implement
             hot_config = HotResource(target_node,
                                      config_name,
                                      'OS::Heat::SoftwareConfig',
                                      {'config': {'get_file': get_file}},
-                                     csar_dir=self.csar_dir)
+                                     csar_dir=self.csar_dir,
+                                     topology=self.topology,
+                                     artifacts=self.artifacts)
         elif config_location == 'source':
-            if self.csar_dir:
-                os.chdir(self.csar_dir)
-                get_file = os.path.abspath(implement)
-            else:
-                get_file = implement
             hot_config = HotResource(source_node,
                                      config_name,
                                      'OS::Heat::SoftwareConfig',
                                      {'config': {'get_file': get_file}},
-                                     csar_dir=self.csar_dir)
-        os.chdir(cwd)
+                                     csar_dir=self.csar_dir,
+                                     topology=self.topology,
+                                     artifacts=self.artifacts)
         connectsto_resources.append(hot_config)
         hot_target = self._find_hot_resource_for_tosca(target_name)
         hot_source = self._find_hot_resource_for_tosca(source_node.name)
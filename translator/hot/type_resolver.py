@@ -0,0 +1,177 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from collections import OrderedDict
+import logging
+import threading
+
+from toscaparser.utils.gettextutils import _
+from translator.common.exception import UnsupportedTypeError
+
+log = logging.getLogger('heat-translator')
+
+CACHES = (SUPPORTED, BASE, DATA) = ('supported', 'base', 'data')
+
+
+class TypeResolver(object):
+    '''Memoized resolution of TOSCA types.
+
+    Walking parent_type builds a new parser type object at every level,
+    which is expensive for deep custom type hierarchies and templates of
+    many nodes of the same types. Resolutions are cached by type name for
+    the custom type definitions of a parse, the same object for all its
+    types, and shared by the parses without custom types. Only the
+    max_custom_defs most recent custom definitions are kept.
+
+    A cached supported type keeps the types walked to find it, it is only
+    reused while none of them but the last one is in the type map, however
+    the map was changed.
+    '''
+
+    MAX_ENTRIES = 4096
+
+    def __init__(self, type_map=None, max_custom_defs=4):
+        self.type_map = type_map if type_map is not None else {}
+        self.max_custom_defs = max_custom_defs
+        self.hits = 0
+        self.misses = 0
+        self._shared = self._new_caches()
+        # id(custom_def) -> (custom_def, caches), the reference keeps the
+        # id from being reused while the entry is alive
+        self._parses = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_caches():
+        return dict((name, {}) for name in CACHES)
+
+    def set_type_map(self, type_map):
+        self.type_map = type_map
+
+    def register(self, toscatype, clazz):
+        '''Map a TOSCA type to a translation class.'''
+        self.type_map[toscatype] = clazz
+
+    def clear(self):
+        with self._lock:
+            self._shared = self._new_caches()
+            self._parses.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def release(self, custom_def):
+        '''Drop the resolutions made for a set of custom type definitions.'''
+        with self._lock:
+            entry = self._parses.get(id(custom_def))
+            if entry is not None and entry[0] is custom_def:
+                del self._parses[id(custom_def)]
+
+    def _get_caches(self, entity_type):
+        custom_def = getattr(entity_type, 'custom_def', None)
+        if not custom_def:
+            return self._shared
+        with self._lock:
+            entry = self._parses.get(id(custom_def))
+            if entry is not None and entry[0] is custom_def:
+                self._parses.move_to_end(id(custom_def))
+                return entry[1]
+            caches = self._new_caches()
+            self._parses[id(custom_def)] = (custom_def, caches)
+            while len(self._parses) > self.max_custom_defs:
+                self._parses.popitem(last=False)
+            return caches
+
+    def get_supported_type(self, entity):
+        '''Return the closest type of an entity found in the type map.'''
+        cache = self._get_caches(entity.type_definition)[SUPPORTED]
+        walked = cache.get(entity.type)
+        if walked is not None and self._is_supported(walked):
+            self.hits += 1
+            return walked[-1]
+        self.misses += 1
+        # trace parent types until finding a supported type
+        node = entity
+        walked = [entity.type]
+        while walked[-1] not in self.type_map:
+            node = node.parent_type
+            if node is None:
+                raise UnsupportedTypeError(type=_('%s') % entity.type)
+            walked.append(node.type)
+        self._store(cache, entity.type, tuple(walked))
+        return walked[-1]
+
+    def _is_supported(self, walked):
+        type_map = self.type_map
+        if walked[-1] not in type_map:
+            return False
+        for toscatype in walked[:-1]:
+            if toscatype in type_map:
+                return False
+        return True
+
+    def get_base_type_str(self, node_type):
+        '''Return the type right below the Root type of a hierarchy.'''
+        if isinstance(node_type, str):
+            return node_type
+        cache = self._get_caches(node_type)[BASE]
+        base = cache.get(node_type.type)
+        if base is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            base = self._resolve_base_type_str(node_type)
+            self._store(cache, node_type.type, base)
+        return base
+
+    def get_type_data(self, name, entity_type, resolve):
+        '''Return data derived from a type, resolving it on the first call.
+
+        The name identifies the data and resolve computes it from the type.
+        The result is shared by all the callers, it must not be modified.
+        '''
+        cache = self._get_caches(entity_type)[DATA]
+        key = (name, entity_type.type)
+        data = cache.get(key)
+        if data is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            data = resolve(entity_type)
+            self._store(cache, key, data)
+        return data
+
+    def _resolve_base_type_str(self, node_type):
+        if isinstance(node_type, str):
+            return node_type
+        if node_type.parent_type is not None:
+            parent_type_str = None
+            if isinstance(node_type.parent_type, str):
+                parent_type_str = node_type.parent_type
+            else:
+                parent_type_str = node_type.parent_type.type
+
+            if parent_type_str and parent_type_str.endswith('.Root'):
+                return node_type.type
+            return self.get_base_type_str(node_type.parent_type)
+
+        return node_type.type
+
+    def _store(self, cache, key, value):
+        with self._lock:
+            if len(cache) >= self.MAX_ENTRIES:
+                cache.clear()
+            cache[key] = value
+
+
+# Resolver shared by all the translations of the process
+RESOLVER = TypeResolver()
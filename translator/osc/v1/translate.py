@@ -21,7 +21,9 @@ from oslo_log import log as logging
 from toscaparser.tosca_template import ToscaTemplate
 from toscaparser.utils.gettextutils import _
 from translator.common import flavors
+from translator.common import http_cache
 from translator.common import images
+from translator.common import import_cache
 from translator.common.utils import UrlUtils
 from translator.hot.tosca_translator import TOSCATranslator
 from translator.osc import utils
@@ -59,6 +61,23 @@ class TranslateTemplate(command.Command):
             help='Set a property for this template '
                  '(repeat option to set multiple properties)',
         )
+        parser.add_argument(
+            '--import-cache-dir',
+            metavar='<import-cache-dir>',
+            help='Directory caching the parsed imports of the templates '
+                 'across runs.')
+        parser.add_argument(
+            '--http-cache-dir',
+            metavar='<http-cache-dir>',
+            help='Directory caching the remote templates, imports and '
+                 'artifacts, which are only downloaded again when they '
+                 'change.')
+        parser.add_argument(
+            '--offline',
+            action='store_true',
+            default=False,
+            help='Only use the remote templates, imports and artifacts of '
+                 'the --http-cache-dir.')
         parser.add_argument(
             '--validate-only',
             metavar='<true or false>',
@@ -71,9 +90,17 @@ class TranslateTemplate(command.Command):
                     '(%s).'), parsed_args)
         output = None
 
-        session = self.app.cloud.get_session()
-        flavors.SESSION = session
-        images.SESSION = session
+        if parsed_args.offline and not parsed_args.http_cache_dir:
+            msg = _('The --offline argument requires --http-cache-dir.')
+            LOG.error(msg)
+            raise ValueError(msg)
+
+        if parsed_args.http_cache_dir:
+            http_cache.install(parsed_args.http_cache_dir,
+                               offline=parsed_args.offline)
+
+        if parsed_args.import_cache_dir:
+            import_cache.install(parsed_args.import_cache_dir)
 
         if parsed_args.parameter:
             parsed_params = parsed_args.parameter
@@ -84,14 +111,21 @@ class TranslateTemplate(command.Command):
             path = parsed_args.template_file
             a_file = os.path.isfile(path)
             a_url = UrlUtils.validate_url(path) if not a_file else False
+            if a_url:
+                path, a_file = http_cache.get_template_path(path, a_file)
             if a_file or a_url:
                 validate = parsed_args.validate_only
                 if validate and validate.lower() == "true":
                     ToscaTemplate(path, parsed_params, a_file)
                     msg = (_('The input "%(path)s" successfully passed '
-                             'validation.') % {'path': path})
+                             'validation.') %
+                           {'path': parsed_args.template_file})
                     print(msg)
                 else:
+                    # the session is only used to look up flavors and images
+                    session = self.app.cloud.get_session()
+                    flavors.SESSION = session
+                    images.SESSION = session
                     tosca = ToscaTemplate(path, parsed_params, a_file)
                     translator = TOSCATranslator(tosca, parsed_params)
                     output = translator.translate()
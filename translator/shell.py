@@ -12,7 +12,7 @@
 
 
 import argparse
-import codecs
+import importlib.util
 import logging
 import logging.config
 import os
@@ -21,31 +21,28 @@ import uuid
 import yaml
 import zipfile
 
-# NOTE(aloga): As per upstream developers requirement this needs to work
-# without the clients, therefore we need to pass if we cannot import them
-try:
-    from keystoneauth1 import loading
-except ImportError:
-    keystone_client_avail = False
-else:
-    keystone_client_avail = True
-
-try:
-    import heatclient.client
-except ImportError:
-    heat_client_avail = False
-else:
-    heat_client_avail = True
-
-
 from toscaparser.tosca_template import ToscaTemplate
 from toscaparser.utils.gettextutils import _
 from toscaparser.utils.urlutils import UrlUtils
+from translator.common import clients
+from translator.common import deploy_engine
 from translator.common import flavors
+from translator.common import http_cache
 from translator.common import images
+from translator.common import import_cache
+from translator.common import trace
 from translator.common import utils
 from translator.conf.config import ConfigProvider
+from translator.hot import parameter_sets
+from translator.hot.tosca_translator import JSON
+from translator.hot.tosca_translator import OUTPUT_FORMATS
 from translator.hot.tosca_translator import TOSCATranslator
+from translator.hot.tosca_translator import YAML
+
+# NOTE: the translation works without the clients, which are slow to
+# import. Only their availability is checked here, keystoneauth1 is imported
+# when a Keystone session is needed, see _needs_session.
+keystone_client_avail = importlib.util.find_spec('keystoneauth1') is not None
 
 """
 Test the heat-translator translation from command line as:
@@ -63,14 +60,25 @@ without actual translation, pass --validate-only=true along with
 other required arguments.
 
 """
-conf_file = ConfigProvider.get_translator_logging_file()
-try:
-    logging.config.fileConfig(conf_file)
-except Exception:
-    pass
 log = logging.getLogger("heat-translator")
 
 
+_logging_configured = False
+
+
+def configure_logging():
+    '''Configure the logging of the command line, once for the process.'''
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    conf_file = ConfigProvider.get_translator_logging_file()
+    try:
+        logging.config.fileConfig(conf_file)
+    except Exception:
+        pass
+
+
 class TranslatorShell(object):
 
     SUPPORTED_TYPES = ['tosca']
@@ -89,6 +97,14 @@ class TranslatorShell(object):
                             help=_('Where to store the output file. If not '
                                    'passed, it will be printed to stdin.'))
 
+        parser.add_argument('--output-format',
+                            metavar='<output-format>',
+                            choices=OUTPUT_FORMATS,
+                            default=YAML,
+                            help=(_('Format of the translated templates. '
+                                    'Choose between %s.') %
+                                  list(OUTPUT_FORMATS)))
+
         parser.add_argument('--template-type',
                             metavar='<input-template-type>',
                             choices=self.SUPPORTED_TYPES,
@@ -100,6 +116,32 @@ class TranslatorShell(object):
                             metavar='<param1=val1;param2=val2;...>',
                             help=_('Optional input parameters.'))
 
+        parser.add_argument('--parameter-sets',
+                            metavar='<filename>',
+                            help=_('YAML or JSON file mapping names to sets '
+                                   'of input parameters. The template is '
+                                   'translated for every set, into a '
+                                   'directory named after the set next to '
+                                   'the output file.'))
+
+        parser.add_argument('--import-cache-dir',
+                            metavar='<directory>',
+                            help=_('Directory caching the parsed imports of '
+                                   'the templates, such as type '
+                                   'definition libraries, across runs.'))
+
+        parser.add_argument('--http-cache-dir',
+                            metavar='<directory>',
+                            help=_('Directory caching the remote templates, '
+                                   'imports and artifacts, which are only '
+                                   'downloaded again when they change.'))
+
+        parser.add_argument('--offline',
+                            action='store_true',
+                            default=False,
+                            help=_('Only use the remote templates, imports '
+                                   'and artifacts of the --http-cache-dir.'))
+
         parser.add_argument('--validate-only',
                             action='store_true',
                             default=False,
@@ -118,14 +160,50 @@ class TranslatorShell(object):
                             help=_('The name to use for the Heat stack when '
                                    'deploy the generated template.'))
 
+        parser.add_argument('--wait',
+                            action='store_true',
+                            default=False,
+                            help=_('Wait for the creation of the deployed '
+                                   'stack and report its status.'))
+
+        parser.add_argument('--analyze',
+                            action='store_true',
+                            default=False,
+                            help=_('Print the metrics of the translated '
+                                   'stack instead of the translated '
+                                   'template.'))
+
+        parser.add_argument('--max-stack-resources',
+                            metavar='<count>',
+                            type=int,
+                            required=False,
+                            help=_('Split the translated resources into '
+                                   'nested stacks of at most this number of '
+                                   'resources.'))
+
+        parser.add_argument('--trace',
+                            action='store_true',
+                            default=False,
+                            help=_('Write the trace events of the '
+                                   'translation, with their time, to the '
+                                   'standard error.'))
+
         self._append_global_identity_args(parser, argv)
 
         return parser
 
+    def _needs_session(self, argv):
+        # a session is used to deploy and to look up flavors and images when
+        # OpenStack credentials are given, offline translations do without
+        return ('--deploy' in argv or
+                any(arg.startswith('--os-') for arg in argv) or
+                any(name.startswith('OS_') for name in os.environ))
+
     def _append_global_identity_args(self, parser, argv):
-        if not keystone_client_avail:
+        if not keystone_client_avail or not self._needs_session(argv):
             return
 
+        from keystoneauth1 import loading
         loading.register_session_argparse_arguments(parser)
 
         default_auth_plugin = 'password'
@@ -139,27 +217,64 @@ class TranslatorShell(object):
         parser = self.get_parser(argv)
         (args, args_list) = parser.parse_known_args(argv)
 
+        if args.trace:
+            with trace.TraceRecorder(sys.stderr):
+                return self.main([arg for arg in argv if arg != '--trace'])
+
         template_file = args.template_file
         template_type = args.template_type
         output_file = args.output_file
         validate_only = args.validate_only
         deploy = args.deploy
         stack_name = args.stack_name
+        analyze = args.analyze
 
         parsed_params = {}
         if args.parameters:
             parsed_params = self._parse_parameters(args.parameters)
 
+        if args.parameter_sets and (not output_file or deploy or analyze):
+            msg = _('The --parameter-sets argument requires --output-file '
+                    'and can not be used with --deploy or --analyze.')
+            log.error(msg)
+            raise ValueError(msg)
+
+        if args.max_stack_resources is not None and \
+                args.max_stack_resources < 1:
+            msg = _('The --max-stack-resources argument must be a positive '
+                    'number.')
+            log.error(msg)
+            raise ValueError(msg)
+
+        if args.offline and not args.http_cache_dir:
+            msg = _('The --offline argument requires --http-cache-dir.')
+            log.error(msg)
+            raise ValueError(msg)
+
+        if args.http_cache_dir:
+            http_cache.install(args.http_cache_dir, offline=args.offline)
+
+        if args.import_cache_dir:
+            import_cache.install(args.import_cache_dir)
+
         a_file = os.path.isfile(template_file)
         a_url = UrlUtils.validate_url(template_file) if not a_file else False
+        if a_url:
+            # the parser downloads remote CSARs itself, the local copy of
+            # the HTTP cache is used instead
+            template_file, a_file = http_cache.get_template_path(
+                template_file, a_file)
         if a_file or a_url:
             if validate_only:
                 ToscaTemplate(template_file, parsed_params, a_file)
                 msg = (_('The input "%(template_file)s" successfully passed '
-                         'validation.') % {'template_file': template_file})
+                         'validation.') % {'template_file':
+                                           args.template_file})
                 print(msg)
             else:
-                if keystone_client_avail:
+                keystone_session = None
+                if keystone_client_avail and self._needs_session(argv):
+                    from keystoneauth1 import loading
                     try:
                         keystone_auth = (
                             loading.load_auth_from_argparse_arguments(args)
@@ -175,13 +290,23 @@ class TranslatorShell(object):
                     except Exception:
                         keystone_session = None
 
+                if args.parameter_sets:
+                    self._translate_parameter_sets(template_file, a_file,
+                                                   parsed_params,
+                                                   args.parameter_sets,
+                                                   output_file,
+                                                   args.output_format)
+                    return
+
                 translator = self._get_translator(template_type,
                                                   template_file,
                                                   parsed_params, a_file,
-                                                  deploy)
+                                                  deploy, analyze,
+                                                  args.max_stack_resources)
 
                 if translator and deploy:
-                    if not keystone_client_avail or not heat_client_avail:
+                    if not (keystone_client_avail and
+                            clients.heat_client_avail):
                         raise RuntimeError(_('Could not find Heat or Keystone'
                                              'client to deploy, aborting '))
                     if not keystone_session:
@@ -193,9 +318,10 @@ class TranslatorShell(object):
                         os.path.splitext(template_file)[0])
                     self.deploy_on_heat(keystone_session, keystone_auth,
                                         translator, stack_name, file_name,
-                                        parsed_params)
+                                        parsed_params, args.wait)
 
-                self._write_output(translator, output_file)
+                self._write_output(translator, output_file, analyze,
+                                   args.output_format)
         else:
             msg = (_('The path %(template_file)s is not a valid '
                      'file or URL.') % {'template_file': template_file})
@@ -204,30 +330,29 @@ class TranslatorShell(object):
             raise ValueError(msg)
 
     def deploy_on_heat(self, session, auth, translator,
-                       stack_name, file_name, parameters):
+                       stack_name, file_name, parameters, wait=False):
         endpoint = auth.get_endpoint(session, service_type="orchestration")
-        heat_client = heatclient.client.Client('1',
-                                               session=session,
-                                               auth=auth,
-                                               endpoint=endpoint)
+        heat_client = clients.REGISTRY.get_heat(session, auth=auth,
+                                                endpoint=endpoint)
 
         heat_stack_name = stack_name if stack_name else \
             'heat_' + file_name + '_' + str(uuid.uuid4()).split("-")[0]
         msg = _('Deploy the generated template, the stack name is %(name)s.')\
             % {'name': heat_stack_name}
         log.debug(msg)
-        tpl = yaml.safe_load(translator.translate())
+        tpl = deploy_engine.load_template(translator.translate())
 
         # get all the values for get_file from a translated template
-        get_files = []
-        utils.get_dict_value(tpl, "get_file", get_files)
-        files = {}
-        if get_files:
-            for file in get_files:
-                with codecs.open(file, encoding='utf-8', errors='strict') as f:
-                    text = f.read()
-                    files[file] = text
-        tpl['heat_template_version'] = str(tpl['heat_template_version'])
+        files = deploy_engine.get_template_files(tpl)
+        if wait:
+            deployment = deploy_engine.StackDeployment(
+                heat_stack_name, tpl, parameters, files)
+            deploy_engine.DeployEngine(heat_client).deploy([deployment])
+            print(deploy_engine.format_report([deployment]))
+            if not deployment.succeeded:
+                raise RuntimeError(_('The stack %(name)s was not created.')
+                                   % {'name': heat_stack_name})
+            return
         self._create_stack(heat_client=heat_client,
                            stack_name=heat_stack_name,
                            template=tpl,
@@ -266,7 +391,8 @@ class TranslatorShell(object):
                 raise ValueError(msg)
         return parsed_inputs
 
-    def _get_translator(self, sourcetype, path, parsed_params, a_file, deploy):
+    def _get_translator(self, sourcetype, path, parsed_params, a_file, deploy,
+                        analyze=False, max_stack_resources=None):
         if sourcetype == "tosca":
             log.debug(_('Loading the tosca template.'))
             tosca = ToscaTemplate(path, parsed_params, a_file)
@@ -279,25 +405,62 @@ class TranslatorShell(object):
                 msg = _("'%(csar)s' is the location of decompressed "
                         "CSAR file.") % {'csar': csar_dir}
                 log.info(msg)
-            translator = TOSCATranslator(tosca, parsed_params, deploy,
-                                         csar_dir=csar_dir)
+            translator = TOSCATranslator(
+                tosca, parsed_params, deploy, csar_dir=csar_dir,
+                analyze=analyze, max_stack_resources=max_stack_resources)
             log.debug(_('Translating the tosca template.'))
         return translator
 
-    def _write_output(self, translator, output_file=None):
+    def _translate_parameter_sets(self, template_file, a_file,
+                                  parsed_params, parameter_sets_file,
+                                  output_file, output_format):
+        # the parameters of a set override those of --parameters
+        named_sets = parameter_sets.load_parameter_sets(parameter_sets_file)
+        path, filename = os.path.split(output_file)
+        set_translator = parameter_sets.ParameterSetTranslator(
+            template_file, a_file, output_format)
+        for name, values in named_sets.items():
+            set_params = dict(parsed_params)
+            set_params.update(values)
+            files = set_translator.translate_parameters(set_params, filename)
+            set_path = os.path.join(path, name)
+            os.makedirs(set_path, exist_ok=True)
+            for file_name, content in files.items():
+                with open(os.path.join(set_path, file_name), 'w+') as f:
+                    f.write(content)
+        log.info(_('Translated %(sets)d parameter sets with %(parses)d '
+                   'parses.') % {'sets': len(named_sets),
+                                 'parses': set_translator.parses})
+
+    def _write_output(self, translator, output_file=None, analyze=False,
+                      output_format=YAML):
+        if output_format == JSON:
+            translate_to_files_dict = translator.translate_to_json_files_dict
+        else:
+            translate_to_files_dict = translator.translate_to_yaml_files_dict
         if output_file:
             path, filename = os.path.split(output_file)
-            yaml_files = translator.translate_to_yaml_files_dict(filename)
-            for name, content in yaml_files.items():
+            files = translate_to_files_dict(filename)
+            for name, content in files.items():
                 with open(os.path.join(path, name), 'w+') as f:
                     f.write(content)
+        elif analyze:
+            # the templates are only needed for the metrics
+            translate_to_files_dict('output.' + output_format)
+        elif output_format == JSON:
+            print(translator.translate_to_json())
         else:
             print(translator.translate())
+        if analyze:
+            print(yaml.safe_dump(dict(translator.metrics),
+                                 default_flow_style=False, sort_keys=False),
+                  end='')
 
 
 def main(args=None):
     if args is None:
         args = sys.argv[1:]
+    configure_logging()
     TranslatorShell().main(args)
 
 
@@ -0,0 +1,174 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''
+Translate the samples of a manifest and compare them with their expected
+HOT templates, in parallel processes:
+
+    python -m translator.tests.golden [--processes N] [manifest]
+
+The manifest lists the cases as:
+
+    cases:
+    - name: single_server
+      template: tosca_single_server.yaml
+      expected:
+      - hot_output/hot_single_server.yaml
+      parameters:
+        cpus: 1
+      alternatives:
+      - - hot_output/hot_single_server_alt.yaml
+
+with paths relative to the manifest. The optional alternatives are other
+expected templates the translation can match instead. Every process keeps
+the parsed imports and expected templates for the cases it runs. The
+default manifest holds the cases of the translation tests.
+'''
+
+import argparse
+from collections import namedtuple
+from concurrent import futures
+import logging
+import os
+import sys
+import time
+
+from toscaparser.utils.gettextutils import _
+from translator.common import import_cache
+from translator.common.utils import TranslationUtils
+from translator.tests import utils
+import yaml
+
+log = logging.getLogger('heat-translator')
+
+DEFAULT_MANIFEST = utils.test_sample('golden_manifest.yaml')
+
+# alternatives: other expected templates the translation can match instead
+GoldenCase = namedtuple('GoldenCase',
+                        ['name', 'template', 'expected', 'parameters',
+                         'alternatives'], defaults=((),))
+
+# differences: the differences keyed by JSON pointers, empty when the
+# translation matches
+# error: the error of a failed translation, or None
+# elapsed: seconds taken to translate and compare the case
+GoldenResult = namedtuple('GoldenResult',
+                          ['name', 'differences', 'error', 'elapsed'])
+
+
+def load_manifest(path=DEFAULT_MANIFEST):
+    '''Return the GoldenCases of a manifest, with absolute paths.'''
+    with open(path) as f:
+        manifest = yaml.safe_load(f) or {}
+    base = os.path.dirname(os.path.abspath(path))
+    cases = []
+    names = set()
+    for entry in manifest.get('cases') or []:
+        if not isinstance(entry, dict) or not entry.get('name') or \
+                not entry.get('template') or not entry.get('expected') or \
+                entry['name'] in names:
+            msg = (_('Invalid case %(entry)s in the manifest %(path)s. '
+                     'Every case needs a unique name, a template and '
+                     'expected templates.') % {'entry': entry, 'path': path})
+            log.error(msg)
+            raise ValueError(msg)
+        names.add(entry['name'])
+        cases.append(GoldenCase(
+            entry['name'], os.path.join(base, entry['template']),
+            _get_paths(base, entry['expected']),
+            entry.get('parameters') or {},
+            [_get_paths(base, expected)
+             for expected in entry.get('alternatives') or []]))
+    return cases
+
+
+def _get_paths(base, names):
+    if not isinstance(names, list):
+        names = [names]
+    return [os.path.join(base, name) for name in names]
+
+
+def run_case(case):
+    '''Translate a GoldenCase and return its GoldenResult.'''
+    start = time.perf_counter()
+    differences = {}
+    error = None
+    try:
+        for expected in [case.expected] + list(case.alternatives):
+            found = TranslationUtils.compare_tosca_translation_with_hot(
+                case.template, expected, dict(case.parameters))
+            if not found:
+                differences = {}
+                break
+            differences = differences or found
+    except Exception as e:
+        error = '%s: %s' % (type(e).__name__, e)
+    return GoldenResult(case.name, differences, error,
+                        time.perf_counter() - start)
+
+
+def _init_process():
+    # the type definitions shared by the samples are parsed once per process
+    import_cache.install()
+
+
+def run(cases, processes=None):
+    '''Run the GoldenCases and return their GoldenResults, in order.
+
+    The cases are spread over processes, os.cpu_count() by default. With a
+    single process, they are run in the current one.
+    '''
+    if processes == 1 or len(cases) <= 1:
+        _init_process()
+        try:
+            return [run_case(case) for case in cases]
+        finally:
+            import_cache.uninstall()
+    with futures.ProcessPoolExecutor(processes,
+                                     initializer=_init_process) as executor:
+        return list(executor.map(run_case, cases))
+
+
+def format_report(results, limit=None):
+    '''Return the timing of the results, slowest first.'''
+    failed = [result for result in results
+              if result.error or result.differences]
+    lines = [_('%(count)d cases, %(failed)d failed, %(elapsed).3fs of '
+               'translation.') % {'count': len(results),
+                                  'failed': len(failed),
+                                  'elapsed': sum(result.elapsed
+                                                 for result in results)}]
+    for result in sorted(results, key=lambda result: -result.elapsed)[:limit]:
+        status = ''
+        if result.error:
+            status = ' ERROR ' + result.error
+        elif result.differences:
+            status = ' DIFFERENT ' + ', '.join(sorted(result.differences))
+        lines.append('%8.3fs  %s%s' % (result.elapsed, result.name, status))
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='golden')
+    parser.add_argument('manifest', nargs='?', default=DEFAULT_MANIFEST)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--slowest', type=int, default=None,
+                        help=_('Only report the slowest cases.'))
+    args = parser.parse_args(args)
+    results = run(load_manifest(args.manifest), args.processes)
+    print(format_report(results, args.slowest))
+    return 1 if any(result.error or result.differences
+                    for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.common import utils as common_utils
+from translator.hot.artifact_resolver import ArtifactResolver
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class ArtifactResolverTest(TestCase):
+
+    def setUp(self):
+        super(ArtifactResolverTest, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.csar_dir = os.path.join(self.tmp_dir, 'csar')
+        os.makedirs(os.path.join(self.csar_dir, 'Scripts'))
+
+    def test_paths_without_csar(self):
+        resolver = ArtifactResolver()
+        self.assertEqual('Scripts/install.sh',
+                         resolver.resolve('Scripts/install.sh'))
+
+    def test_paths_relative_to_csar_root(self):
+        # link to the CSAR root, the path of the root is the real one
+        link = os.path.join(self.tmp_dir, 'link')
+        os.symlink(self.csar_dir, link)
+        resolver = ArtifactResolver(link)
+        real_dir = os.path.realpath(self.csar_dir)
+        self.assertEqual(os.path.join(real_dir, 'Scripts', 'install.sh'),
+                         resolver.resolve('Scripts/install.sh'))
+        self.assertEqual(os.path.join(real_dir, 'install.sh'),
+                         resolver.resolve('Scripts/../install.sh'))
+        self.assertEqual('/opt/install.sh',
+                         resolver.resolve('/opt/install.sh'))
+
+        with mock.patch('os.path.normpath') as normpath:
+            resolver.resolve('Scripts/install.sh')
+            self.assertFalse(normpath.called)
+
+    def test_translation_keeps_working_directory(self):
+        csar = utils.test_sample("csar_elk.zip")
+        common_utils.decompress(csar, self.csar_dir)
+        tosca = ToscaTemplate(csar, {}, True)
+        with mock.patch('os.chdir') as chdir:
+            output = TOSCATranslator(tosca, {}, csar_dir=self.csar_dir). \
+                translate_to_yaml_files_dict('output.yaml')
+            self.assertFalse(chdir.called)
+        self.assertIn('Scripts/kibana/create.sh', output['output.yaml'])
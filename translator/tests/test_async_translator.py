@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+from concurrent import futures
+from unittest import mock
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.common import flavors
+from translator.common import images
+from translator.hot import async_translator
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class AsyncTranslatorTest(TestCase):
+
+    samples = ('tosca_helloworld.yaml',
+               'autoscaling/tosca_autoscaling.yaml',
+               'network/tosca_two_servers_one_network.yaml')
+    params = {'network_name': 'net', 'network_cidr': '10.0.0.0/24',
+              'network_start_ip': '10.0.0.1', 'network_end_ip': '10.0.0.9'}
+
+    def _get_files(self):
+        return [utils.test_sample(sample) for sample in self.samples]
+
+    def test_translate_concurrently(self):
+        expected = [async_translator.translate_file(path, dict(self.params))
+                    for path in self._get_files()]
+
+        async def translate(path):
+            tosca = await async_translator.load_template(path,
+                                                         dict(self.params))
+            translator = async_translator.AsyncTOSCATranslator(
+                tosca, dict(self.params), analyze=True)
+            yaml_files = await translator.translate_to_yaml_files_dict(
+                'output.yaml')
+            self.assertEqual(len(yaml_files),
+                             translator.translator.metrics['templates'])
+            return yaml_files
+
+        async def translate_all():
+            ticks = []
+
+            async def tick():
+                # runs while the translations are in progress
+                while True:
+                    ticks.append(None)
+                    await asyncio.sleep(0)
+
+            ticker = asyncio.ensure_future(tick())
+            results = await asyncio.gather(
+                *[translate(path) for path in self._get_files()])
+            ticker.cancel()
+            return results, ticks
+
+        results, ticks = asyncio.run(translate_all())
+        self.assertEqual(expected, results)
+        self.assertGreater(len(ticks), 1)
+
+    def test_translate_template(self):
+        path = self._get_files()[1]
+
+        async def translate():
+            with futures.ThreadPoolExecutor(2) as executor:
+                return await async_translator.translate_template(
+                    path, base_filename='stack.yaml', executor=executor)
+
+        yaml_files = asyncio.run(translate())
+        self.assertEqual(
+            async_translator.translate_file(path,
+                                            base_filename='stack.yaml'),
+            yaml_files)
+        self.assertIn('stack.yaml', yaml_files)
+
+    def test_load_catalogs(self):
+        self.assertEqual([flavors.get_flavors(), images.get_images()],
+                         asyncio.run(async_translator.load_catalogs()))
+
+    def test_output_formats(self):
+        path = utils.test_sample('autoscaling', 'tosca_autoscaling.yaml')
+
+        def get_translator():
+            return TOSCATranslator(ToscaTemplate(path), {})
+
+        async def translate(method, *args):
+            translator = async_translator.AsyncTOSCATranslator(
+                ToscaTemplate(path), {})
+            return await getattr(translator, method)(*args)
+
+        for method, args in (('translate_to_json', ()),
+                             ('translate_to_json_files_dict', ('a.json',)),
+                             ('translate_to_dict', ())):
+            self.assertEqual(getattr(get_translator(), method)(*args),
+                             asyncio.run(translate(method, *args)))
+
+    def test_deploy(self):
+        heat_client = mock.Mock()
+        heat_client.stacks.create.return_value = {'stack': {'id': 'id'}}
+        heat_client.stacks.get.return_value = mock.Mock(
+            stack_status='CREATE_COMPLETE', stack_status_reason='done')
+        path = utils.test_sample('tosca_helloworld.yaml')
+
+        async def deploy():
+            translator = async_translator.AsyncTOSCATranslator(
+                ToscaTemplate(path), {})
+            return await translator.deploy(heat_client, 'mystack',
+                                           {'key': 'value'})
+
+        deployment = asyncio.run(deploy())
+        self.assertTrue(deployment.succeeded)
+        self.assertEqual('id', deployment.stack_id)
+        kwargs = heat_client.stacks.create.call_args[1]
+        self.assertEqual('mystack', kwargs['stack_name'])
+        self.assertEqual({'key': 'value'}, kwargs['parameters'])
+        # the stack of the YAML output is created
+        self.assertEqual('2013-05-23',
+                         kwargs['template']['heat_template_version'])
+        self.assertEqual(
+            'OS::Nova::Server',
+            kwargs['template']['resources']['my_server']['type'])
+        heat_client.stacks.get.assert_called_once_with('id')
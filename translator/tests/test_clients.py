@@ -0,0 +1,111 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gc
+from unittest import mock
+import weakref
+
+from keystoneauth1 import session as ks_session
+from translator.common import clients
+from translator.tests.base import TestCase
+
+
+class ClientRegistryTest(TestCase):
+
+    def setUp(self):
+        super(ClientRegistryTest, self).setUp()
+        self.registry = clients.ClientRegistry(pool_connections=2,
+                                               pool_maxsize=3)
+
+    @mock.patch('novaclient.client.Client')
+    def test_get_nova(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: mock.Mock()
+        session = mock.Mock()
+        nova = self.registry.get_nova(session)
+        self.assertIs(nova, self.registry.get_nova(session))
+        mock_client.assert_called_once_with('2', session=session)
+
+        self.assertIsNot(nova, self.registry.get_nova(mock.Mock()))
+        self.registry.clear()
+        self.registry.get_nova(session)
+        self.assertEqual(3, mock_client.call_count)
+
+    @mock.patch('heatclient.client.Client')
+    def test_get_heat(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: mock.Mock()
+        session = mock.Mock()
+        auth = mock.Mock()
+        heat = self.registry.get_heat(session, auth=auth, endpoint='http://a')
+        self.assertIs(heat, self.registry.get_heat(session, auth=auth,
+                                                   endpoint='http://a'))
+        self.assertIsNot(heat, self.registry.get_heat(session, auth=auth,
+                                                      endpoint='http://b'))
+        mock_client.assert_any_call('1', session=session, auth=auth,
+                                    endpoint='http://b')
+        self.assertEqual(2, mock_client.call_count)
+
+    @mock.patch('novaclient.client.Client')
+    def test_clients_are_bounded(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: mock.Mock(
+            session=kwargs['session'])
+        registry = clients.ClientRegistry(max_clients=2)
+        sessions = [mock.Mock() for index in range(3)]
+        first = registry.get_nova(sessions[0])
+        registry.get_nova(sessions[1])
+        # the first client is the most recently used
+        self.assertIs(first, registry.get_nova(sessions[0]))
+        registry.get_nova(sessions[2])
+        self.assertEqual(2, len(registry))
+        self.assertIs(first, registry.get_nova(sessions[0]))
+        self.assertEqual(3, mock_client.call_count)
+
+        # evicted clients and their sessions are freed
+        session_ref = weakref.ref(sessions[1])
+        del sessions[1]
+        mock_client.reset_mock()
+        gc.collect()
+        self.assertIsNone(session_ref())
+
+    @mock.patch('novaclient.client.Client')
+    def test_pool_limits(self, mock_client):
+        session = ks_session.Session()
+        adapters = dict(session.session.adapters)
+        pool_managers = {}
+        for prefix, adapter in adapters.items():
+            adapter.max_retries.total = 5
+            adapter.poolmanager.connection_from_url(prefix + 'example.com')
+            pool_managers[prefix] = adapter.poolmanager
+        self.registry.get_nova(session)
+        for prefix in ('https://', 'http://'):
+            adapter = session.session.adapters[prefix]
+            # the adapters of the session are kept with their options
+            self.assertIs(adapters[prefix], adapter)
+            self.assertEqual(5, adapter.max_retries.total)
+            self.assertIn('socket_options',
+                          adapter.poolmanager.connection_pool_kw)
+            self.assertEqual(2, adapter._pool_connections)
+            self.assertEqual(3, adapter._pool_maxsize)
+            self.assertEqual(3, adapter.poolmanager.connection_pool_kw[
+                'maxsize'])
+            # the previous pools are closed
+            self.assertIsNot(pool_managers[prefix], adapter.poolmanager)
+            self.assertEqual(0, len(pool_managers[prefix].pools))
+
+        # the adapters of a session are set once
+        adapter = session.session.adapters['https://']
+        self.registry.get_openstack(session)
+        self.assertIs(adapter, session.session.adapters['https://'])
+
+    def test_missing_client(self):
+        with mock.patch.object(clients, 'nova_client_avail', False):
+            self.assertRaises(RuntimeError, self.registry.get_nova,
+                              mock.Mock())
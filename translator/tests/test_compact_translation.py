@@ -0,0 +1,72 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gc
+import weakref
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot.syntax.hot_template import CompactResource
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class CompactTranslationTest(TestCase):
+
+    params = {'db_name': 'wordpress',
+              'db_user': 'wp_user',
+              'db_pwd': 'wp_pass',
+              'db_root_pwd': 'passw0rd',
+              'db_port': 3366,
+              'cpus': 8}
+    sample = "tosca_single_instance_wordpress.yaml"
+
+    def _translate(self, compact):
+        tosca = ToscaTemplate(utils.test_sample(self.sample), self.params)
+        translator = TOSCATranslator(tosca, self.params, compact=compact)
+        output = translator.translate_to_yaml_files_dict('output.yaml')
+        return translator, weakref.ref(tosca), output
+
+    def test_compact_output_unchanged(self):
+        expected = self._translate(False)[2]
+        translator, tosca_ref, output = self._translate(True)
+        self.assertEqual(expected, output)
+        self.assertTrue(all(isinstance(resource, CompactResource)
+                            for resource in translator.hot_template.resources))
+        # a compacted template keeps producing the same output
+        self.assertEqual(expected,
+                         translator.hot_template.output_to_yaml_files_dict(
+                             'output.yaml',
+                             translator.hot_template_version))
+
+    def test_compact_releases_tosca_template(self):
+        translator, tosca_ref, output = self._translate(False)
+        gc.collect()
+        self.assertIsNotNone(tosca_ref())
+
+        translator, tosca_ref, output = self._translate(True)
+        gc.collect()
+        self.assertIsNone(tosca_ref())
+        self.assertIsNone(translator.tosca)
+        self.assertIsNone(translator.node_translator)
+
+    def test_compact_translator_is_single_use(self):
+        translator, tosca_ref, output = self._translate(True)
+        for translate in (translator.translate,
+                          translator.translate_to_json,
+                          translator.translate_to_dict):
+            self.assertRaises(ValueError, translate)
+        self.assertRaises(ValueError, translator.translate_to_snapshot,
+                          'output.yaml')
+        # the compacted template still gives the output of other values
+        self.assertEqual(output, translator.translate_parameters(
+            self.params, 'output.yaml'))
@@ -0,0 +1,153 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from http import server
+import json
+import tempfile
+import threading
+
+import heatclient.client
+from translator.common import deploy_engine
+from translator.common.exception import StackCreateTimeoutError
+from translator.tests.base import TestCase
+
+
+class FakeHeatHandler(server.BaseHTTPRequestHandler):
+    '''Minimal Heat stacks API keeping its stacks in the server.'''
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, code, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        body = json.loads(self.rfile.read(length))
+        name = body['stack_name']
+        if name.startswith('invalid'):
+            self._send(400, {'title': 'Bad Request', 'explanation': 'invalid',
+                             'error': {'message': 'invalid template'}})
+            return
+        with self.server.lock:
+            stack_id = 'id-%s' % name
+            self.server.stacks[stack_id] = {'body': body, 'polls': 0}
+            self.server.running += 1
+            self.server.max_running = max(self.server.max_running,
+                                          self.server.running)
+        self._send(201, {'stack': {'id': stack_id, 'links': []}})
+
+    def do_GET(self):
+        stack_id = self.path.split('/')[-1].split('?')[0]
+        with self.server.lock:
+            stack = self.server.stacks[stack_id]
+            stack['polls'] += 1
+            name = stack['body']['stack_name']
+            status = 'CREATE_IN_PROGRESS'
+            if stack['polls'] >= 3 and not name.startswith('slow'):
+                status = 'CREATE_FAILED' if name.startswith('fail') \
+                    else 'CREATE_COMPLETE'
+                if stack['polls'] == 3:
+                    self.server.running -= 1
+        self._send(200, {'stack': {
+            'id': stack_id, 'stack_name': name, 'stack_status': status,
+            'stack_status_reason': 'Stack %s' % status}})
+
+
+class DeployEngineTest(TestCase):
+
+    def setUp(self):
+        super(DeployEngineTest, self).setUp()
+        self.server = server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                 FakeHeatHandler)
+        self.server.lock = threading.Lock()
+        self.server.stacks = {}
+        self.server.running = 0
+        self.server.max_running = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        endpoint = 'http://127.0.0.1:%d/v1/tenant' % self.server.server_port
+        self.heat_client = heatclient.client.Client('1', endpoint=endpoint,
+                                                    token='token')
+        self.sleeps = []
+
+    def _get_engine(self, **kwargs):
+        return deploy_engine.DeployEngine(self.heat_client,
+                                          sleep=self.sleeps.append, **kwargs)
+
+    def _get_template(self):
+        return {'heat_template_version': '2013-05-23',
+                'resources': {'server': {'type': 'OS::Nova::Server'}}}
+
+    def test_deploy(self):
+        names = ['stack%d' % index for index in range(6)] + ['failed']
+        deployments = [deploy_engine.StackDeployment(name,
+                                                     self._get_template())
+                       for name in names]
+        result = self._get_engine(max_concurrency=2).deploy(deployments)
+
+        self.assertEqual(names, [deployment.stack_name
+                                 for deployment in result])
+        self.assertEqual([True] * 6 + [False],
+                         [deployment.succeeded for deployment in result])
+        self.assertEqual('CREATE_FAILED', result[-1].status)
+        self.assertEqual('Stack CREATE_FAILED', result[-1].status_reason)
+        for deployment in result:
+            self.assertEqual('id-' + deployment.stack_name,
+                             deployment.stack_id)
+            self.assertEqual(3, deployment.polls)
+            self.assertIsNotNone(deployment.elapsed)
+        self.assertLessEqual(self.server.max_running, 2)
+        # the polling interval grows for every stack
+        self.assertEqual([2.0] * len(names) + [4.0] * len(names),
+                         sorted(self.sleeps))
+        self.assertEqual(
+            {'heat_template_version': '2013-05-23',
+             'resources': {'server': {'type': 'OS::Nova::Server'}}},
+            self.server.stacks['id-stack0']['body']['template'])
+
+    def test_deploy_errors(self):
+        deployments = [
+            deploy_engine.StackDeployment('invalid', self._get_template()),
+            deploy_engine.StackDeployment('slow', self._get_template())]
+        engine = self._get_engine(poll_interval=1, max_poll_interval=2,
+                                  timeout=3, clock=lambda: sum(self.sleeps))
+        invalid, slow = engine.deploy(deployments)
+        self.assertIsNone(invalid.stack_id)
+        self.assertIsNone(invalid.status)
+        self.assertFalse(invalid.succeeded)
+        self.assertIsInstance(slow.error, StackCreateTimeoutError)
+        self.assertEqual('CREATE_IN_PROGRESS', slow.status)
+        self.assertFalse(slow.succeeded)
+        self.assertEqual([1, 2], self.sleeps)
+        report = deploy_engine.format_report([invalid, slow]).split('\n')
+        self.assertTrue(report[0].startswith('invalid - '))
+        self.assertTrue(report[1].startswith('slow CREATE_IN_PROGRESS 3.0s '
+                                             'Stack "slow" was not created'))
+
+    def test_get_template_files(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.sh') as script:
+            script.write('echo configure\n')
+            script.flush()
+            template = {'resources': {'config': {
+                'type': 'OS::Heat::SoftwareConfig',
+                'properties': {'config': {'get_file': script.name}}}}}
+            self.assertEqual({script.name: 'echo configure\n'},
+                             deploy_engine.get_template_files(template))
@@ -21,6 +21,8 @@ from translator.tests.base import TestCase
 
 class EtsiToscaHotTranslationTest(TestCase):
 
+    # the samples only compared with their expected templates are the cases
+    # of samples/tests/data/golden_manifest.yaml, run by test_golden
     test_data_relative_path = "../../samples/tests/data/"
 
     def _test_successful_translation(self, tosca_file, hot_files, params=None):
@@ -46,33 +48,6 @@ class EtsiToscaHotTranslationTest(TestCase):
             tosca_file, hot_file, params)
         ExceptionCollector.assertExceptionMessage(error_collect, msg)
 
-    def test_hot_translate_etsi_nfv_vnf(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vnf.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/'
-            'etsi_nfv/hot_nfv_vnf.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vdu(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/'
-            'etsi_nfv/hot_nfv_vdu.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vdu_with_compute_requirements(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu_with_compute_requirements.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_vdu_with_compute_requirements.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
     def test_hot_translate_etsi_nfv_vdu_with_invalid_compute_requirements(
             self):
         tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
@@ -90,15 +65,6 @@ class EtsiToscaHotTranslationTest(TestCase):
             self.log_fixture.output
         )
 
-    def test_hot_translate_etsi_nfv_vdu_with_logical_node(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu_with_logical_node.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_vdu_with_logical_node.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
     def test_hot_translate_etsi_nfv_vdu_with_unsupported_storage(self):
         tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
                       'tosca_nfv_vdu_with_unsupported_storage.yaml')
@@ -115,42 +81,6 @@ class EtsiToscaHotTranslationTest(TestCase):
             self.log_fixture.output
         )
 
-    def test_hot_translate_etsi_nfv_cp(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_cp.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_cp.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_cp_with_extended_vnic_type(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_cp_with_extended_vnic_type.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_cp_with_extended_vnic_type.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_check_cp_order(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_check_cp_order.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_check_cp_order.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vl(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vl.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_vl.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
     def test_hot_translate_etsi_nfv_vl_with_unsupported_protocol(self):
         tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
                       'tosca_nfv_vl_with_unsupported_protocol.yaml')
@@ -194,60 +124,6 @@ class EtsiToscaHotTranslationTest(TestCase):
                 self.log_fixture.output
             )
 
-    def test_hot_translate_etsi_nfv_blockstorage(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_blockstorage.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_blockstorage.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vnf_vdu_cp_vl_blockstorage_with_scaling(
-            self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vnf_vdu_cp_vl_blockstorage_with_scaling.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'vnf_vdu_cp_vl_blockstorage_with_scaling/'
-            'hot_nfv_vnf_vdu_cp_vl_blockstorage_with_scaling.yaml',
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'vnf_vdu_cp_vl_blockstorage_with_scaling/'
-            'worker_instance.hot.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vdu_cp_vl_with_mixed_scaling(
-            self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu_cp_vl_with_mixed_scaling.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'vdu_cp_vl_with_mixed_scaling/'
-            'hot_nfv_vdu_cp_vl_with_mixed_scaling.yaml',
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'vdu_cp_vl_with_mixed_scaling/'
-            'worker_instance.hot.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vdu_cp_with_scaling_multi_aspects(
-            self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu_cp_with_scaling_multi_aspects.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'vdu_cp_with_scaling_multi_aspects/'
-            'hot_nfv_vdu_cp_with_scaling_multi_aspects.yaml',
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'vdu_cp_with_scaling_multi_aspects/'
-            'worker_instance1.hot.yaml',
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'vdu_cp_with_scaling_multi_aspects/'
-            'worker_instance2.hot.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
     def test_hot_translate_etsi_nfv_scaling_non_target_vdu_in_initial_delta(
             self):
         aspect_name = 'worker_instance'
@@ -332,30 +208,3 @@ class EtsiToscaHotTranslationTest(TestCase):
                 expected_msg,
                 self.log_fixture.output
             )
-
-    def test_hot_translate_etsi_nfv_vdu_with_scope_nfvi(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu_affinity_with_scope_nfvi.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_vdu_affinity_with_scope_nfvi.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vdu_with_unsupported_scope(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu_affinity_with_unsupported_scope.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_vdu_affinity_with_unsupported_scope.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
-
-    def test_hot_translate_etsi_nfv_vdu_with_unsupported_targets(self):
-        tosca_file = (f'{self.test_data_relative_path}etsi_nfv/'
-                      'tosca_nfv_vdu_affinity_with_unsupported_targets.yaml')
-        hot_files = [
-            f'{self.test_data_relative_path}hot_output/etsi_nfv/'
-            'hot_nfv_vdu_affinity_with_unsupported_targets.yaml',
-        ]
-        self._test_successful_translation(tosca_file, hot_files, params={})
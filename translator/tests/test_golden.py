@@ -0,0 +1,107 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import tempfile
+
+from translator.tests.base import TestCase
+from translator.tests import golden
+from translator.tests import utils
+
+
+class GoldenTest(TestCase):
+
+    def _write_manifest(self, content):
+        f = tempfile.NamedTemporaryFile('w', suffix='.yaml',
+                                        dir=utils.test_sample_data_root())
+        self.addCleanup(f.close)
+        f.write(content)
+        f.flush()
+        return f.name
+
+    def test_manifest(self):
+        # the translation tests only comparing templates are these cases
+        cases = golden.load_manifest()
+        names = [case.name for case in cases]
+        self.assertIn('single_server_with_defaults_2', names)
+        self.assertIn('etsi_nfv_vnf', names)
+        case = cases[names.index('single_server')]
+        self.assertEqual(
+            golden.GoldenCase(
+                'single_server',
+                utils.test_sample('tosca_single_server.yaml'),
+                [utils.test_sample('hot_output', 'hot_single_server.yaml')],
+                {'cpus': 1}, []),
+            case._replace(template=os.path.normpath(case.template),
+                          expected=[os.path.normpath(name)
+                                    for name in case.expected]))
+        case = cases[names.index('blockstorage_with_attachment_notation2')]
+        self.assertEqual(
+            [[utils.test_sample(
+                'hot_output', 'storage',
+                'hot_blockstorage_with_attachment_notation2_alt2.yaml')]],
+            [[os.path.normpath(name) for name in expected]
+             for expected in case.alternatives])
+
+        results = golden.run(cases, processes=2)
+        self.assertEqual([case.name for case in cases],
+                         [result.name for result in results])
+        for result in results:
+            self.assertIsNone(result.error, result.name)
+            self.assertEqual({}, result.differences, result.name + ': ' +
+                             json.dumps(result.differences, indent=4))
+
+    def test_differences(self):
+        path = self._write_manifest(
+            'cases:\n'
+            '- name: helloworld\n'
+            '  template: tosca_helloworld.yaml\n'
+            '  expected: hot_output/hot_hello_world.yaml\n'
+            '- name: wrong_output\n'
+            '  template: tosca_helloworld.yaml\n'
+            '  expected: hot_output/hot_single_server.yaml\n'
+            '- name: missing\n'
+            '  template: missing.yaml\n'
+            '  expected: hot_output/hot_hello_world.yaml\n'
+            '- name: alternative\n'
+            '  template: tosca_helloworld.yaml\n'
+            '  expected: hot_output/hot_single_server.yaml\n'
+            '  alternatives:\n'
+            '  - hot_output/hot_hello_world.yaml\n')
+        cases = golden.load_manifest(path)
+        self.assertEqual(
+            [utils.test_sample('hot_output', 'hot_hello_world.yaml')],
+            [os.path.normpath(name) for name in cases[0].expected])
+        results = golden.run(cases, processes=1)
+        self.assertEqual({}, results[0].differences)
+        self.assertIn('/hot_single_server.yaml/description',
+                      results[1].differences)
+        self.assertIsNotNone(results[2].error)
+        self.assertEqual({}, results[3].differences)
+
+        report = golden.format_report(results).splitlines()
+        self.assertEqual('4 cases, 2 failed', report[0][:17])
+        self.assertEqual(5, len(report))
+        self.assertIn('wrong_output DIFFERENT', ''.join(report))
+        self.assertIn('missing ERROR', ''.join(report))
+        self.assertEqual(2, len(golden.format_report(results, 1).splitlines()))
+
+    def test_invalid_manifest(self):
+        for content in ('cases:\n- name: a\n',
+                        'cases:\n- template: a.yaml\n  expected: b.yaml\n',
+                        'cases:\n- [a]\n',
+                        'cases:\n'
+                        '- {name: a, template: a.yaml, expected: b.yaml}\n'
+                        '- {name: a, template: a.yaml, expected: b.yaml}\n'):
+            self.assertRaises(ValueError, golden.load_manifest,
+                              self._write_manifest(content))
@@ -0,0 +1,117 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import os
+import tempfile
+import time
+from unittest import mock
+
+from translator.common import hot_diff
+from translator.common.hot_diff import Difference
+from translator.tests.base import TestCase
+
+
+class HotDiffTest(TestCase):
+
+    def _get_template(self, count):
+        resources = {}
+        for index in range(count):
+            resources['server%d' % index] = {
+                'type': 'OS::Nova::Server',
+                'properties': {
+                    'flavor': 'm1.small',
+                    'image': 'fedora-amd64-heat-config',
+                    'networks': [{'port': {'get_resource': 'port%d' % index}}],
+                    'user_data_format': 'SOFTWARE_CONFIG'},
+                'depends_on': ['server%d' % other
+                               for other in range(max(0, index - 3), index)]}
+        return {'heat_template_version': '2013-05-23',
+                'parameters': {'cpus': {'type': 'number',
+                                        'constraints': [{'allowed_values':
+                                                         [1, 2, 4, 8]}]}},
+                'resources': resources}
+
+    def test_diff(self):
+        expected = self._get_template(3)
+        provided = copy.deepcopy(expected)
+        self.assertEqual([], hot_diff.diff(expected, provided))
+
+        # orderless lists
+        provided['resources']['server2']['depends_on'].reverse()
+        provided['parameters']['cpus']['constraints'][0][
+            'allowed_values'] = [8, 4, 2, 1]
+        self.assertEqual([], hot_diff.diff(expected, provided))
+
+        provided['resources']['server2']['depends_on'] = ['server1', 'other']
+        provided['resources']['server1']['properties']['networks'].append(
+            {'network': 'private'})
+        provided['resources']['server0']['properties']['flavor'] = 'm1.tiny'
+        del provided['resources']['server0']['depends_on']
+        provided['outputs'] = {}
+        self.assertEqual(
+            [Difference(('resources', 'server0', 'properties', 'flavor'),
+                        'm1.small', 'm1.tiny'),
+             Difference(('resources', 'server0', 'depends_on'), [], None),
+             Difference(('resources', 'server1', 'properties', 'networks', 1),
+                        None, {'network': 'private'}),
+             Difference(('resources', 'server2', 'depends_on', 0),
+                        'server0', None),
+             Difference(('resources', 'server2', 'depends_on', 1),
+                        None, 'other'),
+             Difference(('outputs',), None, {})],
+            hot_diff.diff(expected, provided))
+
+    def test_to_dict(self):
+        differences = [
+            Difference(('hot.yaml', 'resources', 'a/b', 'depends_on', 0),
+                       'server0', None),
+            Difference(('hot.yaml', 'resources', 'a/b', 'depends_on', 0),
+                       None, 'other')]
+        self.assertEqual(
+            {'/hot.yaml/resources/a~1b/depends_on/0':
+             {hot_diff.EXPECTED_LABEL: 'server0',
+              hot_diff.PROVIDED_LABEL: 'other'}},
+            hot_diff.to_dict(differences))
+
+    def test_large_templates(self):
+        expected = self._get_template(10000)
+        provided = copy.deepcopy(expected)
+        for resource in provided['resources'].values():
+            resource['depends_on'].reverse()
+        provided['resources']['server9999']['properties']['flavor'] = \
+            'm1.tiny'
+        start = time.perf_counter()
+        differences = hot_diff.diff(expected, provided)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(
+            [Difference(('resources', 'server9999', 'properties', 'flavor'),
+                        'm1.small', 'm1.tiny')], differences)
+        self.assertLess(elapsed, 1.0)
+
+    def test_load_golden(self):
+        self.addCleanup(hot_diff.clear_goldens)
+        with tempfile.NamedTemporaryFile('w', suffix='.yaml') as f:
+            f.write('resources: {}\n')
+            f.flush()
+            self.assertEqual({'resources': {}}, hot_diff.load_golden(f.name))
+            with mock.patch('yaml.load') as mock_load:
+                self.assertEqual({'resources': {}},
+                                 hot_diff.load_golden(f.name))
+                self.assertFalse(mock_load.called)
+
+            # a changed file is parsed again
+            f.write('outputs: {}\n')
+            f.flush()
+            os.utime(f.name, ns=(0, 0))
+            self.assertEqual({'resources': {}, 'outputs': {}},
+                             hot_diff.load_golden(f.name))
@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+
+from toscaparser.nodetemplate import NodeTemplate
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot.syntax.hot_output import HotOutput
+from translator.hot.syntax.hot_parameter import HotParameter
+from translator.hot.syntax.hot_resource import HotResource
+from translator.hot import type_resolver
+from translator.tests.base import TestCase
+
+
+class CustomResource(HotResource):
+
+    def __init__(self, nodetemplate, csar_dir=None):
+        super(CustomResource, self).__init__(nodetemplate, csar_dir=csar_dir)
+        self.custom = 'value'
+
+
+class HotSyntaxSlotsTest(TestCase):
+
+    def _get_node(self):
+        return NodeTemplate('server',
+                            {'server': {'type': 'tosca.nodes.Compute'}})
+
+    def test_resource_without_dict(self):
+        resource = HotResource(self._get_node(), type='OS::Heat::None',
+                               properties={'a': 1})
+        self.assertFalse(hasattr(resource, '__dict__'))
+        self.assertRaises(AttributeError, setattr, resource, 'extra', 1)
+
+        other = copy.deepcopy(resource)
+        self.assertEqual(resource.get_dict_output(), other.get_dict_output())
+        self.assertIsNot(resource.properties, other.properties)
+
+    def test_subclass_keeps_attributes(self):
+        resource = CustomResource(self._get_node())
+        resource.extra = 1
+        self.assertEqual('value', resource.custom)
+        self.assertEqual('server', resource.name)
+        self.assertEqual({'server': {'type': None}},
+                         resource.get_dict_output())
+
+    def test_parameter_and_output_without_dict(self):
+        parameter = HotParameter('name', 'string', default='x')
+        output = HotOutput('name', {'get_attr': ['server', 'ip']})
+        self.assertFalse(hasattr(parameter, '__dict__'))
+        self.assertFalse(hasattr(output, '__dict__'))
+        self.assertEqual({'name': {'type': 'string', 'default': 'x'}},
+                         parameter.get_dict_output())
+        self.assertEqual({'name': {'value': {'get_attr': ['server', 'ip']}}},
+                         output.get_dict_output())
+
+
+class HotResourceOperationsTest(TestCase):
+
+    tpl = {
+        'tosca_definitions_version': 'tosca_simple_yaml_1_0',
+        'node_types': {
+            'example.nodes.Base': {
+                'derived_from': 'tosca.nodes.SoftwareComponent',
+                'interfaces': {'Standard': {
+                    'create': 'base_create.sh',
+                    'configure': 'base_configure.sh'}}},
+            'example.nodes.App': {
+                'derived_from': 'example.nodes.Base',
+                'interfaces': {'Standard': {
+                    'configure': {'implementation': 'app_configure.sh'},
+                    'stop': 'app_stop.sh'}}}},
+        'topology_template': {'node_templates': {
+            'server': {'type': 'tosca.nodes.Compute'},
+            'app1': {'type': 'example.nodes.App',
+                     'requirements': [{'host': 'server'}],
+                     'interfaces': {'Standard': {'start': 'app1_start.sh',
+                                                 'stop': 'app1_stop.sh'}}},
+            'app2': {'type': 'example.nodes.App',
+                     'requirements': [{'host': 'server'}]}}}}
+
+    def _get_operations(self, node):
+        return [(name, op.implementation, op.node_template.name)
+                for name, op in
+                HotResource.get_all_operations(node).items()]
+
+    def test_all_operations(self):
+        tosca = ToscaTemplate(yaml_dict_tpl=self.tpl)
+        nodes = dict((node.name, node) for node in tosca.nodetemplates)
+        self.assertEqual([('create', 'base_create.sh', 'app1'),
+                          ('configure', 'app_configure.sh', 'app1'),
+                          ('stop', 'app1_stop.sh', 'app1'),
+                          ('start', 'app1_start.sh', 'app1')],
+                         self._get_operations(nodes['app1']))
+
+        resolver = type_resolver.RESOLVER
+        hits = resolver.hits
+        self.assertEqual([('create', 'base_create.sh', 'app2'),
+                          ('configure', 'app_configure.sh', 'app2'),
+                          ('stop', 'app_stop.sh', 'app2')],
+                         self._get_operations(nodes['app2']))
+        self.assertTrue(resolver.hits > hits)
@@ -0,0 +1,165 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+from http import server
+import os
+import shutil
+import tempfile
+import threading
+
+from toscaparser.tosca_template import ToscaTemplate
+from toscaparser.utils.urlutils import UrlUtils
+from translator.common.exception import HttpCacheMissError
+from translator.common import http_cache
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class SampleHandler(server.BaseHTTPRequestHandler):
+    '''Serve the test samples with ETags.'''
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        path = os.path.join(self.server.root, self.path.lstrip('/'))
+        if not os.path.isfile(path):
+            self.send_response(404)
+            self.end_headers()
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        etag = '"%s"' % hashlib.sha256(data).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class HttpCacheTest(TestCase):
+
+    params = {'db_name': 'wordpress',
+              'db_user': 'wp_user',
+              'db_pwd': 'wp_pass',
+              'db_root_pwd': 'passw0rd',
+              'db_port': 3366,
+              'cpus': 8}
+
+    def setUp(self):
+        super(HttpCacheTest, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.server = server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                 SampleHandler)
+        self.server.root = self.root
+        self.server.requests = []
+        self.server.not_modified = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(http_cache.uninstall)
+        self.base_url = 'http://127.0.0.1:%d/' % self.server.server_port
+
+    def _write(self, name, content):
+        with open(os.path.join(self.root, name), 'wb') as f:
+            f.write(content)
+        return self.base_url + name
+
+    def _translate(self, name):
+        tosca = ToscaTemplate(self.base_url + name, self.params, False)
+        return TOSCATranslator(tosca, self.params).translate()
+
+    def test_fetch(self):
+        url = self._write('a.yaml', b'a: 1\n')
+        cache = http_cache.HttpCache(self.cache_dir)
+        self.assertEqual(b'a: 1\n', cache.fetch(url))
+        self.assertEqual(b'a: 1\n', cache.fetch(url))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual(1, self.server.not_modified)
+
+        # a changed document is downloaded again
+        self._write('a.yaml', b'a: 2\n')
+        self.assertEqual(b'a: 2\n', cache.fetch(url))
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+        self.assertTrue(cache.get_file(url).endswith('.yaml'))
+
+        requests = len(self.server.requests)
+        cache = http_cache.HttpCache(self.cache_dir, offline=True)
+        self.assertEqual(b'a: 2\n', cache.fetch(url))
+        self.assertRaises(HttpCacheMissError, cache.fetch,
+                          self.base_url + 'b.yaml')
+        self.assertEqual(requests, len(self.server.requests))
+
+    def test_max_bytes(self):
+        cache = http_cache.HttpCache(self.cache_dir, max_bytes=25)
+        urls = [self._write('%d.yaml' % index, b'a: 123456\n')
+                for index in range(3)]
+        for url in urls:
+            cache.fetch(url)
+            os.utime(cache.get_file(url), (0, len(self.server.requests)))
+        # the least recently used document is removed
+        self.assertEqual(4, len(os.listdir(self.cache_dir)))
+        offline_cache = http_cache.HttpCache(self.cache_dir, offline=True)
+        self.assertRaises(HttpCacheMissError, offline_cache.fetch, urls[0])
+        offline_cache.fetch(urls[2])
+
+        # documents larger than the cache are not kept
+        url = self._write('large.yaml', b'a: 1\n' * 10)
+        self.assertEqual(b'a: 1\n' * 10, cache.fetch(url))
+        self.assertEqual(4, len(os.listdir(self.cache_dir)))
+
+    def test_install(self):
+        sample = 'tosca_single_instance_wordpress.yaml'
+        shutil.copy(utils.test_sample(sample), self.root)
+        shutil.copytree(utils.test_sample('custom_types'),
+                        os.path.join(self.root, 'custom_types'))
+        shutil.copy(utils.test_sample('csar_hello_world.zip'), self.root)
+        expected = self._translate(sample)
+
+        cache = http_cache.install(self.cache_dir)
+        self.assertEqual(expected, self._translate(sample))
+        self.assertTrue(UrlUtils.url_accessible(self.base_url +
+                                                'csar_hello_world.zip'))
+        self.assertFalse(UrlUtils.url_accessible(self.base_url +
+                                                 'missing.sh'))
+        path, a_file = http_cache.get_template_path(
+            self.base_url + 'csar_hello_world.zip', False)
+        self.assertTrue(a_file)
+        self.assertTrue(path.endswith('.zip'))
+        self.assertEqual(3, cache.misses)
+
+        # the documents are available offline
+        requests = len(self.server.requests)
+        cache = http_cache.install(self.cache_dir, offline=True)
+        self.assertEqual(expected, self._translate(sample))
+        self.assertEqual(path, http_cache.get_template_path(
+            self.base_url + 'csar_hello_world.zip', False)[0])
+        self.assertEqual(requests, len(self.server.requests))
+        self.assertEqual(0, cache.misses)
+
+        http_cache.uninstall()
+        self.assertEqual((self.base_url + 'a.zip', False),
+                         http_cache.get_template_path(
+                             self.base_url + 'a.zip', False))
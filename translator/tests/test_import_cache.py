@@ -0,0 +1,98 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import toscaparser.imports
+from toscaparser.tosca_template import ToscaTemplate
+import toscaparser.utils.yamlparser
+from translator.common import import_cache
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class ImportCacheTest(TestCase):
+
+    sample = 'etsi_nfv/tosca_nfv_vdu_cp_vl_with_mixed_scaling.yaml'
+
+    def setUp(self):
+        super(ImportCacheTest, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.addCleanup(import_cache.uninstall)
+
+    def _translate(self):
+        tosca = ToscaTemplate(utils.test_sample(self.sample), {})
+        return TOSCATranslator(tosca, {}).translate_to_yaml_files_dict(
+            'output.yaml')
+
+    def _write(self, content):
+        path = os.path.join(self.cache_dir, 'types.yaml')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_install(self):
+        expected = self._translate()
+        cache = import_cache.install(self.cache_dir)
+        self.assertEqual(cache.load_yaml, toscaparser.imports.YAML_LOADER)
+        self.assertEqual(expected, self._translate())
+        # the two SOL001 type libraries, loaded several times by the parser
+        self.assertEqual(2, cache.misses)
+        hits = cache.hits
+        self.assertEqual(expected, self._translate())
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(2 * hits + 2, cache.hits)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+        # another run loads the libraries from the directory
+        cache = import_cache.install(self.cache_dir)
+        self.assertEqual(expected, self._translate())
+        self.assertEqual((hits + 2, 0), (cache.hits, cache.misses))
+
+        import_cache.uninstall()
+        self.assertEqual(toscaparser.utils.yamlparser.load_yaml,
+                         toscaparser.imports.YAML_LOADER)
+
+    def test_load_yaml(self):
+        cache = import_cache.ImportCache(self.cache_dir, max_entries=1)
+        path = self._write('node_types: {a: {derived_from: b}}\n')
+        document = cache.load_yaml(path)
+        self.assertEqual({'node_types': {'a': {'derived_from': 'b'}}},
+                         document)
+        document['node_types'] = {}
+        with mock.patch('yaml.load') as mock_load:
+            self.assertEqual({'node_types': {'a': {'derived_from': 'b'}}},
+                             cache.load_yaml(path))
+            self.assertFalse(mock_load.called)
+
+        # a changed document is parsed again
+        self._write('node_types: {}\n')
+        self.assertEqual({'node_types': {}}, cache.load_yaml(path))
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+        self.assertEqual(1, len(cache._documents))
+
+    def test_corrupted_entry(self):
+        cache = import_cache.ImportCache(self.cache_dir)
+        path = self._write('a: 1\n')
+        cache.load_yaml(path)
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.marshal'):
+                with open(os.path.join(self.cache_dir, name), 'wb') as f:
+                    f.write(b'\xff')
+        cache = import_cache.ImportCache(self.cache_dir)
+        self.assertEqual({'a': 1}, cache.load_yaml(path))
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
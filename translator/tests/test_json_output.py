@@ -0,0 +1,100 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+from unittest import mock
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot.syntax import hot_template
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+import yaml
+
+
+class JsonOutputTest(TestCase):
+
+    params = {'db_name': 'wordpress',
+              'db_user': 'wp_user',
+              'db_pwd': 'wp_pass',
+              'db_root_pwd': 'passw0rd',
+              'db_port': 3366,
+              'cpus': 8}
+
+    def _get_translator(self, sample, params=None):
+        if params is None:
+            params = self.params
+        tosca = ToscaTemplate(utils.test_sample(sample), params)
+        return TOSCATranslator(tosca, params)
+
+    def _load_yaml(self, content):
+        template = yaml.safe_load(content)
+        # YAML loads the version as a date and folds the description
+        template['heat_template_version'] = \
+            str(template['heat_template_version'])
+        template['description'] = template['description'].rstrip('\n')
+        return template
+
+    def test_same_templates_as_yaml(self):
+        sample = 'tosca_single_instance_wordpress.yaml'
+        yaml_output = self._get_translator(sample).translate()
+        json_output = self._get_translator(sample).translate_to_json()
+        self.assertEqual(self._load_yaml(yaml_output),
+                         json.loads(json_output))
+        self.assertLess(len(json_output), len(yaml_output))
+
+        translator = self._get_translator(sample)
+        self.assertEqual(json.loads(json_output),
+                         translator.translate_to_dict())
+
+    def test_inline_functions(self):
+        # the resources giving functions and maps as inline YAML strings
+        for sample, params in (
+                ('network/tosca_one_server_one_network.yaml',
+                 {'network_name': 'private_net'}),
+                ('etsi_nfv/tosca_nfv_vdu_with_compute_requirements.yaml',
+                 {})):
+            yaml_output = self._get_translator(sample, params).translate()
+            json_output = self._get_translator(sample,
+                                               params).translate_to_json()
+            self.assertEqual(self._load_yaml(yaml_output),
+                             json.loads(json_output))
+            self.assertEqual(
+                json.loads(json_output),
+                self._get_translator(sample, params).translate_to_dict())
+
+        resources = json.loads(json_output)['resources']
+        self.assertEqual({'get_resource': 'VDU1_flavor'},
+                         resources['VDU1']['properties']['flavor'])
+
+    def test_nested_templates(self):
+        sample = 'autoscaling/tosca_autoscaling.yaml'
+        yaml_files = self._get_translator(
+            sample).translate_to_yaml_files_dict('hot.yaml')
+        json_files = self._get_translator(
+            sample).translate_to_json_files_dict('hot.yaml')
+        self.assertEqual(['asg_res.yaml', 'hot.yaml'], sorted(json_files))
+        self.assertEqual(self._load_yaml(yaml_files['asg_res.yaml']),
+                         json.loads(json_files['asg_res.yaml']))
+        self.assertEqual(
+            {'type': 'asg_res.yaml'},
+            json.loads(json_files['hot.yaml'])['resources']['asg_group'][
+                'properties']['resource'])
+
+    def test_dump_json_backends(self):
+        data = {'resources': {'server': {'properties': {'name': 'é', 1: 2}}}}
+        expected = '{"resources":{"server":{"properties":' \
+                   '{"name":"é","1":2}}}}'
+        with mock.patch.object(hot_template, 'orjson_avail', False):
+            self.assertEqual(expected, hot_template.dump_json(data))
+        if hot_template.orjson_avail:
+            self.assertEqual(expected, hot_template.dump_json(data))
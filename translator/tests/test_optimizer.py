@@ -0,0 +1,179 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.common.exception import UnsupportedOptimizationError
+from translator.hot import optimizer
+from translator.hot.syntax.hot_resource import HotResource
+from translator.hot.syntax.hot_template import HotTemplate
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+
+
+def get_template(count, outputs=None):
+    node_templates = {}
+    for index in range(count):
+        node_templates['server%d' % index] = {
+            'type': 'tosca.nodes.Compute',
+            'capabilities': {'host': {'properties': {
+                'num_cpus': 1, 'mem_size': '1 GB', 'disk_size': '10 GB'}}}}
+        node_templates['app%d' % index] = {
+            'type': 'tosca.nodes.SoftwareComponent',
+            'requirements': [{'host': 'server%d' % index}],
+            'interfaces': {'Standard': {
+                'create': 'install.sh',
+                'configure': {'implementation': 'configure.sh',
+                              'inputs': {'port': 8080}}}}}
+    topology = {'node_templates': node_templates}
+    if outputs:
+        topology['outputs'] = outputs
+    return {'tosca_definitions_version': 'tosca_simple_yaml_1_0',
+            'topology_template': topology}
+
+
+class HotOptimizerTest(TestCase):
+
+    def _translate(self, tpl, optimizations):
+        tosca = ToscaTemplate(yaml_dict_tpl=tpl)
+        translator = TOSCATranslator(tosca, {}, optimizations=optimizations)
+        translator.translate()
+        resources = translator.hot_template.resources
+        return dict((resource.name, resource) for resource in resources)
+
+    def _get_types(self, resources, type):
+        return sorted(name for name, resource in resources.items()
+                      if resource.type == type)
+
+    def test_share_software_configs(self):
+        resources = self._translate(get_template(3),
+                                    [optimizer.SHARE_SOFTWARE_CONFIGS])
+        self.assertEqual(['app0_configure_config', 'app0_create_config'],
+                         self._get_types(resources, optimizer.SOFTWARE_CONFIG))
+        for index in range(3):
+            self.assertEqual(
+                {'get_resource': 'app0_create_config'},
+                resources['app%d_create_deploy' % index].properties['config'])
+
+    def test_group_software_deployments(self):
+        resources = self._translate(get_template(3),
+                                    optimizer.OPTIMIZATIONS)
+        self.assertEqual([], self._get_types(resources,
+                                             optimizer.SOFTWARE_DEPLOYMENT))
+        self.assertEqual(['app0_configure_deploy_group',
+                          'app0_create_deploy_group'],
+                         self._get_types(resources,
+                                         optimizer.SOFTWARE_DEPLOYMENT_GROUP))
+
+        group = resources['app0_configure_deploy_group']
+        self.assertEqual(
+            {'config': {'get_resource': 'app0_configure_config'},
+             'servers': {'server0': {'get_resource': 'server0'},
+                         'server1': {'get_resource': 'server1'},
+                         'server2': {'get_resource': 'server2'}},
+             'input_values': {'port': 8080}},
+            group.properties)
+        self.assertEqual(['app0_create_deploy_group'],
+                         [depend.name for depend in group.depends_on])
+
+    def test_referenced_deployments_not_grouped(self):
+        outputs = {'result': {'value': {'get_operation_output': [
+            'app1', 'Standard', 'create', 'result']}}}
+        resources = self._translate(get_template(3, outputs),
+                                    optimizer.OPTIMIZATIONS)
+        # the deployments depending on it are not identical to the others
+        self.assertEqual(['app1_configure_deploy', 'app1_create_deploy'],
+                         self._get_types(resources,
+                                         optimizer.SOFTWARE_DEPLOYMENT))
+        for name in ('app0_create_deploy_group',
+                     'app0_configure_deploy_group'):
+            self.assertEqual(['server0', 'server2'],
+                             sorted(resources[name].properties['servers']))
+
+    def test_hoist_property_values(self):
+        hot_template = HotTemplate()
+        metadata = {'environment': 'production', 'owner': 'operations',
+                    'description': 'Servers of the management network'}
+        script = ('echo "configuring the management network of the server '
+                  'with the default settings" > /var/log/configure.log')
+        image = '{ get_resource: image_of_the_management_network_servers }'
+        for index in range(4):
+            hot_template.resources.append(HotResource(
+                None, 'server%d' % index, 'OS::Nova::Server',
+                {'flavor': 'm1.small',
+                 'metadata': metadata,
+                 'networks': [{'port': {'get_resource': 'port%d' % index}}],
+                 'user_data': {'str_replace': {'template': script,
+                                               'params': {}}},
+                 'image': image}))
+        hot_optimizer = optimizer.HotOptimizer(
+            hot_template, [optimizer.HOIST_PROPERTY_VALUES])
+        report = hot_optimizer.optimize()
+
+        self.assertEqual([optimizer.HOIST_PROPERTY_VALUES], list(report))
+        self.assertGreater(report[optimizer.HOIST_PROPERTY_VALUES], 0)
+        self.assertEqual(1, len(hot_template.parameters))
+        parameter = hot_template.parameters[0]
+        self.assertEqual({'server0_metadata': {'type': 'json',
+                                               'default': metadata}},
+                         parameter.get_dict_output())
+        for index, resource in enumerate(hot_template.resources):
+            self.assertEqual(
+                {'flavor': 'm1.small',
+                 'metadata': {'get_param': 'server0_metadata'},
+                 'networks': [{'port': {'get_resource': 'port%d' % index}}],
+                 'user_data': {'str_replace': {'template': script,
+                                               'params': {}}},
+                 'image': image},
+                resource.properties)
+
+    def test_reduce_dependencies(self):
+        hot_template = HotTemplate()
+        resources = {}
+        for name, properties, depends_on in (
+                ('network', {}, []),
+                ('subnet', {'network': {'get_resource': 'network'}}, []),
+                ('port', {'network': {'get_resource': 'network'}},
+                 ['subnet', 'network']),
+                ('hidden', {}, []),
+                ('server', {'networks': [{'port': {'get_resource': 'port'}}]},
+                 ['port', 'subnet', 'network', 'hidden', 'subnet']),
+                ('first', {}, []),
+                ('second', {}, ['first'])):
+            resources[name] = HotResource(
+                None, name, 'OS::Heat::None', properties,
+                depends_on=[resources[depend] for depend in depends_on])
+            hot_template.resources.append(resources[name])
+        resources['hidden'].hide_resource = True
+        resources['first'].depends_on = [resources['second']]
+
+        optimizer.HotOptimizer(hot_template,
+                               [optimizer.REDUCE_DEPENDENCIES]).optimize()
+        self.assertEqual(
+            {'network': [], 'subnet': [], 'port': ['subnet'], 'hidden': [],
+             'server': ['hidden'], 'first': ['second'], 'second': ['first']},
+            dict((name, [depend.name for depend in resource.depends_on])
+                 for name, resource in resources.items()))
+
+    def test_unsupported_optimization(self):
+        self.assertRaises(UnsupportedOptimizationError,
+                          optimizer.HotOptimizer, HotTemplate(), ['unknown'])
+
+    def test_replace_references(self):
+        value = {'a': [{'get_resource': 'old'},
+                       {'get_attr': ['old', 'networks', {'get_param': 'x'}]}],
+                 'b': {'get_resource': 'other'}}
+        self.assertEqual(
+            {'a': [{'get_resource': 'new'},
+                   {'get_attr': ['new', 'networks', {'get_param': 'x'}]}],
+             'b': {'get_resource': 'other'}},
+            optimizer.replace_references(value, {'old': 'new'}))
+        self.assertEqual({'old', 'other'}, optimizer.get_references(value))
@@ -0,0 +1,78 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot import parameter_sets
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class ParameterSetTranslatorTest(TestCase):
+
+    def _translate(self, sample, params):
+        tosca = ToscaTemplate(utils.test_sample(sample), dict(params))
+        translator = TOSCATranslator(tosca, dict(params))
+        return translator.translate_to_yaml_files_dict('output.yaml')
+
+    def _assert_translations(self, sample, sets, parses):
+        set_translator = parameter_sets.ParameterSetTranslator(
+            utils.test_sample(sample))
+        results = set_translator.translate(sets, 'output.yaml')
+        self.assertEqual([self._translate(sample, params) for params in sets],
+                         results)
+        self.assertEqual(parses, set_translator.parses)
+        return set_translator
+
+    def test_translate(self):
+        sets = [{'db_name': 'wordpress%d' % index,
+                 'db_user': 'wp_user',
+                 'db_pwd': 'wp_pass%d' % index,
+                 'db_root_pwd': 'passw0rd',
+                 'db_port': 3366,
+                 'cpus': 8 if index % 3 else 1}
+                for index in range(6)]
+        sets[4]['key_name'] = 'key'
+        sets[5]['key_name'] = 'other'
+        set_translator = self._assert_translations(
+            'tosca_single_instance_wordpress.yaml', sets, 3)
+        # the number of CPUs is used to match the flavor
+        self.assertIn('cpus', set_translator.structural_inputs)
+        self.assertNotIn('db_name', set_translator.structural_inputs)
+
+    def test_translate_nested_parameters(self):
+        sets = [{'image_name': 'image', 'flavor': 'm1.small'},
+                {'image_name': 'image', 'flavor': 'm1.small'},
+                {'image_name': 'other', 'flavor': 'm1.small'}]
+        set_translator = self._assert_translations(
+            'nfv/test_tosca_nfv_autoscaling_with_params.yaml', sets, 2)
+        # the values of the parameters are copied to the nested template
+        self.assertEqual({'flavor', 'image_name'},
+                         set_translator.structural_inputs)
+
+    def test_load_parameter_sets(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.yaml') as f:
+            f.write('tenant1:\n  cpus: 1\ntenant2: {cpus: 2}\n')
+            f.flush()
+            self.assertEqual({'tenant1': {'cpus': 1}, 'tenant2': {'cpus': 2}},
+                             parameter_sets.load_parameter_sets(f.name))
+
+        for content in ('- cpus: 1\n', 'tenant: 1\n',
+                        '"%s": {cpus: 1}\n' % os.path.join('a', 'b')):
+            with tempfile.NamedTemporaryFile('w', suffix='.yaml') as f:
+                f.write(content)
+                f.flush()
+                self.assertRaises(ValueError,
+                                  parameter_sets.load_parameter_sets, f.name)
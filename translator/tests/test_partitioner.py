@@ -0,0 +1,173 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot.partitioner import StackPartitioner
+from translator.hot.stack_metrics import get_references
+from translator.hot.syntax.hot_output import HotOutput
+from translator.hot.syntax.hot_resource import HotResource
+from translator.hot.syntax.hot_template import HotTemplate
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+import yaml
+
+
+def get_template(count):
+    node_templates = {'net': {
+        'type': 'tosca.nodes.network.Network',
+        'properties': {'network_name': {'get_input': 'network_name'},
+                       'cidr': '10.0.0.0/24'}}}
+    for index in range(count):
+        node_templates['server%d' % index] = {
+            'type': 'tosca.nodes.Compute',
+            'capabilities': {'host': {'properties': {
+                'num_cpus': 1, 'mem_size': '1 GB', 'disk_size': '10 GB'}}}}
+        node_templates['port%d' % index] = {
+            'type': 'tosca.nodes.network.Port',
+            'requirements': [{'binding': 'server%d' % index},
+                             {'link': 'net'}]}
+    return {'tosca_definitions_version': 'tosca_simple_yaml_1_0',
+            'topology_template': {
+                'inputs': {'network_name': {'type': 'string'}},
+                'node_templates': node_templates,
+                'outputs': {'ip': {'value': {'get_attribute': [
+                    'server0', 'private_address']}}}}}
+
+
+class StackPartitionerTest(TestCase):
+
+    params = {'network_name': 'private'}
+
+    def _translate(self, count, max_stack_resources=None):
+        tosca = ToscaTemplate(yaml_dict_tpl=get_template(count),
+                              parsed_params=self.params)
+        translator = TOSCATranslator(tosca, self.params,
+                                     max_stack_resources=max_stack_resources)
+        files = translator.translate_to_yaml_files_dict('main.yaml')
+        return dict((name, yaml.safe_load(content))
+                    for name, content in files.items())
+
+    def _substitute(self, value, parameters):
+        # replace the get_param of the given parameters by their values
+        if isinstance(value, dict):
+            if list(value) == ['get_param']:
+                name = value['get_param']
+                path = []
+                if isinstance(name, list):
+                    name, path = name[0], name[1:]
+                if name in parameters:
+                    reference = parameters[name]
+                    if path:
+                        reference = {'get_attr': reference['get_attr'] + path}
+                    return reference
+            return dict((key, self._substitute(item, parameters))
+                        for key, item in value.items())
+        if isinstance(value, list):
+            return [self._substitute(item, parameters) for item in value]
+        return value
+
+    def _inline(self, templates):
+        # resolve the nested stacks back into a single template
+        main = templates['main.yaml']
+        resources = {}
+        outputs = {}
+        for name, stack in main['resources'].items():
+            template = templates[stack['type']]
+            parameters = {}
+            for key, value in stack.get('properties', {}).items():
+                if 'get_attr' in value:
+                    stack_name, output = value['get_attr'][:2]
+                    value = outputs[stack_name][output]
+                    parameters[key] = value
+            resources.update(self._substitute(template['resources'],
+                                              parameters))
+            outputs[name] = dict(
+                (key, output['value'])
+                for key, output in template.get('outputs', {}).items())
+        main_outputs = {}
+        for key, output in main.get('outputs', {}).items():
+            stack_name, name = output['value']['get_attr'][:2]
+            value = dict(outputs[stack_name][name])
+            value['get_attr'] = (value['get_attr'] +
+                                 output['value']['get_attr'][2:])
+            main_outputs[key] = {'value': value}
+        return resources, main_outputs
+
+    def test_small_template(self):
+        self.assertEqual(self._translate(2), self._translate(2, 6))
+
+    def test_partition(self):
+        flat = self._translate(8)['main.yaml']
+        templates = self._translate(8, 5)
+        main = templates['main.yaml']
+        self.assertEqual(flat['parameters'], main['parameters'])
+        self.assertEqual(['main.yaml', 'stack_1.yaml', 'stack_2.yaml',
+                          'stack_3.yaml', 'stack_4.yaml', 'stack_5.yaml'],
+                         sorted(templates))
+
+        for index, name in enumerate(sorted(main['resources'])):
+            stack = main['resources'][name]
+            self.assertEqual(name + '.yaml', stack['type'])
+            template = templates[stack['type']]
+            self.assertTrue(len(template['resources']) <= 5)
+            # a stack only references its own resources and the stacks
+            # created before it
+            self.assertTrue(get_references(template['resources']) <=
+                            set(template['resources']))
+            for referenced in get_references(stack):
+                self.assertTrue(referenced < name)
+            self.assertEqual(set(stack.get('properties', {})),
+                             set(template.get('parameters', {})))
+
+        resources, outputs = self._inline(templates)
+        self.assertEqual(flat['resources'], resources)
+        self.assertEqual(flat['outputs'], outputs)
+
+    def test_references(self):
+        template = HotTemplate()
+        template.resources = [
+            HotResource(None, name='a', type='OS::Heat::RandomString'),
+            HotResource(None, name='b', type='OS::Heat::Value',
+                        properties={'value': {'get_attr': ['a']}}),
+            HotResource(None, name='c', type='OS::Heat::Value',
+                        properties={'value': {'get_attr': ['a', 'value']}}),
+            HotResource(None, name='d', type='OS::Heat::Value',
+                        properties={'value': {'get_resource': 'a'}})]
+        template.outputs = [HotOutput('all', {'get_attr': ['a']})]
+        self.assertEqual(4, len(StackPartitioner(template, 1).partition()))
+        templates = dict(
+            (name, yaml.safe_load(content)) for name, content in
+            template.output_to_yaml_files_dict('main.yaml').items())
+
+        self.assertEqual({'attributes_a': {'value': {'get_attr': ['a']}},
+                          'attribute_a_value': {
+                              'value': {'get_attr': ['a', 'value']}},
+                          'resource_a': {'value': {'get_resource': 'a'}}},
+                         templates['stack_1.yaml']['outputs'])
+        main = templates['main.yaml']
+        self.assertEqual({'get_attr': ['stack_1', 'attributes_a']},
+                         main['outputs']['all']['value'])
+        # every reference is given by its own output and parameter
+        for stack, output, parameter_type in (
+                ('stack_2', 'attributes_a', 'json'),
+                ('stack_3', 'attribute_a_value', 'string'),
+                ('stack_4', 'resource_a', 'string')):
+            self.assertEqual(
+                {output: {'get_attr': ['stack_1', output]}},
+                main['resources'][stack]['properties'])
+            stack_template = templates[stack + '.yaml']
+            self.assertEqual({output: {'type': parameter_type}},
+                             stack_template['parameters'])
+            self.assertEqual(
+                {'get_param': output},
+                list(stack_template['resources'].values())[0][
+                    'properties']['value'])
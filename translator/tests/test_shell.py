@@ -15,6 +15,7 @@ import importlib
 import json
 import os
 import shutil
+import subprocess
 import sys
 import tempfile
 from unittest import mock
@@ -114,6 +115,87 @@ class ShellTest(TestCase):
                 self.assertTrue(temp_dir is None or
                                 not os.path.exists(temp_dir))
 
+    def test_offline_imports(self):
+        # an offline translation does not import the OpenStack clients
+        code = ('from translator import shell; '
+                'shell.main(["%s"])' % self.template_file)
+        env = dict((name, value) for name, value in os.environ.items()
+                   if not name.startswith('OS_'))
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                 code], env=env, capture_output=True,
+                                universal_newlines=True, check=True)
+        imports = set()
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                imports.add(line.split('|')[-1].strip())
+        self.assertIn('translator.shell', imports)
+        for client in ('keystoneauth1', 'heatclient', 'novaclient',
+                       'openstack'):
+            self.assertNotIn(client, imports)
+
+    def test_parameter_sets(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        sets_file = os.path.join(temp_dir, 'sets.yaml')
+        with open(sets_file, 'w') as f:
+            f.write('tenant1: {key_name: key1}\ntenant2: {key_name: key2}\n')
+        shell.main([self.template_file, self.template_type,
+                    '--parameter-sets=' + sets_file,
+                    '--output-file=' + os.path.join(temp_dir, 'hot.yaml')])
+        for name in ('key1', 'key2'):
+            with open(os.path.join(temp_dir, 'tenant' + name[-1],
+                                   'hot.yaml')) as f:
+                self.assertIn('default: ' + name, f.read())
+
+        self.assertRaises(ValueError, shell.main,
+                          [self.template_file, self.template_type,
+                           '--parameter-sets=' + sets_file])
+
+    @mock.patch('builtins.print')
+    def test_output_format_json(self, mock_print):
+        shell.main([self.template_file, self.template_type,
+                    '--output-format=json'])
+        output = json.loads(mock_print.call_args[0][0])
+        self.assertEqual('2013-05-23', output['heat_template_version'])
+        self.assertEqual('OS::Nova::Server',
+                         output['resources']['my_server']['type'])
+
+    @mock.patch('builtins.print')
+    def test_analyze(self, mock_print):
+        shell.main([self.template_file, self.template_type, '--analyze'])
+        output = mock_print.call_args[0][0]
+        self.assertTrue(output.startswith('resources: 1\n'))
+        self.assertIn('nesting_depth: 0\n', output)
+        self.assertNotIn('heat_template_version', output)
+
+    @mock.patch('builtins.print')
+    @mock.patch('heatclient.client.Client')
+    def test_deploy_on_heat_wait(self, mock_client, mock_print):
+        heat_client = mock_client.return_value
+        heat_client.stacks.create.return_value = {'stack': {'id': 'id'}}
+        heat_client.stacks.get.return_value = mock.Mock(
+            stack_status='CREATE_COMPLETE', stack_status_reason='done')
+        translator = mock.Mock()
+        # the stack of the YAML output is created
+        translator.translate.return_value = (
+            'heat_template_version: 2013-05-23\nresources: {}\n')
+        shell.TranslatorShell().deploy_on_heat(
+            mock.Mock(), mock.Mock(), translator, 'mystack', 'file', {},
+            wait=True)
+        heat_client.stacks.create.assert_called_once_with(
+            stack_name='mystack',
+            template={'heat_template_version': '2013-05-23',
+                      'resources': {}},
+            parameters={}, files={})
+        heat_client.stacks.get.assert_called_once_with('id')
+        self.assertTrue(mock_print.call_args[0][0].startswith(
+            'mystack CREATE_COMPLETE '))
+
+        heat_client.stacks.get.return_value.stack_status = 'CREATE_FAILED'
+        self.assertRaises(RuntimeError, shell.TranslatorShell().deploy_on_heat,
+                          mock.Mock(), mock.Mock(), translator, 'mystack',
+                          'file', {}, wait=True)
+
     @mock.patch('uuid.uuid4')
     @mock.patch.object(shell.TranslatorShell, '_create_stack')
     @mock.patch('keystoneauth1.loading.load_auth_from_argparse_arguments')
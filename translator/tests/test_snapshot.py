@@ -0,0 +1,130 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import os
+import shutil
+import tempfile
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.common.exception import InvalidSnapshotError
+from translator.hot import snapshot
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests.test_partitioner import get_template
+from translator.tests import utils
+import yaml
+
+
+class TranslationSnapshotTest(TestCase):
+
+    def _get_translator(self, sample, params=None, **kwargs):
+        params = params or {}
+        tosca = ToscaTemplate(utils.test_sample(*sample), params)
+        return TOSCATranslator(tosca, params, **kwargs)
+
+    def _assert_round_trip(self, sample, params=None, **kwargs):
+        yaml_files = self._get_translator(
+            sample, params, **kwargs).translate_to_yaml_files_dict('a.yaml')
+        expected = dict((name, yaml.safe_load(content))
+                        for name, content in yaml_files.items())
+        translated = self._get_translator(
+            sample, params, **kwargs).translate_to_snapshot('a.yaml')
+
+        loaded = snapshot.TranslationSnapshot.loads(translated.dumps())
+        self.assertEqual(expected, loaded.templates)
+        self.assertEqual('a.yaml', loaded.main_template)
+        self.assertEqual(translated.resources, loaded.resources)
+        self.assertEqual(sorted(expected), sorted(loaded.resources))
+        self.assertIsInstance(
+            loaded.templates['a.yaml']['heat_template_version'],
+            datetime.date)
+        self.assertEqual(expected, dict(
+            (name, yaml.safe_load(content))
+            for name, content in loaded.to_yaml_files_dict().items()))
+        return loaded
+
+    def test_round_trip(self):
+        loaded = self._assert_round_trip(
+            ('tosca_single_instance_wordpress.yaml',),
+            {'db_name': 'wordpress', 'db_user': 'wp_user',
+             'db_pwd': 'wp_pass', 'db_root_pwd': 'passw0rd',
+             'db_port': 3366, 'cpus': 8})
+        resources = loaded.resources['a.yaml']
+        self.assertEqual({'type': 'OS::Heat::SoftwareDeployment',
+                          'depends_on': ['server',
+                                         'wordpress_configure_config',
+                                         'wordpress_create_deploy'],
+                          'node': 'wordpress'},
+                         resources['wordpress_configure_deploy'])
+        self.assertEqual('server', resources['server']['node'])
+
+    def test_nested_templates(self):
+        loaded = self._assert_round_trip(
+            ('autoscaling', 'tosca_autoscaling.yaml'), compact=True)
+        self.assertEqual(['a.yaml', 'asg_res.yaml'], sorted(loaded.templates))
+        resources = loaded.resources['asg_res.yaml']
+        self.assertEqual(['my_server_1'], [resource['node']
+                                           for resource in resources.values()])
+        self.assertEqual({'type': 'OS::Heat::AutoScalingGroup',
+                          'depends_on': [], 'node': 'my_server_1'},
+                         loaded.resources['a.yaml']['asg_group'])
+
+    def test_partitioned(self):
+        params = {'network_name': 'private'}
+        tosca = ToscaTemplate(yaml_dict_tpl=get_template(4),
+                              parsed_params=params)
+        translated = TOSCATranslator(
+            tosca, params, max_stack_resources=4).translate_to_snapshot(
+                'main.yaml')
+        self.assertEqual(['main.yaml', 'stack_1.yaml', 'stack_2.yaml',
+                          'stack_3.yaml'], sorted(translated.resources))
+        for name, resources in translated.resources.items():
+            for resource_name, resource in resources.items():
+                if name == 'main.yaml':
+                    self.assertIsNone(resource['node'])
+                elif resource_name == 'net_subnet':
+                    self.assertEqual('net', resource['node'])
+                else:
+                    self.assertEqual(resource_name, resource['node'])
+
+    def test_save(self):
+        translated = snapshot.TranslationSnapshot(
+            {'a.yaml': {'heat_template_version': datetime.date(2013, 5, 23),
+                        'resources': {'a': {'type': 'OS::Heat::None'}},
+                        'outputs': {'at': {'value': datetime.datetime(
+                            2020, 1, 2, 3, 4, 5)}}}}, 'a.yaml')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'a.snapshot')
+        translated.save(path)
+        loaded = snapshot.TranslationSnapshot.load(path)
+        self.assertEqual(translated.templates, loaded.templates)
+        self.assertEqual({'a.yaml': {'a': {'type': 'OS::Heat::None',
+                                           'depends_on': [],
+                                           'node': None}}},
+                         loaded.resources)
+        # the templates of the snapshot are not changed by dumps
+        self.assertIsInstance(
+            translated.templates['a.yaml']['heat_template_version'],
+            datetime.date)
+
+    def test_invalid(self):
+        data = snapshot.TranslationSnapshot({'a.yaml': {}}, 'a.yaml').dumps()
+        header = len(snapshot.SNAPSHOT_MAGIC)
+        for invalid in (b'', b'heat_template_version: 2013-05-23',
+                        data[:header + 1], data[:-4],
+                        data[:header] + b'\xff' + data[header + 1:]):
+            self.assertRaises(InvalidSnapshotError,
+                              snapshot.TranslationSnapshot.loads, invalid)
+        self.assertRaises(ValueError, snapshot.TranslationSnapshot(
+            {'a.yaml': {'value': object()}}, 'a.yaml').dumps)
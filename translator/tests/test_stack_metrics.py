@@ -0,0 +1,93 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import tempfile
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot import stack_metrics
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class StackMetricsTest(TestCase):
+
+    def test_get_dependency_levels(self):
+        resources = {
+            'network': {'type': 'OS::Neutron::Net'},
+            'subnet': {'type': 'OS::Neutron::Subnet',
+                       'properties': {'network': {'get_resource':
+                                                  'network'}}},
+            'port': {'type': 'OS::Neutron::Port',
+                     'properties': {'network': {'get_resource': 'network'}},
+                     'depends_on': 'subnet'},
+            'volume': {'type': 'OS::Cinder::Volume'},
+            'server': {'type': 'OS::Nova::Server',
+                       'properties': {'networks': [
+                           {'port': {'get_attr': ['port', 'name']}}]},
+                       'depends_on': ['volume', 'unknown']}}
+        self.assertEqual([['network', 'volume'], ['subnet'], ['port'],
+                          ['server']],
+                         stack_metrics.get_dependency_levels(resources))
+        self.assertEqual(['network', 'subnet', 'port', 'server'],
+                         stack_metrics.get_critical_path(resources))
+
+    def test_get_dependency_levels_loop(self):
+        resources = {'first': {'depends_on': ['second']},
+                     'second': {'depends_on': ['first']},
+                     'third': None}
+        self.assertEqual([['third'], ['first', 'second']],
+                         stack_metrics.get_dependency_levels(resources))
+        self.assertEqual(['third'],
+                         stack_metrics.get_critical_path(resources))
+
+    def test_get_stack_metrics(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.sh') as script:
+            script.write('echo configure\n')
+            script.flush()
+            config = {'type': 'OS::Heat::SoftwareConfig',
+                      'properties': {'config': {'get_file': script.name}}}
+            templates = {
+                'main.yaml': {'resources': {
+                    'group': {'type': 'OS::Heat::AutoScalingGroup',
+                              'properties': {'resource': {
+                                  'type': 'group_res.yaml'}}},
+                    'config': config}},
+                'group_res.yaml': {'resources': {
+                    'member': {'type': 'member_res.yaml'},
+                    'config': config,
+                    'other_config': {
+                        'type': 'OS::Heat::SoftwareConfig',
+                        'properties': {'config': {
+                            'get_file': script.name + '.missing'}}}}},
+                'member_res.yaml': {'resources': {
+                    'server': {'type': 'OS::Nova::Server'}}}}
+            metrics = stack_metrics.get_stack_metrics(templates, 'main.yaml')
+        self.assertEqual(list(stack_metrics.METRICS), list(metrics))
+        self.assertEqual({'resources': 6, 'templates': 3,
+                          'nested_templates': 2, 'nesting_depth': 2,
+                          'dependency_depth': 1, 'dependency_width': 3,
+                          'critical_path': ['config'],
+                          'get_files': 2, 'get_file_bytes': 15,
+                          'unresolved_files': 1}, dict(metrics))
+
+    def test_translator_analyze(self):
+        tosca_file = utils.test_sample('autoscaling/tosca_autoscaling.yaml')
+        tosca = ToscaTemplate(tosca_file, {}, True)
+        translator = TOSCATranslator(tosca, {}, analyze=True)
+        yaml_files = translator.translate_to_yaml_files_dict('output.yaml')
+        metrics = translator.metrics
+        self.assertEqual(len(yaml_files), metrics['templates'])
+        self.assertEqual(1, metrics['nesting_depth'])
+        self.assertEqual(
+            metrics, stack_metrics.get_yaml_files_metrics(yaml_files,
+                                                          'output.yaml'))
@@ -0,0 +1,68 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot import topology_graph
+from translator.hot.topology_graph import TopologyGraph
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class TopologyGraphTest(TestCase):
+
+    def _get_graph(self, sample):
+        tosca = ToscaTemplate(utils.test_sample(sample))
+        return tosca, TopologyGraph(tosca.nodetemplates)
+
+    def test_short_and_long_form_requirements(self):
+        tosca, graph = self._get_graph(
+            "tosca_single_instance_wordpress.yaml")
+        wordpress = graph.node('wordpress')
+        self.assertEqual(
+            [('host', 'webserver'), ('database_endpoint', 'mysql_database')],
+            [(req.name, req.target_name)
+             for req in graph.requirements(wordpress)])
+
+        mysql_database = graph.node('mysql_database')
+        host = graph.requirement(mysql_database, 'host')
+        self.assertEqual('mysql_dbms', host.target_name)
+        self.assertIs(graph.node('mysql_dbms'), host.target)
+        self.assertEqual(topology_graph.HOSTED_ON, host.kind)
+
+    def test_related_matches_parser(self):
+        tosca, graph = self._get_graph(
+            "network/tosca_two_servers_one_network.yaml")
+        for node in tosca.nodetemplates:
+            self.assertEqual(
+                [(target, rel.type) for target, rel in node.related.items()],
+                [(target, rel.type) for target, rel in graph.related(node)])
+
+    def test_typed_edges(self):
+        tosca, graph = self._get_graph(
+            "network/tosca_one_server_one_network.yaml")
+        port = graph.node('my_port')
+        self.assertEqual('my_network',
+                         graph.target(port, topology_graph.LINKS_TO).name)
+        self.assertEqual('my_server',
+                         graph.target(port, topology_graph.BINDS_TO).name)
+        self.assertIsNone(graph.target(port, topology_graph.HOSTED_ON))
+        self.assertEqual([], graph.edges(graph.node('my_server')))
+
+    def test_node_outside_topology(self):
+        tosca, graph = self._get_graph(
+            "network/tosca_one_server_one_network.yaml")
+        port = graph.node('my_port')
+        standalone = TopologyGraph()
+        self.assertIsNone(standalone.node('my_port'))
+        self.assertEqual('my_network',
+                         standalone.target(port,
+                                           topology_graph.LINKS_TO).name)
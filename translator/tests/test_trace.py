@@ -0,0 +1,73 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import logging
+from unittest import mock
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.common import trace
+from translator.hot.tosca_translator import TOSCATranslator
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class TraceTest(TestCase):
+
+    params = {'db_name': 'wordpress',
+              'db_user': 'wp_user',
+              'db_pwd': 'wp_pass',
+              'db_root_pwd': 'passw0rd',
+              'db_port': 3366,
+              'cpus': 8}
+
+    def _translate(self):
+        tosca = ToscaTemplate(
+            utils.test_sample('tosca_single_instance_wordpress.yaml'),
+            self.params)
+        return TOSCATranslator(tosca, self.params).translate()
+
+    def test_disabled(self):
+        level = trace.log.level
+        trace.log.setLevel(logging.INFO)
+        self.addCleanup(trace.log.setLevel, level)
+        with mock.patch.object(trace, 'TraceEvent') as mock_event:
+            self._translate()
+            self.assertFalse(mock_event.called)
+
+    def test_recorder(self):
+        level = trace.log.level
+        stream = io.StringIO()
+        with trace.TraceRecorder(stream) as recorder:
+            output = self._translate()
+        self.assertEqual(level, trace.log.level)
+        self.assertNotIn(recorder, trace.log.handlers)
+        self.assertEqual(output, self._translate())
+
+        phases = set(event.phase for event in recorder.events)
+        self.assertTrue(set(['input', 'parameter', 'resource', 'flavor',
+                             'flavor_match', 'attribute']) <= phases)
+        event = [event for event in recorder.events
+                 if event.phase == 'resource' and event.node == 'server'][0]
+        self.assertEqual('tosca.nodes.Compute', event.type)
+        self.assertEqual('resource server (tosca.nodes.Compute) '
+                         'hot_type=OS::Nova::Server', str(event))
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(recorder.events), len(lines))
+        self.assertTrue(lines[0].endswith('ms input cpus (integer)'))
+
+        node_times = recorder.get_node_times()
+        self.assertIn('server', dict(node_times))
+        self.assertEqual(sorted((time for node, time in node_times),
+                                reverse=True),
+                         [time for node, time in node_times])
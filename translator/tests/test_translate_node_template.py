@@ -10,8 +10,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from toscaparser.tosca_template import ToscaTemplate
+from translator.hot.syntax.hot_resource import HotResource
+from translator.hot.tosca_translator import TOSCATranslator
 from translator.hot.translate_node_templates import _generate_type_map
+from translator.hot.translate_node_templates import _group_by_dependencies
 from translator.tests.base import TestCase
+from translator.tests import utils
 
 
 class TranslateNodeTemplatesTest(TestCase):
@@ -52,3 +57,35 @@ class TranslateNodeTemplatesTest(TestCase):
         actual_type_list = list(_generate_type_map())
 
         self.assertCountEqual(expected_type_list, actual_type_list)
+
+    def test_group_by_dependencies(self):
+        network = HotResource(None, 'network')
+        server = HotResource(None, 'server')
+        port1 = HotResource(None, 'port1', depends_on=[network])
+        port2 = HotResource(None, 'port2', depends_on=[server])
+        port3 = HotResource(None, 'port3', depends_on=[network, server])
+        volume = HotResource(None, 'volume')
+        self.assertEqual(
+            [['port1', 'port2', 'port3'], ['volume']],
+            [[resource.name for resource in group]
+             for group in _group_by_dependencies([port1, port2, port3,
+                                                  volume])])
+
+    def test_parallel_translation(self):
+        params = {'image_name': 'x', 'flavor': 'm1.small', 'cpus': 1,
+                  'storage_size': '1 GB', 'storage_snapshot_id': 'x',
+                  'storage_location': '/dev/vdc', 'network_name': 'net',
+                  'network_cidr': '10.0.0.0/24',
+                  'network_start_ip': '10.0.0.1',
+                  'network_end_ip': '10.0.0.9'}
+        for sample in ('tosca_nfv_vnf_vdu_cp_vl_blockstorage_with_scaling',
+                       'tosca_nfv_check_cp_order',
+                       'tosca_nfv_vdu_affinity_with_scope_nfvi'):
+            tosca_file = utils.test_sample('etsi_nfv/%s.yaml' % sample)
+            outputs = []
+            for workers in (None, 4):
+                tosca = ToscaTemplate(tosca_file, params, True)
+                translator = TOSCATranslator(tosca, params, workers=workers)
+                outputs.append(
+                    translator.translate_to_yaml_files_dict('output.yaml'))
+            self.assertEqual(outputs[0], outputs[1])
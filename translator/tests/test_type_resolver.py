@@ -0,0 +1,100 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from toscaparser.tosca_template import ToscaTemplate
+from translator.common.exception import UnsupportedTypeError
+from translator.hot.translate_node_templates import TOSCA_TO_HOT_TYPE
+from translator.hot.type_resolver import TypeResolver
+from translator.tests.base import TestCase
+from translator.tests import utils
+
+
+class TypeResolverTest(TestCase):
+
+    def _get_node(self, sample, name):
+        tosca = ToscaTemplate(utils.test_sample(sample))
+        for node in tosca.nodetemplates:
+            if node.name == name:
+                return node
+
+    def test_supported_type_reused_by_parse(self):
+        resolver = TypeResolver(dict(TOSCA_TO_HOT_TYPE))
+        sample = "test_tosca_custom_type.yaml"
+        node = self._get_node(sample, 'customwebserver')
+        for _ in range(2):
+            self.assertEqual('tosca.nodes.WebServer',
+                             resolver.get_supported_type(node))
+        self.assertEqual(1, resolver.hits)
+
+        # the custom types of another parse are resolved again
+        node = self._get_node(sample, 'customwebserver')
+        self.assertEqual('tosca.nodes.WebServer',
+                         resolver.get_supported_type(node))
+        self.assertEqual(1, resolver.hits)
+        self.assertEqual(2, resolver.misses)
+
+        # the types of the parses without custom types are shared
+        for _ in range(2):
+            node = self._get_node("tosca_helloworld.yaml", 'my_server')
+            self.assertEqual('tosca.nodes.Compute',
+                             resolver.get_supported_type(node))
+        self.assertEqual(2, resolver.hits)
+
+    def test_custom_defs_are_bounded(self):
+        resolver = TypeResolver(dict(TOSCA_TO_HOT_TYPE), max_custom_defs=1)
+        first = self._get_node("test_tosca_custom_type.yaml",
+                               'customwebserver')
+        second = self._get_node("test_tosca_custom_type.yaml",
+                                'customwebserver')
+        for node in (first, second, first):
+            resolver.get_supported_type(node)
+        self.assertEqual(3, resolver.misses)
+        resolver.get_supported_type(first)
+        self.assertEqual(1, resolver.hits)
+        resolver.release(first.type_definition.custom_def)
+        resolver.get_supported_type(first)
+        self.assertEqual(4, resolver.misses)
+
+    def test_type_map_changes(self):
+        type_map = dict(TOSCA_TO_HOT_TYPE)
+        resolver = TypeResolver(type_map)
+        node = self._get_node("test_tosca_custom_type.yaml",
+                              'customwebserver')
+        self.assertEqual('tosca.nodes.WebServer',
+                         resolver.get_supported_type(node))
+
+        resolver.register(node.type, type_map['tosca.nodes.WebServer'])
+        self.assertEqual(node.type, resolver.get_supported_type(node))
+
+        # the map changed directly, without changing its size
+        del type_map[node.type]
+        type_map['tosca.nodes.SoftwareComponent'] = \
+            type_map.pop('tosca.nodes.WebServer')
+        self.assertEqual('tosca.nodes.SoftwareComponent',
+                         resolver.get_supported_type(node))
+
+    def test_unsupported_type(self):
+        resolver = TypeResolver({})
+        node = self._get_node("tosca_helloworld.yaml", 'my_server')
+        self.assertRaises(UnsupportedTypeError,
+                          resolver.get_supported_type, node)
+
+    def test_base_type_str(self):
+        resolver = TypeResolver()
+        node = self._get_node("test_tosca_custom_type.yaml",
+                              'customwebserver')
+        for _ in range(2):
+            self.assertEqual('tosca.nodes.SoftwareComponent',
+                             resolver.get_base_type_str(node.type_definition))
+        self.assertEqual(1, resolver.hits)
+        self.assertEqual('tosca.nodes.Compute',
+                         resolver.get_base_type_str('tosca.nodes.Compute'))